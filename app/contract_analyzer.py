@@ -1,6 +1,3 @@
-from openai import OpenAI  # Replace with actual call if using OpenAI or Claude
-import os
-
 def analyze_contract(contract_text, prompt):
     # Simulated output for now
     return """
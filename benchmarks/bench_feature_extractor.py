@@ -0,0 +1,89 @@
+"""
+Scaling benchmark: per-pattern `re.search` (legacy) vs single-pass PatternRegistry.
+
+    python -m benchmarks.bench_feature_extractor --sizes 6 25 50 100 --kb 512
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from pathlib import Path
+from typing import List
+
+from src.feature_extractor import SIGNALS, PatternRegistry, Signal
+
+_FLAGS = re.IGNORECASE | re.MULTILINE
+
+_EXTRA_TERMS = [
+    "liquidated damages", "most favou?red nation", "exclusivity", "non-?solicit", "non-?compete",
+    "change of control", "assignment", "subcontract", "audit rights?", "data breach",
+    "personal data", "sub-?processor", "escrow", "service credits?", "force majeure",
+    "step-?in rights?", "benchmarking", "price increase", "late payment", "interest",
+    "set-?off", "warrant(y|ies)", "fitness for a particular purpose", "intellectual property",
+    "background ip", "moral rights", "open source", "export control", "anti-?bribery",
+    "sanctions", "insurance", "key personnel", "acceptance testing", "governing law",
+    "arbitration", "jurisdiction", "injunctive relief", "survival", "entire agreement",
+    "severability", "waiver", "notices?", "counterparts", "third party beneficiar",
+    "publicity", "non-?disparagement", "record retention", "business continuity",
+    "disaster recovery", "penetration test", "source code", "chargeback", "true-?up",
+]
+
+
+def _anchor(term: str) -> str:
+    # Leading literal run; a char followed by `?` or `(` is not guaranteed to occur.
+    lit = re.match(r"[a-z \-]*", term).group()
+    if len(lit) < len(term) and term[len(lit)] in "?(":
+        lit = lit[:-1]
+    return lit.strip(" -")
+
+
+def _signals(n: int) -> List[Signal]:
+    extra = [Signal(f"has_term_{i}", rf"\b{t}", (_anchor(t),)) for i, t in enumerate(_EXTRA_TERMS)]
+    return (list(SIGNALS) + extra)[:n]
+
+
+def _corpus(kb: int) -> str:
+    base = Path("sample_data/sample_contract_1.txt").read_text(encoding="utf-8")
+    filler = "The Supplier shall provide the Services in accordance with the Statement of Work. "
+    block = base + "\n" + filler * 20 + "\n"
+    return block * max(1, (kb * 1024) // len(block))
+
+
+def _legacy(signals: List[Signal], text: str) -> List[bool]:
+    return [re.search(s.pattern, text, flags=_FLAGS) is not None for s in signals]
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Feature scanner scaling benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[6, 25, 50, len(SIGNALS) + len(_EXTRA_TERMS)])
+    parser.add_argument("--kb", type=int, default=256, help="Synthetic contract size in KB")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = _corpus(args.kb)
+    print(f"text: {len(text) / 1024:.0f} KB")
+    print(f"{'signals':>8} {'legacy_search_ms':>17} {'legacy_finditer_ms':>19} {'registry_ms':>12}")
+    for n in args.sizes:
+        signals = _signals(n)
+        reg = PatternRegistry(signals)
+        search = _best_of(lambda: _legacy(signals, text), args.repeat)
+        # Offsets for every hit: the legacy equivalent is one finditer per pattern.
+        finditer = _best_of(lambda: [list(re.finditer(s.pattern, text, _FLAGS)) for s in signals], args.repeat)
+        single = _best_of(lambda: reg.scan(text), args.repeat)
+        print(f"{len(signals):>8} {search * 1e3:>17.1f} {finditer * 1e3:>19.1f} {single * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
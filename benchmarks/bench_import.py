@@ -0,0 +1,126 @@
+"""
+Cold-start cost: `python -X importtime` for the entry-point modules, checked
+against a budget.
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --modules src.batch --repeat 9 --top 15
+    python -m benchmarks.bench_import --budget src.model_adapter=400
+
+Each import runs in a fresh interpreter; the median cumulative time is compared
+with the budget and the run exits non-zero when a module is over budget or pulls
+in a dependency that must stay lazy (numpy, pyarrow, openai, httpx on the core
+analysis path).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Generous enough for a slow CI box; the point is to catch a new eager import
+# of something heavy, which costs hundreds of ms.
+BUDGETS_MS: Dict[str, float] = {
+    "src.model_adapter": 1000.0,
+    "src.batch": 1000.0,
+    "src.logger": 250.0,
+    "src.run_store": 250.0,
+    "app.contract_analyzer": 100.0,
+}
+LAZY_DEPENDENCIES: Tuple[str, ...] = ("numpy", "pyarrow", "openai", "httpx", "yaml")
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class ImportProfile:
+    module: str
+    total_ms: float
+    self_ms: Dict[str, float] = field(default_factory=dict)  # every module imported, own time
+
+    def imported(self, name: str) -> bool:
+        return any(m == name or m.startswith(name + ".") for m in self.self_ms)
+
+    def top(self, n: int) -> List[Tuple[str, float]]:
+        return sorted(self.self_ms.items(), key=lambda kv: -kv[1])[:n]
+
+
+def profile_import(module: str, cwd: Optional[Path] = None) -> ImportProfile:
+    """Import `module` in a fresh interpreter under `-X importtime` and parse the report."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(ROOT), os.environ.get("PYTHONPATH")])))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=str(cwd or ROOT),
+        env=env,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    profile = ImportProfile(module, 0.0)
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        own_us, cumulative_us, _, name = m.groups()
+        profile.self_ms[name] = int(own_us) / 1000.0
+        if name == module:
+            profile.total_ms = int(cumulative_us) / 1000.0
+    return profile
+
+
+def check(module: str, budget_ms: Optional[float], repeat: int = 5) -> Tuple[ImportProfile, List[str]]:
+    """Median-of-`repeat` profile plus a list of budget / lazy-dependency violations."""
+    runs = [profile_import(module) for _ in range(repeat)]
+    runs.sort(key=lambda p: p.total_ms)
+    median = runs[len(runs) // 2]
+    problems = []
+    if budget_ms is not None and median.total_ms > budget_ms:
+        problems.append(f"{module}: {median.total_ms:.0f} ms > budget {budget_ms:.0f} ms")
+    for dep in LAZY_DEPENDENCIES:
+        if median.imported(dep):
+            problems.append(f"{module}: imports {dep} eagerly")
+    return median, problems
+
+
+def _parse_budgets(items: Sequence[str]) -> Dict[str, float]:
+    out = {}
+    for item in items:
+        name, _, ms = item.partition("=")
+        out[name] = float(ms)
+    return out
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import-time budget check.")
+    parser.add_argument("--modules", nargs="+", default=list(BUDGETS_MS))
+    parser.add_argument("--budget", nargs="*", default=[], metavar="MODULE=MS", help="Override a module's budget")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="Slowest imported modules to list (by own time)")
+    args = parser.parse_args()
+
+    budgets = {**BUDGETS_MS, **_parse_budgets(args.budget)}
+    failures: List[str] = []
+    print(f"{'module':<24} {'median_ms':>10} {'budget_ms':>10}  slowest imports (own ms)")
+    for module in args.modules:
+        profile, problems = check(module, budgets.get(module), args.repeat)
+        failures.extend(problems)
+        budget = budgets.get(module)
+        slowest = ", ".join(f"{name} {ms:.0f}" for name, ms in profile.top(args.top))
+        print(f"{module:<24} {profile.total_ms:>10.1f} {budget if budget is not None else '-':>10}  {slowest}")
+
+    for problem in failures:
+        print(f"FAIL {problem}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Offline throughput/latency benchmark for the async LLM backend against the local stub.
+
+    python -m benchmarks.bench_llm_backend --contracts 40 --latency-ms 50 --concurrency 1 4 16 64
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+from src.llm_backend import LLMRiskModel
+from src.llm_stub_server import StubLLMServer
+
+
+def _contract(clauses: int) -> str:
+    base = Path("sample_data/sample_contract_1.txt").read_text(encoding="utf-8")
+    body = "\n\n".join(
+        f"{i}.1 CLAUSE {i}\nEither party may terminate for convenience. Liability is unlimited liability."
+        for i in range(20, 20 + clauses)
+    )
+    return base + "\n\n" + body
+
+
+async def _run(model: LLMRiskModel, texts: List[str]) -> Tuple[List[float], int]:
+    async def one(i: int, text: str) -> float:
+        t0 = time.perf_counter()
+        await model.analyze_contract_async(text, title=f"C-{i}", source_type="paste")
+        return time.perf_counter() - t0
+
+    try:
+        latencies = list(await asyncio.gather(*(one(i, t) for i, t in enumerate(texts))))
+        return latencies, model._pool.connections_opened if model._pool else 0
+    finally:
+        await model.aclose()
+
+
+def _pct(values: List[float], q: float) -> float:
+    return statistics.quantiles(values, n=100)[int(q) - 1] if len(values) > 1 else values[0]
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Async LLM backend benchmark (local stub server).")
+    parser.add_argument("--contracts", type=int, default=40)
+    parser.add_argument("--clauses", type=int, default=12, help="Clauses per contract")
+    parser.add_argument("--chunk-chars", type=int, default=400)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    texts = [_contract(args.clauses) for _ in range(args.contracts)]
+    print(f"{'concurrency':>11} {'requests':>9} {'req/s':>8} {'contracts/s':>12} {'p50_ms':>8} {'p99_ms':>8} {'conns':>6}")
+    for c in args.concurrency:
+        with StubLLMServer(latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 5) as server:
+            model = LLMRiskModel(base_url=server.url, api_key="", max_concurrency=c, max_chunk_chars=args.chunk_chars)
+            t0 = time.perf_counter()
+            latencies, conns = asyncio.run(_run(model, texts))
+            wall = time.perf_counter() - t0
+            print(
+                f"{c:>11} {server.requests:>9} {server.requests / wall:>8.1f} {len(texts) / wall:>12.2f} "
+                f"{_pct(latencies, 50) * 1e3:>8.0f} {_pct(latencies, 99) * 1e3:>8.0f} {conns:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Pipeline benchmark suite with stored results for release-to-release comparison.
+
+    python -m benchmarks.bench_pipeline --sizes 1KB 100KB 1MB 10MB --save benchmarks/results/v1.json
+    python -m benchmarks.bench_pipeline --compare benchmarks/results/v1.json --tolerance 0.25
+
+Each case runs in a fresh spawned process so peak RSS is per case.
+`--compare` exits 1 if any case's p50 is slower than the baseline by more than `--tolerance`.
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing as mp
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from benchmarks.synthetic import generate_contract, parse_size
+
+CASES = ("extract_features", "compute_score", "analyze_contract", "model_dump", "run_evaluation")
+# Cases whose cost depends on document size; the others run once per suite.
+SIZED_CASES = ("extract_features", "analyze_contract", "model_dump")
+
+
+@dataclass
+class BenchResult:
+    case: str
+    size_bytes: int
+    iterations: int
+    p50_ms: float
+    p99_ms: float
+    mean_ms: float
+    throughput_mb_s: Optional[float]
+    peak_rss_mb: Optional[float]
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _percentile(sorted_samples: List[float], q: float) -> float:
+    # Nearest-rank: p99 of few samples is the max rather than an interpolation.
+    idx = min(len(sorted_samples) - 1, max(0, int(round(q * len(sorted_samples) + 0.5)) - 1))
+    return sorted_samples[idx]
+
+
+def _setup(case: str, size_bytes: int, density: float) -> Tuple[Callable[[], object], int]:
+    """Build inputs outside the timed region; returns (fn, bytes processed per call)."""
+    from src.feature_extractor import extract_features
+    from src.model_adapter import analyze_contract
+    from src.scoring import compute_score
+
+    if case == "run_evaluation":
+        from src.evaluation_stub import EvalCase, load_cases, run_evaluation
+
+        base = load_cases("sample_data/eval_cases.json")
+        cases = [
+            EvalCase(f"{c.id}-{i}", c.title, c.text, c.expected_risk_level, c.expected_categories)
+            for i in range(20)
+            for c in base
+        ]
+        return (lambda: run_evaluation(cases)), sum(len(c.text) for c in cases)
+
+    if case == "compute_score":
+        text = generate_contract(64 * 1024, density=1.0)
+        findings = analyze_contract(text, title="bench", source_type="paste").findings * 50
+        return (lambda: compute_score(findings)), 0
+
+    text = generate_contract(size_bytes, density=density)
+    if case == "extract_features":
+        return (lambda: extract_features(text)), len(text)
+    if case == "analyze_contract":
+        return (lambda: analyze_contract(text, title="bench", source_type="paste")), len(text)
+    if case == "model_dump":
+        result = analyze_contract(text, title="bench", source_type="paste")
+        return (lambda: (result.model_dump(), result.model_dump_json())), 0
+    raise ValueError(f"Unknown case: {case}")
+
+
+def run_case(case: str, size_bytes: int, density: float, budget_s: float, max_iter: int) -> BenchResult:
+    fn, processed = _setup(case, size_bytes, density)
+    fn()  # warm-up (regex compilation, imports)
+    samples: List[float] = []
+    deadline = time.perf_counter() + budget_s
+    while len(samples) < 3 or (len(samples) < max_iter and time.perf_counter() < deadline):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+
+    samples.sort()
+    p50 = statistics.median(samples)
+    return BenchResult(
+        case=case,
+        size_bytes=size_bytes,
+        iterations=len(samples),
+        p50_ms=round(p50 * 1e3, 3),
+        p99_ms=round(_percentile(samples, 0.99) * 1e3, 3),
+        mean_ms=round(statistics.fmean(samples) * 1e3, 3),
+        throughput_mb_s=round(processed / (1024 * 1024) / p50, 2) if processed and p50 > 0 else None,
+        peak_rss_mb=_peak_rss_mb(),
+    )
+
+
+def _isolated(case: str, size_bytes: int, density: float, budget_s: float, max_iter: int) -> BenchResult:
+    with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn")) as pool:
+        return pool.submit(run_case, case, size_bytes, density, budget_s, max_iter).result()
+
+
+def _meta() -> Dict[str, str]:
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        rev = "unknown"
+    return {
+        "git_rev": rev,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+    }
+
+
+def compare(
+    current: List[BenchResult], baseline_path: Path, tolerance: float, min_delta_ms: float = 0.05
+) -> List[str]:
+    """
+    Human-readable regressions: p50 slower than baseline by more than `tolerance`
+    (fraction) and by at least `min_delta_ms`, so timer noise on tiny inputs is ignored.
+    """
+    baseline = {
+        (r["case"], r["size_bytes"]): r for r in json.loads(baseline_path.read_text(encoding="utf-8"))["results"]
+    }
+    regressions = []
+    for r in current:
+        base = baseline.get((r.case, r.size_bytes))
+        if base is None or base["p50_ms"] <= 0:
+            continue
+        ratio = r.p50_ms / base["p50_ms"]
+        if ratio > 1.0 + tolerance and r.p50_ms - base["p50_ms"] >= min_delta_ms:
+            regressions.append(
+                f"{r.case} @ {r.size_bytes} B: p50 {base['p50_ms']:.2f} -> {r.p50_ms:.2f} ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Analysis pipeline benchmark suite.")
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--sizes", nargs="+", default=["1KB", "100KB", "1MB", "10MB"], help="e.g. 1KB 1MB 100MB")
+    parser.add_argument("--density", type=float, default=0.2, help="Fraction of sections that are risk clauses")
+    parser.add_argument("--budget", type=float, default=2.0, help="Seconds of timed iterations per case")
+    parser.add_argument("--max-iter", type=int, default=200)
+    parser.add_argument("--no-isolate", action="store_true", help="Run in-process (peak RSS is then cumulative)")
+    parser.add_argument("--save", type=Path, help="Write results JSON here")
+    parser.add_argument("--compare", type=Path, help="Baseline results JSON to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta-ms", type=float, default=0.05)
+    args = parser.parse_args()
+
+    runner = run_case if args.no_isolate else _isolated
+    sizes = [parse_size(s) for s in args.sizes]
+    plan = [(c, s) for c in args.cases for s in (sizes if c in SIZED_CASES else [0])]
+
+    print(f"{'case':<18} {'size':>10} {'iters':>6} {'p50_ms':>10} {'p99_ms':>10} {'MB/s':>8} {'rss_mb':>8}")
+    results: List[BenchResult] = []
+    for case, size in plan:
+        r = runner(case, size, args.density, args.budget, args.max_iter)
+        results.append(r)
+        mbps = f"{r.throughput_mb_s:.2f}" if r.throughput_mb_s is not None else "-"
+        rss = f"{r.peak_rss_mb:.1f}" if r.peak_rss_mb is not None else "-"
+        print(f"{case:<18} {size:>10} {r.iterations:>6} {r.p50_ms:>10.2f} {r.p99_ms:>10.2f} {mbps:>8} {rss:>8}")
+
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"meta": {**_meta(), "density": args.density}, "results": [asdict(r) for r in results]}
+        args.save.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"Saved {args.save}")
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance, args.min_delta_ms)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
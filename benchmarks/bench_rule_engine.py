@@ -0,0 +1,102 @@
+"""
+Findings rules at scale: hard-coded style `any(f.name == ...)` chains vs the
+compiled, feature-dispatched RuleSet.
+
+    python -m benchmarks.bench_rule_engine --rules 100 1000 5000 --features 60
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Any, Dict, List
+
+from src.rule_engine import RuleSet, RulesFile
+from src.schemas import Feature, FeatureSet, Finding
+
+
+def _spec(n_rules: int, n_features: int, seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    names = [f"has_signal_{i}" for i in range(n_features)]
+    rules = []
+    for i in range(n_rules):
+        when: Dict[str, Any] = {"all": rng.sample(names, rng.randint(1, 2))}
+        if rng.random() < 0.5:
+            when["none"] = rng.sample(names, 1)
+        if rng.random() < 0.3:
+            when = {"any": rng.sample(names, 3)}
+        rules.append(
+            {
+                "id": f"B-{i:05d}",
+                "when": when,
+                "finding": {
+                    "category": "Bench",
+                    "risk_statement": f"Rule {i}",
+                    "severity": rng.choice(["Low", "Medium", "High", "Critical"]),
+                    "confidence": 0.5,
+                    "recommendation": "Review.",
+                },
+                "evidence": {"fallback": {"clause_ref": "N/A", "snippet": "-"}},
+            }
+        )
+    return {"name": "bench", "rules": rules}
+
+
+def _legacy(spec: Dict[str, Any], features: FeatureSet) -> List[Finding]:
+    """The pre-engine shape: every condition scans the feature list."""
+    out: List[Finding] = []
+    feats = features.features
+    for r in spec["rules"]:
+        w = r["when"]
+        if w.get("all") and not all(any(f.name == n and f.value for f in feats) for n in w["all"]):
+            continue
+        if w.get("any") and not any(any(f.name == n and f.value for f in feats) for n in w["any"]):
+            continue
+        if w.get("none") and any(any(f.name == n and f.value for f in feats) for n in w["none"]):
+            continue
+        out.append(Finding(finding_id=r["id"], evidence=[r["evidence"]["fallback"]], **r["finding"]))
+    return out
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rule engine scaling benchmark.")
+    parser.add_argument("--rules", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--features", type=int, default=60)
+    parser.add_argument("--truthy", type=float, default=0.1, help="Fraction of features set on the document")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    features = FeatureSet(
+        features=[Feature(name=f"has_signal_{i}", value=rng.random() < args.truthy, dtype="bool") for i in range(args.features)]
+    )
+
+    print(f"{'rules':>6} {'compile_ms':>11} {'legacy_ms':>10} {'compiled_ms':>12} {'matched':>8}")
+    for n in args.rules:
+        spec = _spec(n, args.features)
+        t0 = time.perf_counter()
+        ruleset = RuleSet(RulesFile.model_validate(spec), version="bench")
+        compile_ms = (time.perf_counter() - t0) * 1e3
+
+        expected = [f.finding_id for f in _legacy(spec, features)]
+        got = [f.finding_id for f in ruleset.evaluate(features)]
+        assert got == expected, "compiled rules disagree with the reference evaluation"
+
+        legacy = _best_of(lambda: _legacy(spec, features), args.repeat)
+        compiled = _best_of(lambda: ruleset.evaluate(features), args.repeat)
+        print(f"{n:>6} {compile_ms:>11.1f} {legacy * 1e3:>10.2f} {compiled * 1e3:>12.3f} {len(got):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Search latency over a large run store.
+
+    python -m benchmarks.bench_run_search --runs 1000000 --db benchmarks/results/search.db
+
+Fills the store with synthetic run payloads (no analysis is run; a realistic
+mix of categories, severities, feature flags, titles and evidence snippets),
+then times `RunStore.search` for typical audit queries. An existing `--db` is
+reused, so the fill is paid once.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from src.run_store import RunStore
+
+_CATEGORIES = ("Liability", "Termination", "Renewal", "Confidentiality", "IP", "Payment", "General")
+_SEVERITIES = ("Low", "Medium", "High", "Critical")
+_FEATURES = tuple(f"has_signal_{i}" for i in range(30)) + ("has_uncapped_liability", "has_auto_renewal")
+_VENDORS = tuple(f"vendor{i}" for i in range(2000))
+_WORDS = tuple(f"w{i}" for i in range(20000)) + ("unlimited", "liability", "consequential", "renewal")
+
+QUERIES = (
+    "category:Liability feature:has_uncapped_liability title:vendor7",
+    "category:Liability severity:critical",
+    "unlimited consequential",
+    "title:vendor42",
+    "feature:has_auto_renewal category:Renewal title:vendor1999",
+)
+
+
+def _payloads(n: int, seed: int = 0) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    rng = random.Random(seed)
+    for i in range(n):
+        day = f"2026-{rng.randint(1, 9):02d}-{rng.randint(1, 28):02d}"
+        findings = [
+            {
+                "category": rng.choice(_CATEGORIES),
+                "severity": rng.choice(_SEVERITIES),
+                "evidence": [{"snippet": " ".join(rng.choices(_WORDS, k=8))}],
+            }
+            for _ in range(rng.randint(1, 3))
+        ]
+        features = [{"name": f, "dtype": "bool", "value": rng.random() < 0.1} for f in _FEATURES]
+        yield f"run-{i:09d}", {
+            "run_id": f"run-{i:09d}",
+            "contract": {"title": f"{rng.choice(_VENDORS)} MSA"},
+            "summary": {"risk_level": rng.choice(_SEVERITIES), "overall_risk_score": rng.randint(0, 100)},
+            "findings": findings,
+            "features": {"features": features},
+            "audit": [{"ts": f"{day}T00:00:00Z"}],
+        }
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run store search benchmark.")
+    parser.add_argument("--runs", type=int, default=200_000)
+    parser.add_argument("--db", type=Path, default=Path("benchmarks/results/search.db"))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with RunStore(args.db, batch_size=5000, synchronous="OFF") as store:
+        have = store.count()
+        if have < args.runs:
+            t0 = time.perf_counter()
+            for run_id, payload in _payloads(args.runs):
+                if int(run_id[4:]) >= have:
+                    store.append(run_id, payload)
+            store.flush()
+            elapsed = time.perf_counter() - t0
+            print(f"filled {args.runs - have} runs in {elapsed:.1f}s ({(args.runs - have) / elapsed:,.0f} runs/s)")
+
+        print(f"{'query':<72} {'hits':>8} {'best_ms':>9}")
+        for q in QUERIES:
+            timings: List[float] = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                hits = store.search(q, limit=1000)
+                timings.append(time.perf_counter() - t0)
+            print(f"{q:<72} {len(hits):>8} {min(timings) * 1e3:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
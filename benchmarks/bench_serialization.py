@@ -0,0 +1,118 @@
+"""
+Per-result cost of building and serializing an `AnalysisResult`.
+
+    python -m benchmarks.bench_serialization --n 2000 --batch 400
+
+Compares validated construction with `model_construct`, dict round-trips with
+direct JSON bytes, and pickled models with JSON bytes across a process pool.
+"""
+
+from __future__ import annotations
+
+import json
+import pickle
+import time
+from typing import Callable, List
+
+from benchmarks.synthetic import generate_contract
+from src.batch import analyze_contracts_batch
+from src.model_adapter import analyze_contract
+from src.schemas import (
+    AnalysisResult,
+    AuditEvent,
+    ContractMeta,
+    Evidence,
+    Feature,
+    FeatureSet,
+    Finding,
+    ScoringBreakdown,
+    ScoringBreakdownItem,
+    SeverityWeights,
+    Summary,
+)
+
+
+def _per_call_us(fn: Callable[[], object], n: int) -> float:
+    fn()
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e6
+
+
+def _rebuild(result: AnalysisResult, construct: bool) -> Callable[[], AnalysisResult]:
+    """Rebuild `result` model by model, the way the pipeline does, validated or via model_construct."""
+    d = result.model_dump()
+
+    def make(cls, **kw):  # type: ignore[no-untyped-def]
+        return cls.model_construct(**kw) if construct else cls(**kw)
+
+    def build() -> AnalysisResult:
+        findings = [
+            make(Finding, **{**f, "evidence": [make(Evidence, **e) for e in f["evidence"]]}) for f in d["findings"]
+        ]
+        features = make(FeatureSet, version=d["features"]["version"], features=[make(Feature, **f) for f in d["features"]["features"]])
+        s = d["scoring"]
+        scoring = make(
+            ScoringBreakdown,
+            **{**s, "weights": make(SeverityWeights, **s["weights"]), "items": [make(ScoringBreakdownItem, **i) for i in s["items"]]},
+        )
+        return make(
+            AnalysisResult,
+            run_id=d["run_id"],
+            contract=make(ContractMeta, **d["contract"]),
+            summary=make(Summary, **d["summary"]),
+            findings=findings,
+            features=features,
+            scoring=scoring,
+            audit=[make(AuditEvent, **a) for a in d["audit"]],
+        )
+
+    return build
+
+
+def _batch_seconds(docs: List[str], as_json: bool) -> float:
+    items = ((t, "bench", "paste") for t in docs)
+    t0 = time.perf_counter()
+    for item in analyze_contracts_batch(items, executor="process", max_workers=4, as_json=as_json):
+        assert item.ok, item.error
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AnalysisResult construction/serialization benchmark.")
+    parser.add_argument("--n", type=int, default=2000, help="Iterations per micro-benchmark")
+    parser.add_argument("--batch", type=int, default=400, help="Documents for the process-pool comparison (0 to skip)")
+    args = parser.parse_args()
+
+    text = generate_contract(16 * 1024, density=0.5)
+    result = analyze_contract(text, title="bench", source_type="paste")
+    n = args.n
+
+    rows = [
+        ("construct: validated models", _per_call_us(_rebuild(result, construct=False), n)),
+        ("construct: model_construct", _per_call_us(_rebuild(result, construct=True), n)),
+        ("serialize: model_dump + json.dumps", _per_call_us(lambda: json.dumps(result.model_dump()).encode("utf-8"), n)),
+        ("serialize: model_dump_json bytes", _per_call_us(lambda: result.model_dump_json().encode("utf-8"), n)),
+        ("pretty: json.dumps(model_dump, indent=2)", _per_call_us(lambda: json.dumps(result.model_dump(), indent=2), n)),
+        ("pretty: model_dump_json(indent=2)", _per_call_us(lambda: result.model_dump_json(indent=2), n)),
+        ("transfer: pickle model round-trip", _per_call_us(lambda: pickle.loads(pickle.dumps(result)), n)),
+        ("transfer: JSON bytes + json.loads", _per_call_us(lambda: json.loads(result.model_dump_json()), n)),
+    ]
+    print(f"result JSON: {len(result.model_dump_json())} bytes, {len(result.findings)} findings")
+    for name, us in rows:
+        print(f"{name:<44} {us:>9.1f} us/result")
+
+    if args.batch:
+        docs = [generate_contract(4 * 1024, density=0.5, seed=i) for i in range(args.batch)]
+        _batch_seconds(docs[:8], as_json=False)  # warm the import path
+        models = _batch_seconds(docs, as_json=False)
+        raw = _batch_seconds(docs, as_json=True)
+        print(f"{'batch (4 procs): models':<44} {models / len(docs) * 1e6:>9.1f} us/result")
+        print(f"{'batch (4 procs): as_json bytes':<44} {raw / len(docs) * 1e6:>9.1f} us/result")
+
+
+if __name__ == "__main__":
+    main()
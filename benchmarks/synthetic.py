@@ -0,0 +1,41 @@
+"""
+Deterministic synthetic contracts for benchmarks (generated by `src/synthetic.py`),
+modelled on `sample_data/sample_contract_1.txt`: numbered sections whose bodies
+are either risk clauses (liability, termination, renewal, indemnity, cure) or
+boilerplate.
+
+    python -m benchmarks.synthetic --size 10MB --density 0.3 > contract.txt
+"""
+
+from __future__ import annotations
+
+import re
+
+from src.synthetic import BOILERPLATE, RISK_CLAUSES, generate_contract, iter_contract_chunks
+
+_UNITS = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+
+
+def parse_size(size: str) -> int:
+    """'1KB', '100MB', '512' -> bytes."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B)?\s*", size.upper())
+    if not m:
+        raise ValueError(f"Unrecognized size: {size!r}")
+    return int(float(m.group(1)) * _UNITS[m.group(2) or "B"])
+
+
+def main() -> None:
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Write a synthetic contract to stdout.")
+    parser.add_argument("--size", default="1MB")
+    parser.add_argument("--density", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for chunk in iter_contract_chunks(parse_size(args.size), args.density, args.seed):
+        sys.stdout.write(chunk)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, Literal, Optional, Set, Tuple, Union
+
+from .model_adapter import analyze_contract
+from .schemas import AnalysisResult
+
+
+BatchItem = Tuple[str, str, str]  # (contract_text, title, source_type)
+PoolKind = Literal["thread", "process"]
+
+
+@dataclass
+class BatchItemResult:
+    """
+    Outcome of one batch item; exactly one of `result` / `result_json` / `error` is set.
+
+    `result_json` is the serialized `AnalysisResult` (UTF-8 JSON bytes) when the
+    batch runs with `as_json=True`.
+    """
+
+    index: int
+    result: Optional[AnalysisResult] = None
+    error: Optional[str] = None
+    result_json: Optional[bytes] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _analyze_one(
+    index: int, contract_text: str, title: str, source_type: str, as_json: bool = False
+) -> BatchItemResult:
+    # Module-level so it can be pickled into process workers.
+    try:
+        result = analyze_contract(contract_text, title=title, source_type=source_type)
+        if as_json:
+            # Serialized in the worker: bytes cross the process boundary far cheaper than a pickled model.
+            return BatchItemResult(index=index, result_json=result.model_dump_json().encode("utf-8"))
+        return BatchItemResult(index=index, result=result)
+    except Exception as exc:  # one bad document must not abort the batch
+        return BatchItemResult(index=index, error=f"{type(exc).__name__}: {exc}")
+
+
+def _make_executor(kind: PoolKind, max_workers: Optional[int]) -> Executor:
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"Unknown executor kind: {kind!r}")
+
+
+def analyze_contracts_batch(
+    items: Iterable[BatchItem],
+    executor: Union[PoolKind, Executor] = "process",
+    max_workers: Optional[int] = None,
+    ordered: bool = True,
+    max_in_flight: Optional[int] = None,
+    as_json: bool = False,
+) -> Iterator[BatchItemResult]:
+    """
+    Fan `analyze_contract` out over a thread or process pool.
+
+    - `items` may be a lazy iterable; at most `max_in_flight` documents are held
+      (submitted or awaiting their turn) at once, so huge batches stream. It
+      defaults to 4 x `max_workers`, or 4 x the CPU count when that is not given.
+    - `ordered=True` yields in input order as soon as the next item is ready;
+      `ordered=False` yields each item as it completes.
+    - Failures are captured per item in `BatchItemResult.error`.
+    - `as_json=True` returns `result_json` bytes instead of models, for callers
+      that only store or forward the payload.
+
+    Pass an existing `Executor` to reuse a warm pool; it is not shut down here.
+    Its size is not read from the pool, so pass its `max_workers` (or
+    `max_in_flight`) to size the window.
+    """
+    owns_pool = not isinstance(executor, Executor)
+    pool = _make_executor(executor, max_workers) if owns_pool else executor
+    limit = max_in_flight or 4 * (max_workers or os.cpu_count() or 1)
+
+    source = enumerate(items)
+    pending: Dict[Future, int] = {}
+    ready: Dict[int, BatchItemResult] = {}
+    next_index = 0
+    exhausted = False
+
+    def _collect(done: Set[Future]) -> Iterator[BatchItemResult]:
+        for fut in done:
+            idx = pending.pop(fut)
+            exc = fut.exception()
+            # Errors raised outside the worker wrapper (e.g. a broken process pool).
+            item = fut.result() if exc is None else BatchItemResult(index=idx, error=f"{type(exc).__name__}: {exc}")
+            if ordered:
+                ready[idx] = item
+            else:
+                yield item
+
+    try:
+        while True:
+            while not exhausted and len(pending) + len(ready) < limit:
+                try:
+                    idx, item = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                try:
+                    text, title, source_type = item
+                except (TypeError, ValueError) as exc:  # malformed input is that item's failure, not the batch's
+                    bad = BatchItemResult(index=idx, error=f"Malformed item, expected (text, title, type): {exc}")
+                    if ordered:
+                        ready[idx] = bad
+                    else:
+                        yield bad
+                    continue
+                pending[pool.submit(_analyze_one, idx, text, title, source_type, as_json)] = idx
+
+            if not pending and (not ordered or next_index not in ready):
+                break
+
+            if pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                yield from _collect(done)
+
+            while next_index in ready:
+                yield ready.pop(next_index)
+                next_index += 1
+    finally:
+        if owns_pool:
+            pool.shutdown(wait=True, cancel_futures=True)
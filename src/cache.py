@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .model_adapter import ruleset_version
+from .schemas import AnalysisResult, FeatureSet, ScoringBreakdown
+from .scoring import DEFAULT_PROFILE, ScoringProfile
+
+
+def normalize_text(contract_text: str) -> str:
+    # Line endings only: every signal pattern treats \r\n and \n alike, so the
+    # computed findings are identical. Other whitespace is significant to the rules.
+    return (contract_text or "").replace("\r\n", "\n").replace("\r", "\n")
+
+
+def pipeline_fingerprint(profile: ScoringProfile = DEFAULT_PROFILE) -> str:
+    """Everything besides the text that determines the analysis payload."""
+    return json.dumps(
+        {
+            "features": FeatureSet.model_fields["version"].default,
+            "rules": ruleset_version(),
+            "scoring": ScoringBreakdown.model_fields["method"].default,
+            "profile": profile.fingerprint(),
+        },
+        sort_keys=True,
+    )
+
+
+def cache_key(contract_text: str, profile: ScoringProfile = DEFAULT_PROFILE) -> str:
+    h = hashlib.sha256()
+    h.update(pipeline_fingerprint(profile).encode("utf-8"))
+    h.update(b"\x00")
+    h.update(normalize_text(contract_text).encode("utf-8"))
+    return h.hexdigest()
+
+
+class LRUBytesCache:
+    """In-memory LRU of byte payloads, evicting by total size (and optionally count or age)."""
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.size_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._data: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if self.ttl_seconds is not None and time.time() - stored_at > self.ttl_seconds:
+            del self._data[key]
+            self.size_bytes -= len(value)
+            self.expirations += 1
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.size_bytes -= len(old[1])
+        self._data[key] = (time.time(), value)
+        self.size_bytes += len(value)
+        while self.size_bytes > self.max_bytes or (self.max_entries and len(self._data) > self.max_entries):
+            _, (_, evicted) = self._data.popitem(last=False)
+            self.size_bytes -= len(evicted)
+            self.evictions += 1
+
+
+class SQLiteBytesStore:
+    """
+    Persistent key -> bytes table (single file, safe to share across threads).
+
+    Optional `ttl_seconds` expires entries by age; optional `max_bytes` evicts the
+    least recently used rows once the table grows past the budget.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        table: str = "cache",
+        ttl_seconds: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.expirations = 0
+        self._table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._migrate()
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)")
+        self._conn.commit()
+        self.size_bytes = self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()[0]
+
+    def _migrate(self) -> None:
+        # Tables written before TTL/size bookkeeping have only (key, value); existing rows count as stored now.
+        columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({self._table})")}
+        added = [
+            col
+            for col in ("size INTEGER", "created_at REAL", "accessed_at REAL")
+            if col.split()[0] not in columns
+        ]
+        if not added:
+            return
+        for col in added:
+            self._conn.execute(f"ALTER TABLE {self._table} ADD COLUMN {col} NOT NULL DEFAULT 0")
+        now = time.time()
+        self._conn.execute(
+            f"UPDATE {self._table} SET size = length(value), created_at = ?, accessed_at = ?", (now, now)
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, size, created_at FROM {self._table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if self.ttl_seconds is not None and now - row[2] > self.ttl_seconds:
+                self._conn.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+                self._conn.commit()
+                self.size_bytes -= row[1]
+                self.expirations += 1
+                return None
+            if self.max_bytes is not None:
+                # Recency only matters when there is a size budget to enforce.
+                self._conn.execute(f"UPDATE {self._table} SET accessed_at = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+            return bytes(row[0])
+
+    def put(self, key: str, value: bytes) -> None:
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute(f"SELECT size FROM {self._table} WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self._table} (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self.size_bytes += len(value) - (old[0] if old else 0)
+            if self.max_bytes is not None:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        while self.size_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                f"SELECT key, size FROM {self._table} ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self.size_bytes <= self.max_bytes:
+                    break
+                self._conn.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+                self.size_bytes -= size
+                self.evictions += 1
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class AnalysisCache:
+    """
+    Content-addressed cache of analysis payloads (summary, findings, features, scoring).
+
+    Keyed on the normalized text plus the pipeline fingerprint, so a change in
+    feature version, scoring method or scoring profile never serves stale results.
+    Memory tier first, then the optional SQLite tier (hits are promoted).
+    """
+
+    PAYLOAD_FIELDS = ("summary", "findings", "features", "scoring")
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entries: Optional[int] = None,
+        path: Optional[str | Path] = None,
+    ):
+        self._memory = LRUBytesCache(max_bytes=max_bytes, max_entries=max_entries)
+        self._disk = SQLiteBytesStore(path, table="analysis_cache") if path else None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+
+    def key_for(self, contract_text: str, profile: ScoringProfile = DEFAULT_PROFILE) -> str:
+        return cache_key(contract_text, profile)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            raw = self._memory.get(key)
+            if raw is not None:
+                self.hits += 1
+                self.memory_hits += 1
+            elif self._disk is not None and (raw := self._disk.get(key)) is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                self._memory.put(key, raw)
+            else:
+                self.misses += 1
+                return None
+        return json.loads(raw)
+
+    def __contains__(self, key: str) -> bool:
+        """Whether `get(key)` would hit; does not count towards the hit/miss stats."""
+        with self._lock:
+            if self._memory.get(key) is not None:
+                return True
+            return self._disk is not None and self._disk.get(key) is not None
+
+    def put(self, key: str, result: AnalysisResult) -> None:
+        self._put_raw(key, result.model_dump_json(include=set(self.PAYLOAD_FIELDS)).encode("utf-8"))
+
+    def put_json(self, key: str, result_json: bytes) -> None:
+        """`put` for a result already serialized (e.g. by a worker process), without rebuilding the model."""
+        payload = json.loads(result_json)
+        self._put_raw(key, json.dumps({f: payload[f] for f in self.PAYLOAD_FIELDS}).encode("utf-8"))
+
+    def _put_raw(self, key: str, raw: bytes) -> None:
+        with self._lock:
+            self._memory.put(key, raw)
+            if self._disk is not None:
+                self._disk.put(key, raw)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory.size_bytes,
+                "evictions": self._memory.evictions,
+            }
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+
+
+_SECTION_NUMBER = re.compile(r"^[ \t]*\d+(?:\.\d+)*\.?[ \t]+", re.MULTILINE)
+_WS = re.compile(r"\s+")
+
+
+def normalize_clause(chunk_text: str) -> str:
+    """
+    Canonical form of a chunk for deduplication: heading numbers dropped and
+    whitespace collapsed, so "9.2 CONFIDENTIALITY" and "8.1  CONFIDENTIALITY" with
+    the same body share an entry. Clause refs are re-resolved per document.
+    """
+    return _WS.sub(" ", _SECTION_NUMBER.sub("", chunk_text)).strip()
+
+
+class ChunkResponseCache:
+    """
+    Model response cache keyed on (prompt template hash, model id, normalized chunk text).
+
+    Boilerplate clauses shared across vendors hit the cache instead of being
+    resent to the model. Memory LRU in front of an optional SQLite tier, both
+    with TTL and size eviction. `stats()` reports the deduplication ratio.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str | Path] = None,
+        ttl_seconds: Optional[float] = 30 * 24 * 3600,
+        max_bytes: int = 32 * 1024 * 1024,
+        max_disk_bytes: Optional[int] = 1024 * 1024 * 1024,
+    ):
+        self._memory = LRUBytesCache(max_bytes=max_bytes, ttl_seconds=ttl_seconds)
+        self._disk = (
+            SQLiteBytesStore(path, table="chunk_responses", ttl_seconds=ttl_seconds, max_bytes=max_disk_bytes)
+            if path
+            else None
+        )
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.inflight_joins = 0
+        self.chars_saved = 0
+
+    @staticmethod
+    def key_for(prompt_hash: str, model: str, chunk_text: str) -> str:
+        h = hashlib.sha256()
+        for part in (prompt_hash, model, normalize_clause(chunk_text)):
+            h.update(part.encode("utf-8"))
+            h.update(b"\x00")
+        return h.hexdigest()
+
+    def get(self, key: str, chunk_chars: int = 0) -> Optional[str]:
+        with self._lock:
+            self.lookups += 1
+            raw = self._memory.get(key)
+            if raw is None and self._disk is not None:
+                raw = self._disk.get(key)
+                if raw is not None:
+                    self.disk_hits += 1
+                    self._memory.put(key, raw)
+            if raw is None:
+                return None
+            self.hits += 1
+            self.chars_saved += chunk_chars
+        return raw.decode("utf-8")
+
+    def record_inflight_join(self, chunk_chars: int = 0) -> None:
+        """A concurrent request for the same key was awaited instead of resent."""
+        with self._lock:
+            self.inflight_joins += 1
+            self.chars_saved += chunk_chars
+
+    def put(self, key: str, response: str) -> None:
+        raw = response.encode("utf-8")
+        with self._lock:
+            self._memory.put(key, raw)
+            if self._disk is not None:
+                self._disk.put(key, raw)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            deduped = self.hits + self.inflight_joins
+            return {
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "inflight_joins": self.inflight_joins,
+                "misses": self.lookups - deduped,
+                "dedup_ratio": round(deduped / self.lookups, 3) if self.lookups else 0.0,
+                "chars_saved": self.chars_saved,
+                "memory_entries": len(self._memory),
+                "evictions": self._memory.evictions + (self._disk.evictions if self._disk else 0),
+                "expirations": self._memory.expirations + (self._disk.expirations if self._disk else 0),
+            }
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
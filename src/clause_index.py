@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .feature_extractor import PatternRegistry, Signal, SignalHit, StreamingScanner, line_snippet
+
+
+# Headings are lines like "9.2 LIMITATION OF LIABILITY", "12.1 Termination" or a bare
+# all-caps line like "GOVERNING LAW". Case-sensitive on purpose (the registry is not).
+HEADING_PATTERN = (
+    r"(?-i:^[ \t]*(?:(?P<num>\d+(?:\.\d+)*)\.?[ \t]+(?P<numbered>[A-Z][^\n.;:]{1,80}?)"
+    r"|(?P<caps>[A-Z][A-Z0-9 ,&/'()\-]{2,80}?))[ \t]*$)"
+)
+_HEADING_RE = re.compile(HEADING_PATTERN, re.MULTILINE)
+
+HEADING_REGISTRY = PatternRegistry([Signal("clause_heading", HEADING_PATTERN)])
+
+
+@dataclass(frozen=True)
+class Clause:
+    section_id: Optional[str]
+    heading: str
+    start: int
+    end: int
+    page: Optional[int] = None  # 1-based page of the evidence, for paginated sources (PDF/DOCX)
+
+    @property
+    def ref(self) -> str:
+        """Human-readable clause reference used in `Evidence.clause_ref`."""
+        ref = f"Section {self.section_id}" if self.section_id else self.heading
+        return f"{ref} (p. {self.page})" if self.page is not None else ref
+
+
+def parse_heading(line: str) -> Tuple[Optional[str], str]:
+    m = _HEADING_RE.search(line)
+    if m is None:
+        return None, line.strip()
+    return m.group("num"), (m.group("numbered") or m.group("caps")).strip()
+
+
+class ClauseIndex:
+    """
+    Interval index of clauses: each heading opens a clause that runs to the next one.
+
+    Clause starts are kept sorted, so `locate(offset)` is a single bisect
+    (O(log n)) no matter how many clauses the contract has.
+    """
+
+    def __init__(self, clauses: List[Clause]):
+        self.clauses = clauses
+        self._starts = [c.start for c in clauses]
+
+    def __len__(self) -> int:
+        return len(self.clauses)
+
+    @classmethod
+    def from_headings(cls, headings: Iterable[Tuple[int, Optional[str], str]], text_length: int) -> "ClauseIndex":
+        """Build from (offset, section_id, heading) tuples in offset order."""
+        heads = list(headings)
+        clauses: List[Clause] = []
+        first = heads[0][0] if heads else text_length
+        if first > 0 or not heads:
+            clauses.append(Clause(section_id=None, heading="Preamble" if heads else "Document", start=0, end=first))
+        for i, (start, section_id, heading) in enumerate(heads):
+            end = heads[i + 1][0] if i + 1 < len(heads) else text_length
+            clauses.append(Clause(section_id=section_id, heading=heading, start=start, end=end))
+        return cls(clauses)
+
+    @classmethod
+    def build(cls, text: str) -> "ClauseIndex":
+        headings = [
+            (m.start(), m.group("num"), (m.group("numbered") or m.group("caps")).strip())
+            for m in _HEADING_RE.finditer(text)
+        ]
+        return cls.from_headings(headings, len(text))
+
+    def locate(self, offset: int) -> Clause:
+        i = bisect_right(self._starts, offset) - 1
+        return self.clauses[max(i, 0)]
+
+
+class ClauseIndexBuilder:
+    """Streaming counterpart of `ClauseIndex.build`: feed the same chunks as the signal scanner."""
+
+    def __init__(self):
+        self._scanner = StreamingScanner(HEADING_REGISTRY)
+        self._headings: List[Tuple[int, Optional[str], str]] = []
+
+    def _add(self, hits: List[SignalHit]) -> None:
+        for h in hits:
+            section_id, heading = parse_heading(h.snippet or "")
+            self._headings.append((h.start, section_id, heading))
+
+    def feed(self, chunk: str) -> None:
+        self._add(self._scanner.feed(chunk))
+
+    def finish(self) -> ClauseIndex:
+        self._add(self._scanner.finish())
+        return ClauseIndex.from_headings(self._headings, self._scanner.text_length)
+
+
+def resolve_hits(
+    hits: Dict[str, List[SignalHit]],
+    index: ClauseIndex,
+    text: Optional[str] = None,
+    page_starts: Optional[Sequence[int]] = None,
+) -> Dict[str, List[Tuple[Clause, str]]]:
+    """
+    Map each signal hit to its enclosing clause and snippet (one bisect per hit).
+    With `page_starts` (sorted text offsets where each page begins), the clause
+    also carries the page the hit is on.
+    """
+    resolved: Dict[str, List[Tuple[Clause, str]]] = {}
+    for name, items in hits.items():
+        out = []
+        for h in items:
+            clause = index.locate(h.start)
+            if page_starts:
+                clause = replace(clause, page=max(bisect_right(page_starts, h.start), 1))
+            out.append((clause, h.snippet if h.snippet is not None else line_snippet(text or "", h.start, h.end)))
+        resolved[name] = out
+    return resolved
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
-from src.model_adapter import analyze_contract
+from src.batch import analyze_contracts_batch
+from src.cache import AnalysisCache, SQLiteBytesStore
+from src.model_adapter import analyze_contract, ruleset_version
+from src.schemas import AnalysisResult, FeatureSet, Finding, SeverityWeights
+from src.scoring import DEFAULT_WEIGHTS, ScoringProfile, compute_score, get_profile
 
 
 @dataclass
@@ -27,14 +32,111 @@ def _predicted_categories(result_dict: Dict[str, Any]) -> Set[str]:
     return {c for c in cats if c}
 
 
-def run_evaluation(cases: List[EvalCase]) -> Dict[str, Any]:
+def prediction_version() -> str:
+    """
+    Version of everything that determines per-case findings. Scoring weights and
+    thresholds are deliberately excluded: stored findings are re-scored on every
+    run, so iterating on `scoring.py` never invalidates the store.
+    """
+    return f"features={FeatureSet.model_fields['version'].default};rules={ruleset_version()}"
+
+
+class PredictionStore:
+    """Per-case findings keyed by hash(prediction version + case text), in SQLite."""
+
+    def __init__(self, path: str | Path):
+        self._db = SQLiteBytesStore(path, table="eval_predictions")
+
+    @staticmethod
+    def key_for(text: str) -> str:
+        h = hashlib.sha256(prediction_version().encode("utf-8"))
+        h.update(b"\x00")
+        h.update(text.encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = self._db.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def put(self, key: str, prediction: Dict[str, Any]) -> None:
+        self._db.put(key, json.dumps(prediction).encode("utf-8"))
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def _prediction(result: AnalysisResult) -> Dict[str, Any]:
+    return {"run_id": result.run_id, "findings": [f.model_dump() for f in result.findings]}
+
+
+def _prediction_from_json(raw: bytes) -> Dict[str, Any]:
+    # Worker output was produced (and validated) by analyze_contract; no need to rebuild models.
+    payload = json.loads(raw)
+    return {"run_id": payload["run_id"], "findings": payload["findings"]}
+
+
+def _predict_one(case: EvalCase, cache: Optional[AnalysisCache]) -> Dict[str, Any]:
+    try:
+        return _prediction(analyze_contract(case.text, title=case.title, source_type="paste", cache=cache))
+    except Exception as exc:
+        return {"error": f"{type(exc).__name__}: {exc}"}
+
+
+def _predict(
+    cases: List[EvalCase], todo: List[int], workers: int, cache: Optional[AnalysisCache]
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    if workers > 1:
+        misses = todo
+        keys: Dict[int, str] = {}
+        if cache is not None:
+            # Cache hits are served here; only misses go to the pool, and their results are cached on the way back.
+            keys = {i: cache.key_for(cases[i].text) for i in todo}
+            misses = []
+            for i in todo:
+                if keys[i] in cache:
+                    yield i, _predict_one(cases[i], cache)
+                else:
+                    misses.append(i)
+        items = ((cases[i].text, cases[i].title, "paste") for i in misses)
+        batch = analyze_contracts_batch(items, executor="process", max_workers=workers, ordered=False, as_json=True)
+        for item in batch:
+            i = misses[item.index]
+            if not item.ok:
+                yield i, {"error": item.error}
+                continue
+            if cache is not None:
+                cache.put_json(keys[i], item.result_json)
+            yield i, _prediction_from_json(item.result_json)
+        return
+
+    for i in todo:
+        yield i, _predict_one(cases[i], cache)
+
+
+def run_evaluation(
+    cases: List[EvalCase],
+    cache: Optional[AnalysisCache] = None,
+    workers: int = 1,
+    store: Optional[PredictionStore] = None,
+    weights: SeverityWeights = DEFAULT_WEIGHTS,
+    scoring_profile: Union[str, ScoringProfile, None] = None,
+) -> Dict[str, Any]:
     """
     Runs evaluation cases through the adapter, compares predicted vs expected.
+    An optional `cache` lets repeated runs over unchanged cases skip recomputation.
+
+    - `workers > 1` analyzes cases in a process pool.
+    - With a `store`, only cases whose text or prediction version changed are
+      re-analyzed; stored findings are re-scored with the current `weights`
+      and thresholds, so scoring experiments take seconds.
+    - `scoring_profile` scores exactly as `analyze_contract(scoring_profile=...)`
+      does (weights, thresholds and cap); it takes precedence over `weights`.
 
     Returns a dict:
     - risk_level_accuracy
     - category_precision/recall/f1 (micro)
     - mismatches[]
+    - recomputed / reused (case counts)
     """
     if not cases:
         return {
@@ -44,22 +146,45 @@ def run_evaluation(cases: List[EvalCase]) -> Dict[str, Any]:
             "category_f1": 0.0,
             "mismatches": [],
             "n": 0,
+            "recomputed": 0,
+            "reused": 0,
         }
 
+    profile = get_profile(scoring_profile) if scoring_profile is not None else None
+    predictions: List[Optional[Dict[str, Any]]] = [None] * len(cases)
+    keys = [PredictionStore.key_for(c.text) for c in cases] if store is not None else []
+    todo: List[int] = []
+    for i in range(len(cases)):
+        if store is not None:
+            predictions[i] = store.get(keys[i])
+        if predictions[i] is None:
+            todo.append(i)
+
+    for i, prediction in _predict(cases, todo, workers, cache):
+        predictions[i] = prediction
+        if store is not None and "error" not in prediction:
+            store.put(keys[i], prediction)
+
     level_hits = 0
     tp = fp = fn = 0
     mismatches: List[Dict[str, Any]] = []
 
-    for c in cases:
-        result = analyze_contract(c.text, title=c.title, source_type="paste").model_dump()
-
-        pred_level = _normalize_level(result["summary"]["risk_level"])
+    for c, prediction in zip(cases, predictions):
+        if prediction is None:
+            prediction = {"error": "No prediction was produced for this case."}
+        error = prediction.get("error")
+        if error:
+            pred_level, pred_cats = "Error", set()
+        else:
+            findings = [Finding.model_validate(f) for f in prediction["findings"]]
+            _, breakdown = compute_score(findings, weights, profile)
+            pred_level = _normalize_level(breakdown.risk_level)
+            pred_cats = _predicted_categories(prediction)
         exp_level = _normalize_level(c.expected_risk_level)
 
         if pred_level == exp_level:
             level_hits += 1
 
-        pred_cats = _predicted_categories(result)
         exp_cats = set(c.expected_categories)
 
         # micro counts
@@ -68,17 +193,18 @@ def run_evaluation(cases: List[EvalCase]) -> Dict[str, Any]:
         fn += len(exp_cats - pred_cats)
 
         if pred_level != exp_level or pred_cats != exp_cats:
-            mismatches.append(
-                {
-                    "id": c.id,
-                    "title": c.title,
-                    "pred_risk_level": pred_level,
-                    "exp_risk_level": exp_level,
-                    "pred_categories": sorted(list(pred_cats)),
-                    "exp_categories": sorted(list(exp_cats)),
-                    "run_id": result.get("run_id"),
-                }
-            )
+            mismatch = {
+                "id": c.id,
+                "title": c.title,
+                "pred_risk_level": pred_level,
+                "exp_risk_level": exp_level,
+                "pred_categories": sorted(list(pred_cats)),
+                "exp_categories": sorted(list(exp_cats)),
+                "run_id": prediction.get("run_id"),
+            }
+            if error:
+                mismatch["error"] = error
+            mismatches.append(mismatch)
 
     accuracy = level_hits / len(cases)
 
@@ -93,6 +219,8 @@ def run_evaluation(cases: List[EvalCase]) -> Dict[str, Any]:
         "category_f1": round(f1, 3),
         "mismatches": mismatches,
         "n": len(cases),
+        "recomputed": len(todo),
+        "reused": len(cases) - len(todo),
     }
 
 
@@ -124,13 +252,29 @@ def main() -> None:
         default="sample_data/eval_cases.json",
         help="Path to evaluation cases JSON (default: sample_data/eval_cases.json)",
     )
+    parser.add_argument(
+        "--cache",
+        default=None,
+        help="Optional SQLite file for the analysis result cache (reused across runs)",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Process pool size for analyzing cases")
+    parser.add_argument(
+        "--store",
+        default=None,
+        help="Optional SQLite file of per-case predictions; re-runs only analyze changed cases",
+    )
+    parser.add_argument("--scoring-profile", default=None, help="Score with this named profile (default: default)")
     args = parser.parse_args()
 
     cases = load_cases(args.path)
-    metrics = run_evaluation(cases)
+    cache = AnalysisCache(path=args.cache) if args.cache else None
+    store = PredictionStore(args.store) if args.store else None
+    metrics = run_evaluation(
+        cases, cache=cache, workers=args.workers, store=store, scoring_profile=args.scoring_profile
+    )
 
     print("\n=== Evaluation Summary ===")
-    print(f"Cases: {metrics['n']}")
+    print(f"Cases: {metrics['n']} (analyzed {metrics['recomputed']}, reused {metrics['reused']})")
     print(f"Risk-level accuracy: {metrics['risk_level_accuracy']}")
     print(
         "Category micro P/R/F1: "
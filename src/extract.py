@@ -0,0 +1,373 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import multiprocessing
+import threading
+import time
+import zipfile
+import zlib
+from bisect import bisect_right
+from dataclasses import asdict, dataclass
+from multiprocessing.pool import AsyncResult, Pool
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Literal, Optional, Tuple, Union
+from xml.etree import ElementTree
+
+from .cache import LRUBytesCache, SQLiteBytesStore
+from .model_adapter import analyze_contract_stream
+from .schemas import AnalysisResult
+from .scoring import ScoringProfile
+
+DocumentKind = Literal["pdf", "docx", "txt"]
+
+# Bump when extraction output changes, so cached text is not reused.
+EXTRACTOR_VERSION = "1"
+
+# How often a waiting caller checks whether another caller restarted the shared pool.
+_POLL_SECONDS = 0.25
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class ExtractionError(RuntimeError):
+    pass
+
+
+class ExtractionTimeout(ExtractionError, TimeoutError):
+    pass
+
+
+@dataclass
+class ExtractedDocument:
+    """
+    Text of one document, page by page. Each page ends with a newline, so
+    `text` is the pages concatenated and `page_starts[i]` is where page i+1
+    begins. `page_starts` is None when the format has no pages (plain text,
+    DOCX without rendered page breaks). `paragraph_starts` are offsets too.
+    """
+
+    kind: DocumentKind
+    pages: List[str]
+    paragraph_starts: List[int]
+    page_starts: Optional[List[int]]
+
+    @property
+    def text(self) -> str:
+        return "".join(self.pages)
+
+    def page_at(self, offset: int) -> Optional[int]:
+        if self.page_starts is None:
+            return None
+        return max(bisect_right(self.page_starts, offset), 1)
+
+    def to_bytes(self) -> bytes:
+        return zlib.compress(json.dumps(asdict(self), separators=(",", ":")).encode("utf-8"), 6)
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "ExtractedDocument":
+        return cls(**json.loads(zlib.decompress(raw)))
+
+
+def detect_kind(name: str, data: bytes) -> DocumentKind:
+    if data[:5] == b"%PDF-":
+        return "pdf"
+    if data[:4] == b"PK\x03\x04":
+        return "docx"
+    suffix = Path(name).suffix.lower()
+    if suffix in (".pdf", ".docx"):
+        raise ExtractionError(f"{name} does not look like a {suffix[1:].upper()} file.")
+    return "txt"
+
+
+def _document(kind: DocumentKind, pages: List[List[str]], paginated: bool) -> ExtractedDocument:
+    """Assemble pages of paragraphs into text with page and paragraph offsets."""
+    texts: List[str] = []
+    paragraph_starts: List[int] = []
+    page_starts: List[int] = []
+    offset = 0
+    for paragraphs in pages:
+        page_starts.append(offset)
+        parts = []
+        for p in paragraphs:
+            paragraph_starts.append(offset)
+            parts.append(p + "\n")
+            offset += len(p) + 1
+        texts.append("".join(parts))
+    return ExtractedDocument(kind, texts, paragraph_starts, page_starts if paginated else None)
+
+
+def extract_docx(data: bytes) -> ExtractedDocument:
+    """Paragraph text from word/document.xml; Word's rendered page breaks give page numbers."""
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            xml = zf.read("word/document.xml")
+    except (zipfile.BadZipFile, KeyError) as exc:
+        raise ExtractionError(f"Not a DOCX document: {exc}") from exc
+
+    pages: List[List[str]] = [[]]
+    paginated = False
+    for para in ElementTree.fromstring(xml).iter(f"{_W}p"):
+        buf: List[str] = []
+        broke = False
+        for el in para.iter():
+            if el.tag == f"{_W}t":
+                buf.append(el.text or "")
+            elif el.tag == f"{_W}tab":
+                buf.append("\t")
+            elif el.tag in (f"{_W}lastRenderedPageBreak", f"{_W}br"):
+                if el.tag == f"{_W}br" and el.get(f"{_W}type") != "page":
+                    buf.append("\n")
+                    continue
+                paginated = broke = True
+                if buf:
+                    pages[-1].append("".join(buf))
+                    buf = []
+                if pages[-1]:
+                    pages.append([])
+        if buf or not broke:
+            pages[-1].append("".join(buf))
+    return _document("docx", pages, paginated)
+
+
+def extract_pdf(data: bytes) -> ExtractedDocument:
+    try:
+        from pypdf import PdfReader
+    except ImportError as exc:  # optional dependency
+        raise ImportError("PDF extraction requires `pip install pypdf`.") from exc
+    reader = PdfReader(io.BytesIO(data))
+    pages = [(page.extract_text() or "").splitlines() for page in reader.pages]
+    return _document("pdf", pages, True)
+
+
+def extract_txt(data: bytes) -> ExtractedDocument:
+    # Form feeds (as written by pdftotext and friends) mark pages.
+    text = data.decode("utf-8", errors="ignore").replace("\r\n", "\n")
+    pages = text.split("\f")
+    return _document("txt", [p.rstrip("\n").split("\n") for p in pages], len(pages) > 1)
+
+
+_EXTRACTORS = {"pdf": extract_pdf, "docx": extract_docx, "txt": extract_txt}
+
+
+def extract_bytes(name: str, data: bytes) -> ExtractedDocument:
+    return _EXTRACTORS[detect_kind(name, data)](data)
+
+
+def file_key(data: bytes) -> str:
+    return hashlib.sha256(EXTRACTOR_VERSION.encode("ascii") + b"\x00" + data).hexdigest()
+
+
+class ExtractionCache:
+    """
+    Extracted documents keyed by file hash: memory LRU first, then the optional
+    SQLite tier. Safe to share between threads.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, path: Optional[str | Path] = None):
+        self._memory = LRUBytesCache(max_bytes=max_bytes)
+        self._disk = SQLiteBytesStore(path, table="extraction_cache") if path else None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[ExtractedDocument]:
+        with self._lock:
+            raw = self._memory.get(key)
+            if raw is None and self._disk is not None and (raw := self._disk.get(key)) is not None:
+                self._memory.put(key, raw)
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return ExtractedDocument.from_bytes(raw)
+
+    def put(self, key: str, doc: ExtractedDocument) -> None:
+        raw = doc.to_bytes()
+        with self._lock:
+            self._memory.put(key, raw)
+            if self._disk is not None:
+                self._disk.put(key, raw)
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+
+
+@dataclass
+class _Job:
+    name: str
+    data: bytes
+    key: str
+    result: AsyncResult
+    deadline: float
+    generation: int  # of the pool the job was submitted to
+
+
+@dataclass
+class ExtractionResult:
+    index: int
+    name: str
+    document: Optional[ExtractedDocument] = None
+    error: Optional[str] = None
+    cached: bool = False
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+ExtractFn = Callable[[str, bytes], ExtractedDocument]
+
+
+def _extract_job(extract_fn: ExtractFn, name: str, data: bytes) -> Tuple[Optional[bytes], Optional[str]]:
+    # Module-level so it can be pickled into pool workers; the document travels back as compressed bytes.
+    try:
+        return extract_fn(name, data).to_bytes(), None
+    except Exception as exc:
+        return None, f"{type(exc).__name__}: {exc}"
+
+
+class DocumentExtractor:
+    """
+    Extracts documents in a process pool, one document per worker task.
+
+    A document that runs past `timeout` seconds is abandoned: the pool is
+    terminated (the only way to stop a stuck parser) and restarted, and the
+    other in-flight documents are resubmitted. Results are cached by file hash,
+    so a re-upload skips extraction entirely.
+
+    One extractor can be shared between threads (dashboard sessions). Each
+    restart bumps a pool generation; a caller whose jobs were on a pool that
+    another caller terminated resubmits them instead of timing out.
+
+    `extract_fn` replaces `extract_bytes` (e.g. with an OCR fallback); it runs
+    in the workers, so it must be a module-level function.
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        timeout: float = 60.0,
+        cache: Optional[ExtractionCache] = None,
+        extract_fn: ExtractFn = extract_bytes,
+    ):
+        self.workers = workers
+        self.timeout = timeout
+        self.extract_fn = extract_fn
+        self.cache = cache if cache is not None else ExtractionCache()
+        self.timeouts = 0
+        self._pool: Optional[Pool] = None
+        self._generation = 0
+        self._pool_lock = threading.Lock()
+
+    def _kill_pool(self, generation: int) -> None:
+        """Terminate the pool, unless another caller already replaced the one `generation` refers to."""
+        with self._pool_lock:
+            if generation != self._generation:
+                return
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool.join()
+                self._pool = None
+            self._generation += 1
+
+    def extract(self, name: str, data: bytes) -> ExtractedDocument:
+        result = next(self.extract_many([(name, data)]))
+        if result.error is not None:
+            raise (ExtractionTimeout if result.timed_out else ExtractionError)(result.error)
+        assert result.document is not None
+        return result.document
+
+    def extract_many(self, items: Iterable[Tuple[str, bytes]]) -> Iterator[ExtractionResult]:
+        """Extract (name, bytes) pairs, at most `workers` at a time; results are yielded in input order."""
+        source = enumerate(items)
+        ready: Dict[int, ExtractionResult] = {}
+        running: Dict[int, _Job] = {}
+        next_index = 0
+        exhausted = False
+
+        def collect(idx: int) -> None:
+            job = running.pop(idx)
+            raw, error = job.result.get()
+            if raw is None:
+                ready[idx] = ExtractionResult(idx, job.name, error=error)
+            else:
+                doc = ExtractedDocument.from_bytes(raw)
+                self.cache.put(job.key, doc)
+                ready[idx] = ExtractionResult(idx, job.name, doc)
+
+        while True:
+            while not exhausted and len(running) < self.workers:
+                try:
+                    idx, (name, data) = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                key = file_key(data)
+                doc = self.cache.get(key)
+                if doc is not None:
+                    ready[idx] = ExtractionResult(idx, name, doc, cached=True)
+                else:
+                    running[idx] = self._submit(name, data, key)
+
+            if next_index in ready:
+                yield ready.pop(next_index)
+                next_index += 1
+                continue
+            if next_index not in running:
+                return
+
+            job = running[next_index]
+            job.result.wait(min(_POLL_SECONDS, max(0.0, job.deadline - time.monotonic())))
+            if job.result.ready():
+                collect(next_index)
+            elif job.generation == self._generation and time.monotonic() >= job.deadline:
+                del running[next_index]
+                with self._pool_lock:
+                    self.timeouts += 1
+                ready[next_index] = ExtractionResult(
+                    next_index, job.name, error=f"Extraction exceeded {self.timeout}s.", timed_out=True
+                )
+                self._kill_pool(job.generation)
+            for idx in [i for i, j in running.items() if j.result.ready()]:
+                collect(idx)
+            # Jobs on a terminated pool (ours or another caller's) never complete: run them again.
+            for idx, other in list(running.items()):
+                if other.generation != self._generation:
+                    running[idx] = self._submit(other.name, other.data, other.key)
+
+    def _submit(self, name: str, data: bytes, key: str) -> "_Job":
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = multiprocessing.get_context("spawn").Pool(self.workers)
+            result = self._pool.apply_async(_extract_job, (self.extract_fn, name, data))
+            return _Job(name, data, key, result, time.monotonic() + self.timeout, self._generation)
+
+    def close(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool = None
+        self.cache.close()
+
+    def __enter__(self) -> "DocumentExtractor":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def analyze_document(
+    document: ExtractedDocument,
+    title: str,
+    source_type: str = "upload",
+    scoring_profile: Union[str, ScoringProfile, None] = None,
+) -> AnalysisResult:
+    """Stream an extracted document into the analyzer page by page; evidence refs carry page numbers."""
+    return analyze_contract_stream(
+        iter(document.pages), title, source_type, scoring_profile=scoring_profile, page_starts=document.page_starts
+    )
@@ -1,13 +1,320 @@
 from __future__ import annotations
 
+import hashlib
 import re
-from typing import List
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from .schemas import Feature, FeatureSet
 
 
-def _has(pattern: str, text: str) -> bool:
-    return re.search(pattern, text, flags=re.IGNORECASE | re.MULTILINE) is not None
+_FLAGS = re.IGNORECASE | re.MULTILINE
+
+
+@dataclass(frozen=True)
+class Signal:
+    """
+    A named binary signal detected by a regex pattern.
+
+    `anchors` are lowercase literals of which at least one occurs in every match.
+    They drive the single-pass prefilter; a signal without anchors is always
+    verified with a full `finditer` over the text.
+    """
+
+    name: str
+    pattern: str
+    anchors: Tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class SignalHit:
+    name: str
+    start: int
+    end: int
+    # Filled by StreamingScanner, where the text is gone once a chunk is consumed.
+    snippet: Optional[str] = field(default=None, compare=False)
+
+
+def line_snippet(text: str, start: int, end: int, radius: int = 120) -> str:
+    """The line containing text[start:end], clipped to `radius` chars either side."""
+    lo = max(text.rfind("\n", max(0, start - radius), start) + 1, start - radius, 0)
+    hi = text.find("\n", end, end + radius)
+    hi = min(end + radius, len(text)) if hi == -1 else hi
+    return text[lo:hi].strip()
+
+
+def _trie_regex(words: Iterable[str]) -> str:
+    """Compile literals into a prefix-trie alternation (`c(?:ure|onsequential)|...`)."""
+    root: Dict[str, dict] = {}
+    for w in words:
+        node = root
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(root)
+
+
+class PatternRegistry:
+    """
+    Precompiled registry of signals, scanned in a single pass.
+
+    Every signal's anchor literals are folded into one trie-shaped alternation that
+    is run once over the lowercased text (Aho-Corasick style). Each anchor
+    occurrence is then verified with the owning signal's compiled pattern in a
+    window of `max_span` characters around it, so cost grows with text length plus
+    candidate hits rather than with (signals x text length).
+
+    Per-signal hits match `re.finditer(pattern, text, IGNORECASE | MULTILINE)` for
+    matches no longer than `max_span`.
+    """
+
+    def __init__(self, signals: Sequence[Signal], max_span: int = 512):
+        names = [s.name for s in signals]
+        if len(set(names)) != len(names):
+            raise ValueError("Duplicate signal names in registry.")
+
+        self.signals: List[Signal] = list(signals)
+        self.max_span = max_span
+        self._compiled = [re.compile(s.pattern, _FLAGS) for s in self.signals]
+        self._unanchored = [i for i, s in enumerate(self.signals) if not s.anchors]
+
+        owners: Dict[str, List[int]] = {}
+        for i, s in enumerate(self.signals):
+            for a in s.anchors:
+                owners.setdefault(a.lower(), []).append(i)
+        self._anchor_owners = owners
+        # Anchors that are prefixes of one another can start at the same offset;
+        # bucket by first char so every anchor at a hit offset is checked.
+        self._anchors_by_char: Dict[str, List[str]] = {}
+        for a in owners:
+            self._anchors_by_char.setdefault(a[0], []).append(a)
+        self._anchor_re = re.compile(_trie_regex(owners)) if owners else None
+        self._anchor_re_ci = re.compile(_trie_regex(owners), re.IGNORECASE) if owners else None
+        self._anchor_ci = {a: re.compile(re.escape(a), re.IGNORECASE) for a in owners}
+
+    @property
+    def names(self) -> List[str]:
+        return [s.name for s in self.signals]
+
+    @property
+    def fingerprint(self) -> str:
+        """Changes whenever a signal or `max_span` does, so persisted hits are never reused across pattern edits."""
+        h = hashlib.blake2b(digest_size=8)
+        for s in self.signals:
+            h.update(f"{s.name}\x00{s.pattern}\x00".encode("utf-8"))
+        h.update(str(self.max_span).encode("ascii"))
+        return h.hexdigest()
+
+    def _anchor_offsets(self, text: str, pos: int) -> List[List[int]]:
+        offsets: List[List[int]] = [[] for _ in self.signals]
+        if self._anchor_re is None:
+            return offsets
+
+        lowered = text.lower()
+        exact = len(lowered) == len(text)
+        if exact:
+            pattern, haystack = self._anchor_re, lowered
+        else:
+            # Some characters change length when lowercased; keep offsets exact.
+            pattern, haystack = self._anchor_re_ci, text
+
+        search = pattern.search
+        m = search(haystack, pos)
+        while m is not None:
+            p = m.start()
+            for a in self._anchors_by_char.get(haystack[p].lower()[0], ()):
+                if haystack.startswith(a, p) if exact else self._anchor_ci[a].match(text, p):
+                    for i in self._anchor_owners[a]:
+                        if not offsets[i] or offsets[i][-1] != p:
+                            offsets[i].append(p)
+            # Resume one char later so overlapping anchors are not swallowed.
+            m = search(haystack, p + 1)
+        return offsets
+
+    def _verify(self, i: int, text: str, anchors: List[int], start_at: int) -> Iterator[SignalHit]:
+        compiled = self._compiled[i]
+        name = self.signals[i].name
+        span = self.max_span
+        next_free = start_at
+
+        for a in anchors:
+            if a < next_free:
+                continue
+            lo, hi = max(next_free, a - span), a + span
+            while lo <= a:
+                m = compiled.search(text, lo, hi)
+                if m is None or m.start() > a:
+                    # A match past this anchor is picked up from a later anchor.
+                    break
+                start = m.start()
+                if m.end() >= hi:
+                    # The window may have truncated the match; re-check unbounded.
+                    m = compiled.match(text, start)
+                    if m is None:
+                        lo = start + 1
+                        continue
+                yield SignalHit(name=name, start=start, end=m.end())
+                next_free = lo = max(m.end(), start + 1)
+
+    def _hits(self, text: str, start_at: Sequence[int]) -> List[SignalHit]:
+        # `start_at[i]` is where signal i may next match (per-signal resume points
+        # keep chunked scans identical to one scan over the whole text).
+        found: List[SignalHit] = []
+        for i, anchors in enumerate(self._anchor_offsets(text, min(start_at, default=0))):
+            if anchors:
+                found.extend(self._verify(i, text, anchors, start_at[i]))
+        for i in self._unanchored:
+            name = self.signals[i].name
+            found.extend(
+                SignalHit(name=name, start=m.start(), end=m.end())
+                for m in self._compiled[i].finditer(text, start_at[i])
+            )
+        found.sort(key=lambda h: h.start)
+        return found
+
+    def iter_hits(self, text: str, pos: int = 0) -> Iterator[SignalHit]:
+        """Yield hits ordered by start offset (offsets are absolute in `text`)."""
+        return iter(self._hits(text, [pos] * len(self.signals)))
+
+    def scan(self, text: str) -> Dict[str, List[SignalHit]]:
+        """Return every hit grouped by signal name (all registered names present)."""
+        hits: Dict[str, List[SignalHit]] = {n: [] for n in self.names}
+        for h in self.iter_hits(text):
+            hits[h.name].append(h)
+        return hits
+
+
+# Very simple “signals” that DS teams typically start with as binary flags + basic counts.
+SIGNALS: List[Signal] = [
+    Signal("has_consequential_damages", r"consequential damages", ("consequential",)),
+    Signal("has_uncapped_liability", r"(uncapped|unlimited)\s+liabilit", ("uncapped", "unlimited")),
+    Signal("has_indemnity", r"\bindemnif", ("indemnif",)),
+    Signal("has_termination_for_convenience", r"terminate\s+for\s+convenience", ("terminate",)),
+    Signal("has_cure_period", r"\bcure\s+period\b|\b(\d+)\s+days?\s+to\s+cure\b", ("cure",)),
+    Signal("has_auto_renewal", r"auto(?:matic)?\s+renew", ("auto",)),
+]
+
+DEFAULT_REGISTRY = PatternRegistry(SIGNALS)
+
+
+def scan_signals(contract_text: str, registry: PatternRegistry = DEFAULT_REGISTRY) -> Dict[str, List[SignalHit]]:
+    """Single-pass scan returning hits (with offsets) for every registered signal."""
+    return registry.scan(contract_text or "")
+
+
+class StreamingScanner:
+    """
+    Chunk-aware scanner: feed decoded text chunks, get hits with absolute offsets.
+
+    Only the unconsumed tail of the stream is buffered. A hit is accepted once it
+    starts more than `overlap` chars before the buffered end, so any match up to
+    `overlap` long (the registry's `max_span` by default) is seen whole even when
+    it crosses a chunk boundary. `overlap` chars before the resume point are kept
+    as look-behind context for word-boundary checks.
+    """
+
+    def __init__(
+        self,
+        registry: PatternRegistry = DEFAULT_REGISTRY,
+        overlap: Optional[int] = None,
+        snippet_radius: int = 120,
+    ):
+        self.registry = registry
+        self.overlap = overlap if overlap is not None else registry.max_span
+        self.snippet_radius = min(snippet_radius, self.overlap // 2)
+        self.text_length = 0
+        self._buf = ""
+        self._buf_offset = 0  # absolute offset of _buf[0]
+        self._resume = [0] * len(registry.signals)  # absolute per-signal resume points
+
+    def feed(self, chunk: str) -> List[SignalHit]:
+        self._buf += chunk
+        self.text_length += len(chunk)
+        if len(self._buf) < 3 * self.overlap:
+            return []
+        return self._scan(final=False)
+
+    def finish(self) -> List[SignalHit]:
+        hits = self._scan(final=True)
+        self._buf = ""
+        self._buf_offset = self.text_length
+        return hits
+
+    def _scan(self, final: bool) -> List[SignalHit]:
+        base = self._buf_offset
+        cut = self.text_length if final else self.text_length - self.overlap
+        start_at = [r - base for r in self._resume]
+
+        # Hits starting past the cut are rescanned next time with more context.
+        accepted = [
+            SignalHit(
+                name=h.name,
+                start=h.start + base,
+                end=h.end + base,
+                snippet=line_snippet(self._buf, h.start, h.end, self.snippet_radius),
+            )
+            for h in self.registry._hits(self._buf, start_at)
+            if h.start + base < cut
+        ]
+
+        last_end = {h.name: h.end for h in accepted}
+        for i, s in enumerate(self.registry.signals):
+            self._resume[i] = max(self._resume[i], cut, last_end.get(s.name, 0))
+
+        keep_from = max(0, min(self._resume, default=cut) - self.overlap)
+        if keep_from > base:
+            self._buf = self._buf[keep_from - base:]
+            self._buf_offset = keep_from
+        return accepted
+
+
+def scan_signals_stream(
+    chunks: Iterable[str], registry: PatternRegistry = DEFAULT_REGISTRY
+) -> Tuple[Dict[str, List[SignalHit]], int]:
+    """Streaming counterpart of `scan_signals`; returns (hits by name, text_length)."""
+    scanner = StreamingScanner(registry)
+    hits: Dict[str, List[SignalHit]] = {n: [] for n in registry.names}
+    for chunk in chunks:
+        for h in scanner.feed(chunk):
+            hits[h.name].append(h)
+    for h in scanner.finish():
+        hits[h.name].append(h)
+    return hits, scanner.text_length
+
+
+def feature_schema(registry: PatternRegistry = DEFAULT_REGISTRY) -> List[Tuple[str, str]]:
+    """(name, Feature.dtype) for every feature, in FeatureSet order."""
+    return [("text_length", "int")] + [(name, "bool") for name in registry.names]
+
+
+def feature_values(
+    hits: Dict[str, List[SignalHit]],
+    text_length: int,
+    registry: PatternRegistry = DEFAULT_REGISTRY,
+) -> List[Any]:
+    """Raw feature values aligned with `feature_schema` (no pydantic objects)."""
+    return [text_length] + [bool(hits.get(name)) for name in registry.names]
+
+
+def features_from_hits(
+    hits: Dict[str, List[SignalHit]],
+    text_length: int,
+    registry: PatternRegistry = DEFAULT_REGISTRY,
+) -> FeatureSet:
+    values = feature_values(hits, text_length, registry)
+    features: List[Feature] = [
+        Feature(name=name, value=value, dtype=dtype)
+        for (name, dtype), value in zip(feature_schema(registry), values)
+    ]
+    return FeatureSet(features=features)
 
 
 def extract_features(contract_text: str) -> FeatureSet:
@@ -17,16 +324,10 @@ def extract_features(contract_text: str) -> FeatureSet:
     Tomorrow: replace with DS pipeline (NER/classification/embeddings) without changing UI.
     """
     t = contract_text or ""
+    return features_from_hits(scan_signals(t), len(t))
 
-    # Very simple “signals” that DS teams typically start with as binary flags + basic counts.
-    features: List[Feature] = [
-        Feature(name="text_length", value=len(t), dtype="int"),
-        Feature(name="has_consequential_damages", value=_has(r"consequential damages", t), dtype="bool"),
-        Feature(name="has_uncapped_liability", value=_has(r"(uncapped|unlimited)\s+liabilit", t), dtype="bool"),
-        Feature(name="has_indemnity", value=_has(r"\bindemnif", t), dtype="bool"),
-        Feature(name="has_termination_for_convenience", value=_has(r"terminate\s+for\s+convenience", t), dtype="bool"),
-        Feature(name="has_cure_period", value=_has(r"\bcure\s+period\b|\b(\d+)\s+days?\s+to\s+cure\b", t), dtype="bool"),
-        Feature(name="has_auto_renewal", value=_has(r"auto(?:matic)?\s+renew", t), dtype="bool"),
-    ]
 
-    return FeatureSet(features=features)
\ No newline at end of file
+def extract_features_stream(chunks: Iterable[str]) -> FeatureSet:
+    """Same FeatureSet as `extract_features`, from text chunks with bounded memory."""
+    hits, text_length = scan_signals_stream(chunks)
+    return features_from_hits(hits, text_length)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .feature_extractor import feature_schema, feature_values, scan_signals
+from .schemas import FeatureSet
+
+
+MatrixFormat = Literal["npy", "parquet"]
+
+# Feature.dtype -> column dtype. str/list/dict columns are stored as strings (JSON for list/dict).
+_NUMPY_DTYPES = {"bool": np.bool_, "int": np.int64, "float": np.float64}
+MANIFEST = "manifest.json"
+
+
+def _column(values: List[Any], dtype: str) -> np.ndarray:
+    if dtype in _NUMPY_DTYPES:
+        return np.asarray(values, dtype=_NUMPY_DTYPES[dtype])
+    if dtype in ("list", "dict"):
+        values = [json.dumps(v) for v in values]
+    return np.asarray([str(v) for v in values], dtype=np.str_)
+
+
+def document_features(text: str) -> List[Any]:
+    """Feature row for one document, aligned with `feature_schema()`."""
+    t = text or ""
+    return feature_values(scan_signals(t), len(t))
+
+
+class FeatureMatrixWriter:
+    """
+    Append-only columnar feature matrix on disk, one typed array per feature.
+
+    Rows are buffered and flushed as shards: `part-NNNNN/<feature>.npy` for the
+    npy format or `part-NNNNN.parquet` (requires pyarrow). `manifest.json`
+    records the schema and shards, so reopening a directory appends to it.
+    """
+
+    def __init__(
+        self,
+        out_dir: str | Path,
+        fmt: MatrixFormat = "npy",
+        shard_rows: int = 50_000,
+        schema: Optional[Sequence[Tuple[str, str]]] = None,
+    ):
+        self.out_dir = Path(out_dir)
+        self.fmt = fmt
+        self.shard_rows = shard_rows
+        self.schema = list(schema or feature_schema())
+
+        manifest_path = self.out_dir / MANIFEST
+        if manifest_path.exists():
+            self.manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            stored = [tuple(c) for c in self.manifest["schema"]]
+            if stored != [tuple(c) for c in self.schema] or self.manifest["format"] != fmt:
+                raise ValueError(f"{self.out_dir} holds a matrix with a different schema or format.")
+        else:
+            self.manifest = {
+                "format": fmt,
+                "feature_version": FeatureSet.model_fields["version"].default,
+                "schema": self.schema,
+                "rows": 0,
+                "shards": [],
+            }
+
+        self._doc_ids: List[str] = []
+        self._rows: List[List[Any]] = []
+
+    def add(self, doc_id: str, values: Sequence[Any]) -> None:
+        if len(values) != len(self.schema):
+            raise ValueError(f"Expected {len(self.schema)} feature values, got {len(values)}.")
+        self._doc_ids.append(doc_id)
+        self._rows.append(list(values))
+        if len(self._rows) >= self.shard_rows:
+            self.flush()
+
+    def add_text(self, doc_id: str, text: str) -> None:
+        self.add(doc_id, document_features(text))
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        name = f"part-{len(self.manifest['shards']):05d}"
+        columns = {"doc_id": np.asarray(self._doc_ids, dtype=np.str_)}
+        for j, (feature, dtype) in enumerate(self.schema):
+            columns[feature] = _column([row[j] for row in self._rows], dtype)
+
+        if self.fmt == "parquet":
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as exc:  # optional dependency
+                raise ImportError("Parquet export requires `pip install pyarrow`.") from exc
+            pq.write_table(pa.table(columns), self.out_dir / f"{name}.parquet")
+            shard = f"{name}.parquet"
+        else:
+            (self.out_dir / name).mkdir(exist_ok=True)
+            for col, arr in columns.items():
+                np.save(self.out_dir / name / f"{col}.npy", arr, allow_pickle=False)
+            shard = name
+
+        self.manifest["shards"].append({"name": shard, "rows": len(self._rows)})
+        self.manifest["rows"] += len(self._rows)
+        # Manifest last: a crash mid-flush leaves an orphan shard, never a torn matrix.
+        tmp = self.out_dir / f"{MANIFEST}.tmp"
+        tmp.write_text(json.dumps(self.manifest, indent=2), encoding="utf-8")
+        tmp.replace(self.out_dir / MANIFEST)
+        self._doc_ids, self._rows = [], []
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "FeatureMatrixWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _rows(docs: Iterable[Tuple[str, str]], workers: int) -> Iterator[Tuple[str, List[Any]]]:
+    if workers <= 1:
+        for doc_id, text in docs:
+            yield doc_id, document_features(text)
+        return
+    # Batched so only ~workers * 64 documents are held at once.
+    batch: List[Tuple[str, str]] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for item in docs:
+            batch.append(item)
+            if len(batch) >= workers * 64:
+                yield from zip((d for d, _ in batch), pool.map(document_features, (t for _, t in batch), chunksize=16))
+                batch = []
+        if batch:
+            yield from zip((d for d, _ in batch), pool.map(document_features, (t for _, t in batch), chunksize=16))
+
+
+def export_feature_matrix(
+    docs: Iterable[Tuple[str, str]],
+    out_dir: str | Path,
+    fmt: MatrixFormat = "npy",
+    shard_rows: int = 50_000,
+    workers: int = 1,
+) -> int:
+    """Extract features for (doc_id, text) pairs straight into a columnar matrix; returns rows added."""
+    n = 0
+    with FeatureMatrixWriter(out_dir, fmt=fmt, shard_rows=shard_rows) as writer:
+        for doc_id, values in _rows(docs, workers):
+            writer.add(doc_id, values)
+            n += 1
+    return n
+
+
+def read_feature_matrix(out_dir: str | Path) -> Dict[str, np.ndarray]:
+    """Load every shard and concatenate into one array per column (plus `doc_id`)."""
+    root = Path(out_dir)
+    manifest = json.loads((root / MANIFEST).read_text(encoding="utf-8"))
+    names = ["doc_id"] + [name for name, _ in manifest["schema"]]
+    parts: Dict[str, List[np.ndarray]] = {n: [] for n in names}
+
+    for shard in manifest["shards"]:
+        if manifest["format"] == "parquet":
+            import pyarrow.parquet as pq
+
+            table = pq.read_table(root / shard["name"])
+            for n in names:
+                parts[n].append(table.column(n).to_numpy())
+        else:
+            for n in names:
+                parts[n].append(np.load(root / shard["name"] / f"{n}.npy", allow_pickle=False))
+
+    return {n: np.concatenate(arrs) if arrs else np.array([]) for n, arrs in parts.items()}
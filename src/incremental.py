@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Union
+
+from .clause_index import ClauseIndex, resolve_hits
+from .feature_extractor import DEFAULT_REGISTRY, PatternRegistry, SignalHit, features_from_hits
+from .metrics import StageTimer
+from .model_adapter import assemble_result
+from .schemas import AnalysisResult, Finding
+from .scoring import ScoringProfile, get_profile
+
+# Per clause: signal name -> (start, end) offsets relative to the clause start.
+ClauseHits = Dict[str, List[Tuple[int, int]]]
+
+
+def clause_hash(clause_text: str) -> str:
+    return hashlib.blake2b(clause_text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ClauseHitCache:
+    """
+    Signal hits per clause, keyed by a hash of the clause text.
+
+    Shared across redline rounds (and across contracts): an unchanged clause is
+    never rescanned, wherever it moved to. LRU-bounded by entry count.
+    """
+
+    def __init__(self, max_entries: int = 100_000, registry: PatternRegistry = DEFAULT_REGISTRY):
+        self.max_entries = max_entries
+        self.registry = registry
+        self._data: "OrderedDict[str, ClauseHits]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[ClauseHits]:
+        with self._lock:
+            hits = self._data.get(key)
+            if hits is not None:
+                self._data.move_to_end(key)
+            return hits
+
+    def put(self, key: str, hits: ClauseHits) -> None:
+        with self._lock:
+            self._data[key] = hits
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+@dataclass
+class FindingsDelta:
+    """Findings compared by (category, risk_statement); `changed` kept identity but not evidence/severity/confidence."""
+
+    added: List[Finding] = field(default_factory=list)
+    removed: List[Finding] = field(default_factory=list)
+    changed: List[Finding] = field(default_factory=list)
+    unchanged: int = 0
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "changed": len(self.changed),
+            "unchanged": self.unchanged,
+        }
+
+
+@dataclass
+class IncrementalResult:
+    result: AnalysisResult
+    delta: FindingsDelta
+    clauses_total: int
+    clauses_rescanned: int
+    # clause hash -> hits, for every clause of this document (to persist alongside it)
+    clause_hits: Dict[str, ClauseHits] = field(default_factory=dict)
+
+
+def _identity(f: Finding) -> Tuple[str, str]:
+    return f.category, f.risk_statement
+
+
+def _content(f: Finding) -> Tuple:
+    return f.severity, f.confidence, tuple((e.clause_ref, e.snippet) for e in f.evidence)
+
+
+def diff_findings(previous: List[Finding], current: List[Finding]) -> FindingsDelta:
+    before = {_identity(f): f for f in previous}
+    after = {_identity(f): f for f in current}
+    delta = FindingsDelta(
+        added=[f for k, f in after.items() if k not in before],
+        removed=[f for k, f in before.items() if k not in after],
+    )
+    for k, f in after.items():
+        if k in before:
+            if _content(before[k]) != _content(f):
+                delta.changed.append(f)
+            else:
+                delta.unchanged += 1
+    return delta
+
+
+def analyze_incremental(
+    contract_text: str,
+    title: str,
+    source_type: str,
+    previous: Optional[AnalysisResult] = None,
+    cache: Optional[ClauseHitCache] = None,
+    scoring_profile: Union[str, ScoringProfile, None] = None,
+) -> IncrementalResult:
+    """
+    Re-analyze an edited contract, rescanning only clauses whose text changed.
+
+    The text is segmented with `ClauseIndex`; each clause's hits come from
+    `cache` when its hash was seen in an earlier round, otherwise the clause is
+    scanned and cached. Hits are then re-based to document offsets, so features,
+    evidence and scoring are produced exactly as by `analyze_contract` (signals
+    are matched within a clause; none of the demo signals spans a heading).
+
+    `previous` is the last round's result; the returned delta lists findings
+    added, removed and changed since then. Pass the same `cache` every round.
+    """
+    profile = get_profile(scoring_profile)
+    cache = cache if cache is not None else ClauseHitCache()
+    registry = cache.registry
+    timer = StageTimer()
+    text = contract_text or ""
+
+    with timer.stage("evidence_resolution"):
+        index = ClauseIndex.build(text)
+
+    rescanned = 0
+    by_clause: Dict[str, ClauseHits] = {}
+    with timer.stage("feature_extraction"):
+        hits: Dict[str, List[SignalHit]] = {n: [] for n in registry.names}
+        for clause in index.clauses:
+            body = text[clause.start:clause.end]
+            key = clause_hash(body)
+            clause_hits = cache.get(key)
+            if clause_hits is None:
+                rescanned += 1
+                clause_hits = {
+                    name: [(h.start, h.end) for h in found] for name, found in registry.scan(body).items() if found
+                }
+                cache.put(key, clause_hits)
+            by_clause[key] = clause_hits
+            for name, spans in clause_hits.items():
+                hits[name].extend(SignalHit(name, clause.start + s, clause.start + e) for s, e in spans)
+        features = features_from_hits(hits, len(text))
+
+    with timer.stage("evidence_resolution"):
+        resolved = resolve_hits(hits, index, text)
+
+    details = {"clauses_total": len(index), "clauses_rescanned": rescanned}
+    if previous is not None:
+        details["previous_run_id"] = previous.run_id
+    result = assemble_result(
+        features,
+        len(contract_text),
+        title,
+        source_type,
+        resolved,
+        findings_details=details,
+        timer=timer,
+        path="incremental",
+        profile=profile,
+    )
+
+    delta = diff_findings(previous.findings if previous is not None else [], result.findings)
+    if previous is not None:
+        generated = next(e for e in result.audit if e.event == "FINDINGS_GENERATED")
+        generated.details = {**(generated.details or {}), "delta": delta.summary()}
+    return IncrementalResult(
+        result=result, delta=delta, clauses_total=len(index), clauses_rescanned=rescanned, clause_hits=by_clause
+    )
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import codecs
+from pathlib import Path
+from typing import BinaryIO, Iterator, Union
+
+
+DEFAULT_CHUNK_BYTES = 1 << 20  # 1 MiB
+
+Source = Union[str, Path, BinaryIO]
+
+
+def iter_text_chunks(
+    source: Source,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    encoding: str = "utf-8",
+    errors: str = "ignore",
+) -> Iterator[str]:
+    """
+    Stream a contract as decoded text chunks without reading it whole.
+
+    `source` is a path or a binary file-like object (e.g. Streamlit's
+    UploadedFile). An incremental decoder keeps multi-byte characters that
+    straddle a read boundary intact; the overlap needed for pattern matches is
+    handled downstream by `feature_extractor.StreamingScanner`.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as fh:
+            yield from iter_text_chunks(fh, chunk_bytes=chunk_bytes, encoding=encoding, errors=errors)
+        return
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+    while True:
+        raw = source.read(chunk_bytes)
+        if not raw:
+            break
+        text = decoder.decode(raw)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
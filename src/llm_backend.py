@@ -0,0 +1,550 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import ssl
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from pydantic import ValidationError
+
+from .cache import ChunkResponseCache
+from .clause_index import ClauseIndex
+from .feature_extractor import features_from_hits, scan_signals
+from .metrics import StageTimer
+from .model_adapter import assemble_result
+from .schemas import AnalysisResult, Evidence, Finding
+
+
+DEFAULT_PROMPT_PATH = Path(__file__).resolve().parent.parent / "prompts" / "risk_detection_prompt.txt"
+
+# Appended to the analyst prompt so responses can be parsed into Finding/Evidence.
+JSON_INSTRUCTIONS = """
+Return ONLY a JSON object of the form:
+{"findings": [{"category": str, "risk_statement": str, "severity": "Low|Medium|High|Critical",
+  "confidence": float 0-1, "clause_ref": str, "snippet": str (verbatim from the contract),
+  "recommendation": str, "proposed_redline": str|null}]}
+Every finding MUST quote a snippet from the contract. Return {"findings": []} if nothing is risky.
+"""
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# An in-process stand-in for `AsyncHTTPPool.post_json("/v1/chat/completions", ...)`.
+Transport = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+_TOKEN_PIECE = re.compile(r"\w+|[^\w\s]")
+_SEVERITY_RANK = {"Low": 0, "Medium": 1, "High": 2, "Critical": 3}
+
+
+class LLMBackendError(RuntimeError):
+    pass
+
+
+class HTTPStatusError(LLMBackendError):
+    def __init__(self, status: int, body: bytes, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status}: {body[:200]!r}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+class AsyncHTTPPool:
+    """
+    Minimal asyncio HTTP/1.1 client with keep-alive connection pooling.
+
+    Up to `max_connections` sockets are open at once; idle ones are reused
+    across requests. Only what a JSON chat-completions API needs is supported
+    (Content-Length or chunked responses).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_connections: int = 8,
+        timeout: float = 60.0,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        u = urlsplit(base_url)
+        https = u.scheme == "https"
+        self._host = u.hostname or "127.0.0.1"
+        self._port = u.port or (443 if https else 80)
+        self._ssl = ssl.create_default_context() if https else None
+        self._prefix = u.path.rstrip("/")
+        self._headers = headers or {}
+        self._timeout = timeout
+        self._slots = asyncio.Semaphore(max_connections)
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self.connections_opened = 0
+
+    async def post_json(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        body = json.dumps(payload).encode("utf-8")
+        async with self._slots:
+            conn = self._idle.pop() if self._idle else await self._open()
+            try:
+                status, headers, data = await asyncio.wait_for(self._roundtrip(conn, path, body), self._timeout)
+            except BaseException:
+                conn[1].close()
+                raise
+            if headers.get("connection", "").lower() == "close":
+                conn[1].close()
+            else:
+                self._idle.append(conn)
+
+        if status >= 400:
+            retry_after = headers.get("retry-after")
+            raise HTTPStatusError(status, data, float(retry_after) if retry_after and retry_after.isdigit() else None)
+        return json.loads(data)
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    async def _open(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        self.connections_opened += 1
+        return await asyncio.open_connection(self._host, self._port, ssl=self._ssl)
+
+    async def _roundtrip(
+        self, conn: Tuple[asyncio.StreamReader, asyncio.StreamWriter], path: str, body: bytes
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        reader, writer = conn
+        head = [
+            f"POST {self._prefix}{path} HTTP/1.1",
+            f"Host: {self._host}:{self._port}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            "Connection: keep-alive",
+            *(f"{k}: {v}" for k, v in self._headers.items()),
+        ]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by server.")
+        status = int(status_line.split()[1])
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = line.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                parts.append(await reader.readexactly(size))
+                await reader.readline()
+            data = b"".join(parts)
+        elif "content-length" in headers:
+            data = await reader.readexactly(int(headers["content-length"]))
+        else:
+            data = await reader.read()
+            headers["connection"] = "close"
+        return status, headers, data
+
+
+@dataclass
+class Chunk:
+    index: int
+    start: int
+    text: str
+
+
+def chunk_by_clause(text: str, index: ClauseIndex, max_chars: int, pack: bool = True) -> List[Chunk]:
+    """
+    Pack whole clauses into chunks of at most `max_chars`; oversized clauses split on lines.
+    `pack=False` keeps one clause per chunk, which maximizes response-cache reuse.
+    """
+    spans: List[Tuple[int, int]] = []
+    for clause in index.clauses:
+        start = clause.start
+        while clause.end - start > max_chars:
+            cut = text.rfind("\n", start + 1, start + max_chars)
+            cut = cut + 1 if cut > start else start + max_chars
+            spans.append((start, cut))
+            start = cut
+        if clause.end > start:
+            spans.append((start, clause.end))
+
+    chunks: List[Chunk] = []
+    cur_start = cur_end = None
+    for start, end in spans:
+        if pack and cur_start is not None and end - cur_start <= max_chars:
+            cur_end = end
+            continue
+        if cur_start is not None:
+            chunks.append(Chunk(index=len(chunks), start=cur_start, text=text[cur_start:cur_end]))
+        cur_start, cur_end = start, end
+    if cur_start is not None and text[cur_start:cur_end].strip():
+        chunks.append(Chunk(index=len(chunks), start=cur_start, text=text[cur_start:cur_end]))
+    return [c for c in chunks if c.text.strip()]
+
+
+def estimate_tokens(text: str) -> int:
+    """Tokenizer-free BPE estimate: ~1.3 tokens per word or punctuation mark (errs high on legal prose)."""
+    return int(len(_TOKEN_PIECE.findall(text)) * 1.3) + 1
+
+
+def chunk_by_tokens(text: str, index: ClauseIndex, max_tokens: int, pack: bool = True) -> List[Chunk]:
+    """
+    `chunk_by_clause` with a token budget. The character budget is derived from
+    this document's own characters-per-token ratio, and any chunk that is denser
+    than average (tables, numbers) and still over budget is re-split on its own
+    clause/line boundaries with its own, smaller character budget.
+    """
+    ratio = len(text) / estimate_tokens(text)
+    out: List[Chunk] = []
+    for chunk in chunk_by_clause(text, index, max(int(max_tokens * ratio), 1), pack):
+        tokens = estimate_tokens(chunk.text)
+        if tokens <= max_tokens:
+            out.append(chunk)
+            continue
+        sub_chars = max(int(len(chunk.text) * max_tokens / tokens), 1)
+        for part in chunk_by_clause(chunk.text, ClauseIndex.build(chunk.text), sub_chars, pack):
+            out.append(Chunk(index=0, start=chunk.start + part.start, text=part.text))
+    for i, chunk in enumerate(out):
+        chunk.index = i
+    return out
+
+
+def _statement_key(f: Finding) -> Tuple[str, str]:
+    return f.category.lower(), " ".join(re.findall(r"\w+", f.risk_statement.lower()))
+
+
+def merge_findings(findings: List[Finding]) -> List[Finding]:
+    """
+    Reduce step: collapse findings reported by several chunks (same category and
+    risk statement, ignoring case and punctuation) into one.
+
+    The merged finding takes the highest severity and the highest confidence
+    (repeated reports of the same issue are not independent evidence, so they
+    do not add up), the recommendation and redline of its most confident
+    report, and every distinct evidence quote in document order.
+    """
+    groups: Dict[Tuple[str, str], List[Finding]] = {}
+    for f in findings:
+        groups.setdefault(_statement_key(f), []).append(f)
+
+    merged: List[Finding] = []
+    for group in groups.values():
+        best = max(group, key=lambda f: (f.confidence, _SEVERITY_RANK[f.severity]))
+        evidence = []
+        seen = set()
+        for f in group:
+            for e in f.evidence:
+                key = (e.clause_ref, " ".join(e.snippet.split()))
+                if key not in seen:
+                    seen.add(key)
+                    evidence.append(e)
+        merged.append(
+            best.model_copy(
+                update={
+                    "severity": max((f.severity for f in group), key=_SEVERITY_RANK.__getitem__),
+                    "evidence": evidence,
+                }
+            )
+        )
+    return merged
+
+
+def _strip_fences(content: str) -> str:
+    content = content.strip()
+    if content.startswith("```"):
+        content = content.split("\n", 1)[1] if "\n" in content else ""
+        content = content.rsplit("```", 1)[0]
+    return content
+
+
+def _find_snippet(text: str, snippet: str) -> int:
+    pos = text.find(snippet)
+    if pos < 0:
+        # Cached responses may quote a whitespace variant of the same clause.
+        m = re.search(r"\s+".join(map(re.escape, snippet.split())), text)
+        pos = m.start() if m else -1
+    return pos
+
+
+def _finding_items(content: str) -> Optional[List[Any]]:
+    """The list of reported items, or None when the response is not a findings payload (refusal, bad JSON)."""
+    try:
+        payload = json.loads(_strip_fences(content))
+    except json.JSONDecodeError:
+        return None
+    items = payload.get("findings", []) if isinstance(payload, dict) else payload
+    return items if isinstance(items, list) else None
+
+
+def parse_findings(content: str, chunk: Chunk, index: ClauseIndex) -> Tuple[List[Finding], int]:
+    """
+    Parse a model response into findings for one chunk; returns (findings, rejected).
+
+    Items that fail schema validation or quote no snippet are rejected (evidence rule).
+    When the snippet is found verbatim in the chunk, its clause_ref comes from the
+    clause index rather than the model.
+    """
+    items = _finding_items(content)
+    if items is None:
+        return [], 1
+
+    findings: List[Finding] = []
+    rejected = 0
+    for item in items:
+        if not isinstance(item, dict) or not str(item.get("snippet") or "").strip():
+            rejected += 1
+            continue
+        snippet = str(item["snippet"]).strip()
+        pos = _find_snippet(chunk.text, snippet)
+        clause_ref = index.locate(chunk.start + pos).ref if pos >= 0 else str(item.get("clause_ref") or "N/A")
+        try:
+            findings.append(
+                Finding(
+                    finding_id="L-000",
+                    category=str(item.get("category") or "General"),
+                    risk_statement=str(item.get("risk_statement") or item.get("issue") or ""),
+                    severity=str(item.get("severity", "Medium")).strip().title(),
+                    confidence=float(item.get("confidence", 0.5)),
+                    evidence=[Evidence(clause_ref=clause_ref, snippet=snippet)],
+                    recommendation=str(item.get("recommendation") or "Review clause with counsel."),
+                    proposed_redline=item.get("proposed_redline"),
+                )
+            )
+        except (ValidationError, TypeError, ValueError):
+            rejected += 1
+    return findings, rejected
+
+
+@dataclass
+class _CallStats:
+    requests: int = 0
+    retries: int = 0
+    rejected: int = 0
+    cache_hits: int = 0
+
+
+class LLMRiskModel:
+    """
+    `ContractRiskModel` backed by an OpenAI-compatible chat-completions endpoint.
+
+    The contract is split on clause boundaries, one request per chunk, with at
+    most `max_concurrency` requests in flight over a keep-alive connection pool.
+    Transient failures (network errors, 429/5xx) are retried with full-jitter
+    exponential backoff. Rule-based features are still extracted so the DS
+    handshake layer is unchanged.
+
+    With a `response_cache`, chunks already answered under the same prompt and
+    model (including identical chunks in flight concurrently) are not resent.
+
+    Long documents are analyzed map-reduce style: with `context_tokens`, each
+    chunk is sized so prompt + chunk + `max_output_tokens` fit the model's
+    context (see `chunk_by_tokens`); otherwise `max_chunk_chars` applies. The
+    per-chunk findings are merged (`merge_findings`) before the single scoring
+    pass. `transport` replaces the HTTP call, e.g. with
+    `llm_stub_server.MockChatModel` for offline runs.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        prompt_path: str | Path = DEFAULT_PROMPT_PATH,
+        max_concurrency: int = 8,
+        max_connections: Optional[int] = None,
+        max_retries: int = 3,
+        backoff_base: float = 0.25,
+        backoff_cap: float = 8.0,
+        timeout: float = 60.0,
+        max_chunk_chars: int = 6000,
+        pack_clauses: bool = True,
+        response_cache: Optional[ChunkResponseCache] = None,
+        context_tokens: Optional[int] = None,
+        max_output_tokens: int = 1024,
+        transport: Optional[Transport] = None,
+    ):
+        self.base_url = base_url or os.getenv("LLM_BASE_URL", "https://api.openai.com")
+        self.model = model or os.getenv("MODEL_NAME", "gpt-4o-mini")
+        self.api_key = api_key if api_key is not None else os.getenv("OPENAI_API_KEY")
+        self.prompt = Path(prompt_path).read_text(encoding="utf-8").strip() + "\n" + JSON_INSTRUCTIONS
+        self.prompt_version = hashlib.sha256(self.prompt.encode("utf-8")).hexdigest()[:12]
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections or max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.max_chunk_chars = max_chunk_chars
+        self.pack_clauses = pack_clauses
+        self.response_cache = response_cache
+        self.transport = transport
+        self.prompt_tokens = estimate_tokens(self.prompt)
+        self.max_chunk_tokens: Optional[int] = None
+        if context_tokens is not None:
+            self.max_chunk_tokens = context_tokens - self.prompt_tokens - max_output_tokens
+            if self.max_chunk_tokens <= 0:
+                raise ValueError(
+                    f"context_tokens={context_tokens} leaves no room for contract text "
+                    f"(prompt ~{self.prompt_tokens} tokens, output {max_output_tokens})."
+                )
+
+        self._pool: Optional[AsyncHTTPPool] = None
+        self._pending: Dict[str, "asyncio.Future[str]"] = {}
+        self._inflight: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # -- connection state is per event loop --------------------------------
+    def _ensure_pool(self) -> AsyncHTTPPool:
+        loop = asyncio.get_running_loop()
+        if self._pool is None or self._loop is not loop:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._pool = AsyncHTTPPool(self.base_url, self.max_connections, self.timeout, headers)
+            self._inflight = asyncio.Semaphore(self.max_concurrency)
+            self._pending = {}
+            self._loop = loop
+        return self._pool
+
+    async def aclose(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    # -- requests ------------------------------------------------------------
+    def _request(self, chunk_text: str) -> Dict[str, Any]:
+        # The request depends only on (prompt, model, chunk) so responses can be shared.
+        return {
+            "model": self.model,
+            "temperature": 0,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {"role": "system", "content": self.prompt},
+                {"role": "user", "content": chunk_text},
+            ],
+        }
+
+    async def _complete(self, payload: Dict[str, Any], stats: _CallStats) -> str:
+        pool = self._ensure_pool()
+        assert self._inflight is not None
+        for attempt in range(self.max_retries + 1):
+            delay: Optional[float] = None
+            try:
+                async with self._inflight:
+                    stats.requests += 1
+                    if self.transport is not None:
+                        response = await self.transport(payload)
+                    else:
+                        response = await pool.post_json("/v1/chat/completions", payload)
+                return response["choices"][0]["message"]["content"]
+            except HTTPStatusError as exc:
+                if exc.status not in RETRYABLE_STATUS or attempt == self.max_retries:
+                    raise
+                delay = exc.retry_after
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as exc:
+                if attempt == self.max_retries:
+                    raise LLMBackendError(f"Model request failed after {attempt + 1} attempts: {exc!r}") from exc
+            stats.retries += 1
+            # Full jitter: spreads retries from many chunks instead of synchronizing them.
+            await asyncio.sleep(delay if delay is not None else random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt)))
+        raise LLMBackendError("unreachable")
+
+    async def _chunk_response(self, chunk: Chunk, stats: _CallStats) -> str:
+        cache = self.response_cache
+        if cache is None:
+            return await self._complete(self._request(chunk.text), stats)
+
+        key = cache.key_for(self.prompt_version, self.model, chunk.text)
+        cached = cache.get(key, len(chunk.text))
+        if cached is not None:
+            stats.cache_hits += 1
+            return cached
+
+        self._ensure_pool()
+        pending = self._pending.get(key)
+        if pending is not None:
+            cache.record_inflight_join(len(chunk.text))
+            stats.cache_hits += 1
+            return await asyncio.shield(pending)
+
+        fut: "asyncio.Future[str]" = asyncio.get_running_loop().create_future()
+        self._pending[key] = fut
+        try:
+            content = await self._complete(self._request(chunk.text), stats)
+            if _finding_items(content) is not None:  # never persist a refusal or malformed reply
+                cache.put(key, content)
+            fut.set_result(content)
+            return content
+        except BaseException as exc:
+            fut.set_exception(exc)
+            fut.exception()  # mark retrieved when nobody joined
+            raise
+        finally:
+            self._pending.pop(key, None)
+
+    async def _analyze_chunk(self, chunk: Chunk, index: ClauseIndex, stats: _CallStats) -> List[Finding]:
+        content = await self._chunk_response(chunk, stats)
+        findings, rejected = parse_findings(content, chunk, index)
+        stats.rejected += rejected
+        return findings
+
+    async def analyze_contract_async(self, contract_text: str, title: str, source_type: str) -> AnalysisResult:
+        timer = StageTimer()
+        text = contract_text or ""
+        with timer.stage("feature_extraction"):
+            hits = scan_signals(text)
+            features = features_from_hits(hits, len(text))
+        with timer.stage("evidence_resolution"):
+            index = ClauseIndex.build(text)
+            if self.max_chunk_tokens is not None:
+                chunks = chunk_by_tokens(text, index, self.max_chunk_tokens, pack=self.pack_clauses)
+            else:
+                chunks = chunk_by_clause(text, index, self.max_chunk_chars, pack=self.pack_clauses)
+
+        stats = _CallStats()
+        with timer.stage("finding_generation"):
+            per_chunk = await asyncio.gather(*(self._analyze_chunk(c, index, stats) for c in chunks))
+            reported = [f for group in per_chunk for f in group]
+            findings = merge_findings(reported)
+        for i, f in enumerate(findings, start=1):
+            f.finding_id = f"L-{i:03d}"
+
+        return assemble_result(
+            features,
+            len(text),
+            title,
+            source_type,
+            findings=findings,
+            findings_details={
+                "model": self.model,
+                "prompt_version": self.prompt_version,
+                "chunks": len(chunks),
+                "chunk_token_budget": self.max_chunk_tokens,
+                "findings_reported": len(reported),
+                "requests": stats.requests,
+                "retries": stats.retries,
+                "rejected_items": stats.rejected,
+                "cache_hits": stats.cache_hits,
+            },
+            timer=timer,
+            path="llm",
+        )
+
+    def analyze_contract(self, contract_text: str, title: str, source_type: str) -> AnalysisResult:
+        """Sync entry point matching `ContractRiskModel` (runs its own event loop)."""
+
+        async def _run() -> AnalysisResult:
+            try:
+                return await self.analyze_contract_async(contract_text, title, source_type)
+            finally:
+                await self.aclose()
+
+        return asyncio.run(_run())
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from .clause_index import ClauseIndex, resolve_hits
+from .feature_extractor import features_from_hits, scan_signals
+from .model_adapter import findings_from_features
+
+
+def stub_findings(text: str) -> List[Dict[str, Any]]:
+    """Deterministic 'model' output for a chunk: the demo rules, in the JSON response shape."""
+    hits = scan_signals(text)
+    resolved = resolve_hits(hits, ClauseIndex.build(text), text)
+    findings = findings_from_features(features_from_hits(hits, len(text)), resolved)
+    return [
+        {
+            "category": f.category,
+            "risk_statement": f.risk_statement,
+            "severity": f.severity,
+            "confidence": f.confidence,
+            "clause_ref": f.evidence[0].clause_ref,
+            "snippet": f.evidence[0].snippet,
+            "recommendation": f.recommendation,
+            "proposed_redline": f.proposed_redline,
+        }
+        for f in findings
+        if f.finding_id != "R-000"  # "nothing found" is an empty list for a model
+    ]
+
+
+def _completion(request: Dict[str, Any]) -> Dict[str, Any]:
+    user = next(m["content"] for m in reversed(request["messages"]) if m["role"] == "user")
+    content = json.dumps({"findings": stub_findings(user)})
+    return {
+        "object": "chat.completion",
+        "model": request.get("model", "stub"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": len(user) // 4, "completion_tokens": len(content) // 4},
+    }
+
+
+class MockChatModel:
+    """
+    In-process mock of the chat-completions endpoint, for `LLMRiskModel(transport=...)`:
+    same deterministic answers as the stub server, no sockets. Tracks requests,
+    the largest user message (chars) and peak concurrency.
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_s = latency_ms / 1000.0
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.max_chunk_chars = 0
+
+    async def __call__(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            user = next(m["content"] for m in reversed(request["messages"]) if m["role"] == "user")
+            self.max_chunk_chars = max(self.max_chunk_chars, len(user))
+            if self.latency_s:
+                await asyncio.sleep(self.latency_s)
+            return _completion(request)
+        finally:
+            self.in_flight -= 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so client pooling is exercised
+    server: "StubLLMServer"
+
+    def log_message(self, format: str, *args: Any) -> None:  # quiet
+        pass
+
+    def _send(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if not self.path.endswith("/chat/completions"):
+            self._send(404, {"error": {"message": "not found"}})
+            return
+
+        srv = self.server
+        with srv.lock:
+            srv.requests += 1
+            srv.in_flight += 1
+            srv.max_in_flight = max(srv.max_in_flight, srv.in_flight)
+            fail = srv.requests <= srv.fail_first or random.random() < srv.fail_rate
+        try:
+            time.sleep(max(0.0, srv.latency_s + random.uniform(-srv.jitter_s, srv.jitter_s)))
+            if fail:
+                self._send(503, {"error": {"message": "stub overloaded"}})
+                return
+            self._send(200, _completion(json.loads(body)))
+        finally:
+            with srv.lock:
+                srv.in_flight -= 1
+
+
+class StubLLMServer(ThreadingHTTPServer):
+    """
+    Local OpenAI-compatible chat-completions stub for offline throughput tests.
+
+    `latency_ms`/`jitter_ms` simulate model latency, `fail_first`/`fail_rate`
+    return 503s to exercise retries. Tracks requests and peak concurrency.
+    """
+
+    daemon_threads = True
+    request_queue_size = 256  # many pooled clients connect at once
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        fail_first: int = 0,
+        fail_rate: float = 0.0,
+    ):
+        super().__init__((host, port), _Handler)
+        self.latency_s = latency_ms / 1000.0
+        self.jitter_s = jitter_ms / 1000.0
+        self.fail_first = fail_first
+        self.fail_rate = fail_rate
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubLLMServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local stub LLM server (OpenAI chat-completions shape).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StubLLMServer(args.host, args.port, args.latency_ms, args.jitter_ms, fail_rate=args.fail_rate)
+    print(f"Stub LLM listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
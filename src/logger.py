@@ -1,12 +1,199 @@
-import json
+from __future__ import annotations
+
+import atexit
+import queue
+import threading
+import time
 from pathlib import Path
-from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .metrics import STAGE_SECONDS
+from .run_store import RunStore
 
 LOG_DIR = Path("logs")
-LOG_DIR.mkdir(exist_ok=True)
+RUN_STORE_PATH = LOG_DIR / "runs.db"
+
+_store: Optional[RunStore] = None
+_writer: Optional["BackgroundRunWriter"] = None
+_store_lock = threading.Lock()
+
+
+def get_run_store() -> RunStore:
+    """Process-wide run store; `logs/` is only created on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            # batch_size=1: interactive runs are few and should survive a crash.
+            _store = RunStore(RUN_STORE_PATH, compress=True, batch_size=1)
+            atexit.register(_store.close)
+        return _store
+
 
 def save_run(run_id: str, payload: dict) -> Path:
-    ts = datetime.now(timezone.utc).strftime("%Y%m%d")
-    path = LOG_DIR / f"{ts}_{run_id}.json"
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-    return path
\ No newline at end of file
+    t0 = time.perf_counter()
+    store = get_run_store()
+    store.append(run_id, payload)
+    STAGE_SECONDS.observe(time.perf_counter() - t0, stage="logging")
+    return store.path
+
+
+class BackgroundRunWriter:
+    """
+    Writes runs to a `RunStore` from a daemon thread so callers never wait on disk.
+
+    `submit` enqueues into a bounded queue; the writer drains up to `batch_size`
+    runs per transaction. When the queue is full, `submit` blocks for at most
+    `put_timeout` seconds and then drops the run; both are counted in `stats()`
+    as the signal that logging is falling behind. `errors` counts runs that
+    could not be written. `close()` drains the queue.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        store: RunStore,
+        max_queue: int = 1000,
+        batch_size: int = 64,
+        flush_interval: float = 0.5,
+        put_timeout: float = 1.0,
+    ):
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.blocked_seconds = 0.0
+        self.max_depth = 0
+        self.batches = 0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="run-log-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, run_id: str, payload: Dict[str, Any]) -> bool:
+        """Queue a run for writing; returns False if it was dropped because the queue stayed full."""
+        if self._closed:
+            raise RuntimeError("BackgroundRunWriter is closed.")
+        item = (run_id, payload)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            t0 = time.perf_counter()
+            try:
+                self._queue.put(item, timeout=self.put_timeout)
+            except queue.Full:
+                with self._lock:
+                    self.blocked += 1
+                    self.blocked_seconds += time.perf_counter() - t0
+                    self.dropped += 1
+                return False
+            with self._lock:
+                self.blocked += 1
+                self.blocked_seconds += time.perf_counter() - t0
+        with self._lock:
+            self.submitted += 1
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch: List[Tuple[str, Dict[str, Any]]] = []
+            for item in self._drain(first):
+                if item is self._STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+            if batch:
+                self._write(batch)
+
+    def _drain(self, first: Any) -> List[Any]:
+        items = [first]
+        while len(items) < self.batch_size:
+            try:
+                items.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def _write(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        t0 = time.perf_counter()
+        try:
+            self.store.append_many(batch)
+            self.store.flush()
+        except Exception:
+            # Retry run by run, so only the runs that cannot be stored are lost
+            # (run_ids already written are ignored by the store).
+            self._write_each(batch)
+            return
+        # Per-run share of the batch, comparable with the synchronous save_run.
+        elapsed = (time.perf_counter() - t0) / len(batch)
+        for _ in batch:
+            STAGE_SECONDS.observe(elapsed, stage="logging")
+        with self._lock:
+            self.written += len(batch)
+            self.batches += 1
+
+    def _write_each(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        for run_id, payload in batch:
+            try:
+                self.store.append(run_id, payload)
+                self.store.flush()
+            except Exception as e:  # keep the writer alive; each lost run shows up in stats()
+                with self._lock:
+                    self.errors += 1
+                    self.last_error = f"{type(e).__name__}: {e}"
+                continue
+            with self._lock:
+                self.written += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_queue_depth": self.max_depth,
+                "queue_capacity": self._queue.maxsize,
+                "submitted": self.submitted,
+                "written": self.written,
+                "batches": self.batches,
+                "blocked": self.blocked,
+                "blocked_seconds": round(self.blocked_seconds, 3),
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "last_error": self.last_error,
+            }
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush everything queued so far and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(self._STOP)
+        self._thread.join(timeout)
+
+
+def get_run_writer() -> BackgroundRunWriter:
+    global _writer
+    store = get_run_store()
+    with _store_lock:
+        if _writer is None:
+            _writer = BackgroundRunWriter(store)
+            # atexit runs LIFO: the writer drains before the store closes.
+            atexit.register(_writer.close)
+        return _writer
+
+
+def save_run_async(run_id: str, payload: dict) -> bool:
+    """Non-blocking `save_run` through the process-wide background writer."""
+    return get_run_writer().submit(run_id, payload)
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class StageTimer:
+    """
+    Monotonic per-stage durations for one analysis run.
+
+    `perf_counter` measures each stage; the wall-clock end of every stage is
+    kept too, so audit events carry their own timestamps instead of one shared `now`.
+    """
+
+    def __init__(self) -> None:
+        self.started_at = _iso(time.time())
+        self._t0 = time.perf_counter()
+        self._paused = 0.0
+        self.seconds: Dict[str, float] = {}
+        self.ended_at: Dict[str, str] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - t0
+            self.ended_at[name] = _iso(time.time())
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Time spent here (e.g. a streaming consumer rendering a partial result) is not part of the run."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._paused += time.perf_counter() - t0
+
+    def ms(self, name: str) -> float:
+        return round(self.seconds.get(name, 0.0) * 1000.0, 3)
+
+    def ts(self, name: str) -> str:
+        return self.ended_at.get(name, self.started_at)
+
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self._t0 - self._paused
+
+    def details(self) -> Dict[str, object]:
+        return {
+            "stages_ms": {name: self.ms(name) for name in self.seconds},
+            "total_ms": round(self.total_seconds() * 1000.0, 3),
+        }
+
+
+# ---- Prometheus-style metrics (text exposition format 0.0.4) ----
+
+Labels = Tuple[str, ...]
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[n]) for n in self.labelnames), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, v in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_str(self.labelnames, key)} {_fmt(v)}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Labels, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[tuple(str(labels[n]) for n in self.labelnames)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(tuple(str(labels[n]) for n in self.labelnames), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for key, v in sorted(self._values.items()):
+                lines.append(f"{self.name}{_label_str(self.labelnames, key)} {_fmt(v)}")
+        return lines
+
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # labels -> (per-bucket counts incl. +Inf, sum, count)
+        self._series: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[i] += 1
+            total[0] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(tuple(str(labels[n]) for n in self.labelnames))
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, c in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += c
+                    le = _label_str(self.labelnames, key, f'le="{_fmt(bound)}"')
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                labels = _label_str(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_fmt(total[0])}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):  # type: ignore[no-untyped-def]
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for m in metrics for line in m.render()) + "\n"  # type: ignore[attr-defined]
+
+
+REGISTRY = MetricsRegistry()
+ANALYSES_TOTAL = REGISTRY.counter("contract_analyses_total", "Completed contract analyses.", ("path",))
+ANALYSIS_SECONDS = REGISTRY.histogram("contract_analysis_seconds", "End-to-end analysis latency.", ("path",))
+STAGE_SECONDS = REGISTRY.histogram("contract_analysis_stage_seconds", "Latency per pipeline stage.", ("stage",))
+
+
+def record_analysis(timer: StageTimer, path: str) -> None:
+    """Export one run's stage timings (`path`: rules, stream, llm, cache)."""
+    record_stages(timer.seconds, timer.total_seconds(), path)
+
+
+def record_stages(stage_seconds: Dict[str, float], total_seconds: float, path: str) -> None:
+    """Same as `record_analysis` for timings measured elsewhere (e.g. in a worker process)."""
+    ANALYSES_TOTAL.inc(path=path)
+    ANALYSIS_SECONDS.observe(total_seconds, path=path)
+    for name, seconds in stage_seconds.items():
+        STAGE_SECONDS.observe(seconds, stage=name)
+
+
+# ---- Opt-in slow-run profiling ----
+
+
+@dataclass
+class ProfileConfig:
+    threshold_ms: float
+    out_dir: Path
+    memory: bool = False
+
+
+_profile_config: Optional[ProfileConfig] = None
+# cProfile allows one active profiler per process (Python 3.12+), so concurrent analyses are not profiled.
+_profiler_lock = threading.Lock()
+
+
+def enable_profiling(threshold_ms: float, out_dir: str | Path = "logs/profiles", memory: bool = False) -> None:
+    """
+    Profile every analysis with cProfile (and tracemalloc if `memory`) and dump
+    the stats for runs slower than `threshold_ms`. Adds noticeable overhead; off by default.
+    """
+    global _profile_config
+    _profile_config = ProfileConfig(threshold_ms=threshold_ms, out_dir=Path(out_dir), memory=memory)
+
+
+def disable_profiling() -> None:
+    global _profile_config
+    _profile_config = None
+
+
+if os.getenv("ANALYZER_PROFILE_THRESHOLD_MS"):
+    enable_profiling(
+        float(os.environ["ANALYZER_PROFILE_THRESHOLD_MS"]),
+        os.getenv("ANALYZER_PROFILE_DIR", "logs/profiles"),
+        memory=os.getenv("ANALYZER_PROFILE_MEMORY", "") == "1",
+    )
+
+
+class ProfileRun:
+    label: str = "run"
+    dumped: Optional[Path] = None
+
+
+@contextmanager
+def profiled() -> Iterator[ProfileRun]:
+    """
+    Wrap one analysis; set `.label` (e.g. the run_id) on the yielded object to
+    name the dump. No-op unless profiling is enabled. One analysis is profiled
+    at a time: nested calls, and analyses running concurrently on other
+    threads, are not profiled separately.
+    """
+    run = ProfileRun()
+    config = _profile_config
+    if config is None or not _profiler_lock.acquire(blocking=False):
+        yield run
+        return
+
+    import cProfile
+    import tracemalloc
+
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:  # another profiling tool (e.g. a debugger) is already active
+        _profiler_lock.release()
+        yield run
+        return
+    own_tracemalloc = config.memory and not tracemalloc.is_tracing()
+    if own_tracemalloc:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        yield run
+    finally:
+        profile.disable()
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
+        snapshot = tracemalloc.take_snapshot() if config.memory and tracemalloc.is_tracing() else None
+        if own_tracemalloc:
+            tracemalloc.stop()
+        _profiler_lock.release()
+        if elapsed_ms >= config.threshold_ms:
+            run.dumped = _dump(config, run.label, elapsed_ms, profile, snapshot)
+
+
+def _dump(config: ProfileConfig, label: str, elapsed_ms: float, profile, snapshot) -> Path:  # type: ignore[no-untyped-def]
+    config.out_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"{label}_{int(elapsed_ms)}ms"
+    path = config.out_dir / f"{stem}.prof"
+    profile.dump_stats(str(path))
+    if snapshot is not None:
+        top = snapshot.statistics("lineno")[:25]
+        (config.out_dir / f"{stem}.mem.txt").write_text("\n".join(str(s) for s in top) + "\n", encoding="utf-8")
+    return path
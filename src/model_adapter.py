@@ -1,18 +1,63 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Literal, Optional, Sequence, Union
 import random, string
 
 from .schemas import (
     AnalysisResult,
     AuditEvent,
     ContractMeta,
-    Evidence,
+    Feature,
+    FeatureSet,
     Finding,
+    ScoringBreakdown,
     Summary,
 )
-from .feature_extractor import extract_features
-from .scoring import compute_score
+from .clause_index import ClauseIndex, ClauseIndexBuilder, resolve_hits
+from .feature_extractor import SignalHit, StreamingScanner, features_from_hits, scan_signals
+from .metrics import StageTimer, profiled, record_analysis
+from .rule_engine import Resolved, default_engine
+from .scoring import ScoringProfile, get_profile
+
+if TYPE_CHECKING:
+    from .cache import AnalysisCache
+
+
+AnalysisStage = Literal["features", "finding", "scoring", "result"]
+
+
+@dataclass
+class AnalysisUpdate:
+    """
+    One step of `iter_analysis`, in this order: `features` once, `finding` for
+    each finding as it is produced, `scoring` (breakdown and summary) once, then
+    `result` with the complete `AnalysisResult`. Only the stage's fields are set.
+    """
+
+    stage: AnalysisStage
+    features: Optional[FeatureSet] = None
+    finding: Optional[Finding] = None
+    scoring: Optional[ScoringBreakdown] = None
+    summary: Optional[Summary] = None
+    result: Optional[AnalysisResult] = None
+
+
+def _final(updates: Iterator[AnalysisUpdate]) -> AnalysisResult:
+    for update in updates:
+        if update.result is not None:
+            return update.result
+    raise RuntimeError("Analysis ended without a result.")
+
+
+def _replay(result: AnalysisResult) -> Iterator[AnalysisUpdate]:
+    """The updates of an already complete result (cache hits)."""
+    yield AnalysisUpdate("features", features=result.features)
+    for finding in result.findings:
+        yield AnalysisUpdate("finding", finding=finding)
+    yield AnalysisUpdate("scoring", scoring=result.scoring, summary=result.summary)
+    yield AnalysisUpdate("result", result=result)
 
 
 def _run_id() -> str:
@@ -21,7 +66,194 @@ def _run_id() -> str:
     return f"{ts}_{suffix}"
 
 
-def analyze_contract(contract_text: str, title: str, source_type: str) -> AnalysisResult:
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _from_cache(
+    cached: Dict[str, Any],
+    key: str,
+    contract_text: str,
+    title: str,
+    source_type: str,
+    timer: Optional[StageTimer] = None,
+) -> AnalysisResult:
+    """Reuse a cached payload under a fresh run_id and audit trail."""
+    timer = timer or StageTimer()
+    features = FeatureSet.model_validate(cached["features"])
+    # The key is line-ending normalized; text_length always reflects this input.
+    features.features = [
+        Feature(name=f.name, value=len(contract_text), dtype=f.dtype) if f.name == "text_length" else f
+        for f in features.features
+    ]
+    scoring = ScoringBreakdown.model_validate(cached["scoring"])
+
+    with timer.stage("schema_construction"):
+        result = AnalysisResult(
+            run_id=_run_id(),
+            contract=ContractMeta(title=title, source_type=source_type, text_length=len(contract_text)),
+            summary=Summary.model_validate(cached["summary"]),
+            findings=[Finding.model_validate(f) for f in cached["findings"]],
+            features=features,
+            scoring=scoring,
+        )
+    result.audit = [
+        AuditEvent(ts=timer.started_at, event="UPLOAD_RECEIVED", details={"source_type": source_type}),
+        AuditEvent(
+            ts=timer.ts("cache_lookup"),
+            event="CACHE_HIT",
+            details={
+                "cache_key": key,
+                "score": scoring.normalized_score_0_100,
+                "level": scoring.risk_level,
+                "duration_ms": timer.ms("cache_lookup"),
+            },
+        ),
+        AuditEvent(ts=_now(), event="ANALYSIS_COMPLETED", details=timer.details()),
+    ]
+    record_analysis(timer, "cache")
+    return result
+
+
+def ruleset_version() -> str:
+    """Version of the active findings rules (name plus file hash); changes on every rules edit."""
+    return default_engine().ruleset().version
+
+
+def findings_from_features(features: FeatureSet, resolved: Optional[Resolved] = None) -> List[Finding]:
+    """The rule-based findings for `features` (with evidence from `resolved` when given)."""
+    # 2) Demo findings from the declarative rules file (rules/findings_rules.json, hot-reloaded).
+    # In real implementation: the model produces these findings.
+    return default_engine().ruleset().evaluate(features, resolved)
+
+
+def _no_findings() -> Finding:
+    return default_engine().ruleset().default_finding()
+
+
+def assemble_result(
+    features: FeatureSet,
+    text_length: int,
+    title: str,
+    source_type: str,
+    resolved: Optional[Resolved] = None,
+    findings: Optional[List[Finding]] = None,
+    findings_details: Optional[Dict[str, Any]] = None,
+    timer: Optional[StageTimer] = None,
+    path: str = "rules",
+    profile: Optional[ScoringProfile] = None,
+) -> AnalysisResult:
+    """
+    Shared tail of every analysis path. Model-backed analyzers pass their own
+    `findings` (and `findings_details` for the audit trail); otherwise the
+    rule-based findings are derived from `features`.
+
+    `timer` carries the stages measured by the caller; each audit event gets
+    its stage's end time and `duration_ms`, and the run is exported to
+    `src/metrics.py` under `path`.
+    """
+    return _final(
+        _assemble_steps(
+            features, text_length, title, source_type, resolved, findings, findings_details, timer, path, profile
+        )
+    )
+
+
+def _assemble_steps(
+    features: FeatureSet,
+    text_length: int,
+    title: str,
+    source_type: str,
+    resolved: Optional[Resolved] = None,
+    findings: Optional[List[Finding]] = None,
+    findings_details: Optional[Dict[str, Any]] = None,
+    timer: Optional[StageTimer] = None,
+    path: str = "rules",
+    profile: Optional[ScoringProfile] = None,
+) -> Iterator[AnalysisUpdate]:
+    """`assemble_result` as updates: each finding, the scoring, then the result. Consumer time is not timed."""
+    timer = timer or StageTimer()
+    rid = _run_id()
+
+    with timer.stage("finding_generation"):
+        if findings is None:
+            ruleset = default_engine().ruleset()
+            produced = ruleset.iter_findings(features, resolved)
+            findings_details = {"ruleset": ruleset.version, **(findings_details or {})}
+        else:
+            produced = iter(findings or [_no_findings()])
+    findings = []
+    while True:
+        with timer.stage("finding_generation"):
+            finding = next(produced, None)
+        if finding is None:
+            break
+        findings.append(finding)
+        with timer.paused():
+            yield AnalysisUpdate("finding", finding=finding)
+
+    with timer.stage("scoring"):
+        # 3) Scoring with explainability
+        score, breakdown = (profile or get_profile()).score(findings)
+
+        # 4) Summary derived from scoring
+        top_risks = [{"category": f.category, "title": f.risk_statement[:60]} for f in findings[:2]]
+        summary = Summary(
+            overall_risk_score=score,
+            risk_level=breakdown.risk_level,
+            top_risks=top_risks,
+        )
+    with timer.paused():
+        yield AnalysisUpdate("scoring", scoring=breakdown, summary=summary)
+
+    with timer.stage("schema_construction"):
+        result = AnalysisResult(
+            run_id=rid,
+            contract=ContractMeta(title=title, source_type=source_type, text_length=text_length),
+            summary=summary,
+            findings=findings,
+            features=features,
+            scoring=breakdown,
+        )
+
+    features_details: Dict[str, Any] = {
+        "feature_count": len(features.features),
+        "duration_ms": timer.ms("feature_extraction"),
+    }
+    if "evidence_resolution" in timer.seconds:
+        features_details["evidence_ms"] = timer.ms("evidence_resolution")
+
+    result.audit = [
+        AuditEvent(ts=timer.started_at, event="UPLOAD_RECEIVED", details={"source_type": source_type}),
+        AuditEvent(ts=timer.ts("feature_extraction"), event="FEATURES_EXTRACTED", details=features_details),
+        AuditEvent(
+            ts=timer.ts("finding_generation"),
+            event="FINDINGS_GENERATED",
+            details={**(findings_details or {}), "duration_ms": timer.ms("finding_generation")},
+        ),
+        AuditEvent(
+            ts=timer.ts("scoring"),
+            event="SCORING_COMPLETED",
+            details={
+                "score": score,
+                "level": breakdown.risk_level,
+                "profile": breakdown.profile,
+                "duration_ms": timer.ms("scoring"),
+            },
+        ),
+        AuditEvent(ts=_now(), event="ANALYSIS_COMPLETED", details=timer.details()),
+    ]
+    record_analysis(timer, path)
+    yield AnalysisUpdate("result", result=result)
+
+
+def analyze_contract(
+    contract_text: str,
+    title: str,
+    source_type: str,
+    cache: Optional["AnalysisCache"] = None,
+    scoring_profile: Union[str, ScoringProfile, None] = None,
+) -> AnalysisResult:
     """
     Adapter boundary.
     Later you replace internals with your actual prompt pipeline / RAG
@@ -31,82 +263,131 @@ def analyze_contract(contract_text: str, title: str, source_type: str) -> Analys
     - structured findings
     - extracted features (DS handshake)
     - scoring breakdown (explainability)
+
+    With a `cache`, identical text under the same pipeline version skips
+    recomputation; the result still gets its own run_id and audit trail.
+
+    `scoring_profile` names a profile from `rules/scoring_profiles.json`
+    (default: the built-in weights, thresholds and cap); an unknown name raises
+    LookupError. To score one result under several profiles, use
+    `compute_scores(result.findings, ...)` instead of re-running the pipeline.
     """
-    rid = _run_id()
-    now = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    profile = get_profile(scoring_profile)
+    with profiled() as prof:
+        result = _final(_analyze_text(contract_text, title, source_type, cache, profile))
+        prof.label = result.run_id
+    return result
 
-    # 1) Extract features first (this mirrors real pipelines: parse -> features -> model -> outputs)
-    features = extract_features(contract_text)
 
-    # 2) Demo findings (rule-based-ish, consistent with features)
-    # In real implementation: the model produces these findings.
-    findings = []
+def _analyze_text(
+    contract_text: str,
+    title: str,
+    source_type: str,
+    cache: Optional["AnalysisCache"],
+    profile: ScoringProfile,
+) -> Iterator[AnalysisUpdate]:
+    timer = StageTimer()
+    key = None
+    if cache is not None:
+        with timer.stage("cache_lookup"):
+            key = cache.key_for(contract_text, profile)
+            cached = cache.get(key)
+        if cached is not None:
+            yield from _replay(_from_cache(cached, key, contract_text, title, source_type, timer))
+            return
 
-    if any(f.name == "has_uncapped_liability" and f.value for f in features.features) or \
-       any(f.name == "has_consequential_damages" and f.value for f in features.features):
-        findings.append(
-            Finding(
-                finding_id="R-001",
-                category="Liability",
-                risk_statement="Liability appears uncapped and/or includes consequential damages.",
-                severity="High",
-                confidence=0.78,
-                evidence=[Evidence(clause_ref="Section 9.2", snippet="...liable for all damages including consequential...")],
-                recommendation="Cap liability to 12 months of fees and exclude consequential damages.",
-                proposed_redline="Total liability shall not exceed fees paid in the preceding 12 months..."
-            )
-        )
+    # 1) Extract features first (this mirrors real pipelines: parse -> features -> model -> outputs)
+    text = contract_text or ""
+    with timer.stage("feature_extraction"):
+        hits = scan_signals(text)
+        features = features_from_hits(hits, len(text))
+    with timer.paused():
+        yield AnalysisUpdate("features", features=features)
+    with timer.stage("evidence_resolution"):
+        # Evidence points into the document: each hit resolves to its enclosing clause.
+        resolved = resolve_hits(hits, ClauseIndex.build(text), text)
+    steps = _assemble_steps(features, len(contract_text), title, source_type, resolved, timer=timer, profile=profile)
+    for update in steps:
+        if update.result is not None and cache is not None:
+            cache.put(key, update.result)
+        yield update
 
-    if any(f.name == "has_termination_for_convenience" and f.value for f in features.features) and \
-       not any(f.name == "has_cure_period" and f.value for f in features.features):
-        findings.append(
-            Finding(
-                finding_id="R-002",
-                category="Termination",
-                risk_statement="Termination for convenience may allow exit without cure period.",
-                severity="Medium",
-                confidence=0.70,
-                evidence=[Evidence(clause_ref="Section 12.1", snippet="Either party may terminate for convenience upon notice...")],
-                recommendation="Add a cure period and limit termination for convenience."
-            )
-        )
 
-    # If nothing matched, still return a clean result (important for robustness)
-    if not findings:
-        findings.append(
-            Finding(
-                finding_id="R-000",
-                category="General",
-                risk_statement="No high-signal risk clauses detected by the demo rules.",
-                severity="Low",
-                confidence=0.60,
-                evidence=[Evidence(clause_ref="N/A", snippet="No matched patterns in provided text.")],
-                recommendation="Run with a larger contract sample or connect to the full model pipeline."
-            )
-        )
+def analyze_contract_stream(
+    chunks: Iterable[str],
+    title: str,
+    source_type: str,
+    scoring_profile: Union[str, ScoringProfile, None] = None,
+    page_starts: Optional[Sequence[int]] = None,
+) -> AnalysisResult:
+    """
+    Same contract as `analyze_contract`, for text arriving as chunks
+    (see `src/ingest.py::iter_text_chunks`). The full text is never held in
+    memory; `ContractMeta.text_length` is the total decoded length.
+
+    `page_starts` (text offsets of each page, from `src/extract.py`) adds the
+    page number to every `Evidence.clause_ref`.
+    """
+    profile = get_profile(scoring_profile)
+    with profiled() as prof:
+        result = _final(_analyze_chunks(chunks, title, source_type, profile, page_starts))
+        prof.label = result.run_id
+    return result
 
-    # 3) Scoring with explainability
-    score, breakdown = compute_score(findings)
 
-    # 4) Summary derived from scoring
-    top_risks = [{"category": f.category, "title": f.risk_statement[:60]} for f in findings[:2]]
-    summary = Summary(
-        overall_risk_score=score,
-        risk_level=breakdown.risk_level,
-        top_risks=top_risks,
+def _analyze_chunks(
+    chunks: Iterable[str],
+    title: str,
+    source_type: str,
+    profile: ScoringProfile,
+    page_starts: Optional[Sequence[int]],
+) -> Iterator[AnalysisUpdate]:
+    timer = StageTimer()
+    scanner = StreamingScanner()
+    clauses = ClauseIndexBuilder()
+    hits: Dict[str, List[SignalHit]] = {n: [] for n in scanner.registry.names}
+    for chunk in chunks:
+        with timer.stage("feature_extraction"):
+            for h in scanner.feed(chunk):
+                hits[h.name].append(h)
+        with timer.stage("evidence_resolution"):
+            clauses.feed(chunk)
+    with timer.stage("feature_extraction"):
+        for h in scanner.finish():
+            hits[h.name].append(h)
+        text_length = scanner.text_length
+        features = features_from_hits(hits, text_length)
+    with timer.paused():
+        yield AnalysisUpdate("features", features=features)
+    with timer.stage("evidence_resolution"):
+        resolved = resolve_hits(hits, clauses.finish(), page_starts=page_starts)
+    yield from _assemble_steps(
+        features, text_length, title, source_type, resolved, timer=timer, path="stream", profile=profile
     )
 
-    return AnalysisResult(
-        run_id=rid,
-        contract=ContractMeta(title=title, source_type=source_type, text_length=len(contract_text)),
-        summary=summary,
-        findings=findings,
-        features=features,
-        scoring=breakdown,
-        audit=[
-            AuditEvent(ts=now, event="UPLOAD_RECEIVED", details={"source_type": source_type}),
-            AuditEvent(ts=now, event="FEATURES_EXTRACTED", details={"feature_count": len(features.features)}),
-            AuditEvent(ts=now, event="SCORING_COMPLETED", details={"score": score, "level": breakdown.risk_level}),
-            AuditEvent(ts=now, event="ANALYSIS_COMPLETED"),
-        ],
-    )
\ No newline at end of file
+
+def iter_analysis(
+    contract: Union[str, Iterable[str]],
+    title: str,
+    source_type: str,
+    cache: Optional["AnalysisCache"] = None,
+    scoring_profile: Union[str, ScoringProfile, None] = None,
+    page_starts: Optional[Sequence[int]] = None,
+) -> Iterator[AnalysisUpdate]:
+    """
+    `analyze_contract` (for a string) or `analyze_contract_stream` (for an
+    iterable of chunks) as a generator of `AnalysisUpdate`s, so a UI can show
+    features and findings while the rest of the analysis runs. The last update
+    carries the same `AnalysisResult` the blocking call would return.
+
+    Time the consumer spends between updates is excluded from the stage
+    timings and `total_ms`. Slow-run profiling does not cover this variant.
+    The profile is resolved up front, so an unknown name raises LookupError here.
+    """
+    profile = get_profile(scoring_profile)
+    if isinstance(contract, str) and page_starts is None:
+        return _analyze_text(contract, title, source_type, cache, profile)
+    if cache is not None:
+        raise ValueError("The analysis cache needs the full text; pass a string without page_starts.")
+    chunks = [contract] if isinstance(contract, str) else contract
+    return _analyze_chunks(chunks, title, source_type, profile, page_starts)
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Union
+
+import numpy as np
+
+from .cache import normalize_clause
+from .incremental import ClauseHitCache, ClauseHits, IncrementalResult, analyze_incremental
+from .schemas import AnalysisResult
+from .scoring import ScoringProfile
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_NO_SHINGLE = np.iinfo(np.uint32).max  # every slot of the signature of an empty shingle set
+_WORD = re.compile(r"\w+")
+
+
+def shingle_hashes(text: str, k: int = 5) -> np.ndarray:
+    """
+    Unique 32-bit hashes of word k-shingles over normalized text (heading
+    numbers and case ignored). Stable across processes, so signatures persist.
+    """
+    words = _WORD.findall(normalize_clause(text).lower())
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    wh = np.fromiter((zlib.crc32(w.encode("utf-8")) for w in words), dtype=np.uint64, count=len(words))
+    if len(wh) < k:
+        k = len(wh)
+    # Polynomial rolling combination of k consecutive word hashes (mod 2^32).
+    h = np.zeros(len(wh) - k + 1, dtype=np.uint64)
+    for j in range(k):
+        h = (h * np.uint64(1_000_003) + wh[j : len(wh) - k + 1 + j]) & np.uint64(0xFFFFFFFF)
+    return np.unique(h)
+
+
+class MinHasher:
+    """
+    `num_perm` universal hash permutations (a*x + b mod 2^61-1) with a fixed seed.
+    Text without shingles (no words) gets an all-max signature; see `has_shingles`.
+    """
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        # a < 2^31 and x < 2^32 keep a*x + b inside uint64.
+        self.a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.num_perm = num_perm
+
+    def signature(self, shingles: np.ndarray, block: int = 8192) -> np.ndarray:
+        sig = np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint64)
+        for i in range(0, len(shingles), block):
+            x = shingles[i : i + block]
+            hv = ((self.a[:, None] * x[None, :] + self.b[:, None]) % _MERSENNE) & np.uint64(0xFFFFFFFF)
+            np.minimum(sig, hv.min(axis=1), out=sig)
+        return sig.astype(np.uint32)
+
+
+def has_shingles(sig: np.ndarray) -> bool:
+    """False for the signature of a text without words: it is similar to nothing, not to every other such text."""
+    return bool((sig != _NO_SHINGLE).any())
+
+
+def similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return float(np.mean(sig_a == sig_b))
+
+
+@dataclass
+class Match:
+    doc_id: str
+    run_id: Optional[str]
+    similarity: float
+
+
+class NearDuplicateIndex:
+    """
+    Persistent MinHash/LSH index of analyzed contracts (one SQLite file).
+
+    Signatures are split into `bands` of `rows`; documents sharing any band
+    bucket are candidates, verified by signature agreement. Lookups touch only
+    the matching buckets, so cost does not grow with the portfolio. With the
+    defaults (16 x 8) pairs above ~0.7 Jaccard are found with high probability.
+    Adding a document is a few row inserts; nothing is rebuilt.
+
+    Documents ingested through `analyze_with_reuse` also keep their per-clause
+    signal hits (shared between documents by clause hash), so a later near-copy
+    only rescans the clauses that differ, even in a fresh process.
+    """
+
+    def __init__(self, path: str | Path, num_perm: int = 128, bands: int = 16, shingle_k: int = 5):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands.")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_k = shingle_k
+        self.hasher = MinHasher(num_perm)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS nd_docs (doc_id TEXT PRIMARY KEY, run_id TEXT, "
+            "signature BLOB NOT NULL, added_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS nd_bands (band INTEGER NOT NULL, bucket BLOB NOT NULL, doc_id TEXT NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS nd_bands_bucket ON nd_bands (band, bucket)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS nd_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        # clause_key = "<pattern registry fingerprint>:<clause hash>"
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS nd_clause_hits (clause_key TEXT PRIMARY KEY, hits TEXT NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS nd_doc_clauses (doc_id TEXT NOT NULL, clause_key TEXT NOT NULL, "
+            "PRIMARY KEY (doc_id, clause_key)) WITHOUT ROWID"
+        )
+        params = f"perm={num_perm};bands={bands};k={shingle_k}"
+        stored = self._conn.execute("SELECT value FROM nd_meta WHERE key = 'params'").fetchone()
+        if stored is None:
+            self._conn.execute("INSERT INTO nd_meta VALUES ('params', ?)", (params,))
+        elif stored[0] != params:
+            raise ValueError(f"{self.path} was built with {stored[0]}, not {params}.")
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM nd_docs").fetchone()[0]
+
+    def signature(self, text: str) -> np.ndarray:
+        return self.hasher.signature(shingle_hashes(text, self.shingle_k))
+
+    def _buckets(self, sig: np.ndarray) -> List[bytes]:
+        return [
+            hashlib.blake2b(sig[i * self.rows : (i + 1) * self.rows].tobytes(), digest_size=8).digest()
+            for i in range(self.bands)
+        ]
+
+    def add(self, doc_id: str, text: str, run_id: Optional[str] = None) -> np.ndarray:
+        sig = self.signature(text)
+        self.add_signature(doc_id, sig, run_id)
+        return sig
+
+    def add_signature(self, doc_id: str, sig: np.ndarray, run_id: Optional[str] = None) -> None:
+        """
+        Index (or re-index) one document; a single transaction of `bands + 1`
+        row writes. A document without shingles gets no band buckets, so it is
+        never a candidate.
+        """
+        buckets = self._buckets(sig) if has_shingles(sig) else []
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM nd_bands WHERE doc_id = ?", (doc_id,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO nd_docs (doc_id, run_id, signature, added_at) VALUES (?, ?, ?, ?)",
+                (doc_id, run_id, sig.tobytes(), time.time()),
+            )
+            self._conn.executemany(
+                "INSERT INTO nd_bands (band, bucket, doc_id) VALUES (?, ?, ?)",
+                [(b, key, doc_id) for b, key in enumerate(buckets)],
+            )
+
+    def add_clause_hits(self, doc_id: str, clause_hits: Mapping[str, ClauseHits], registry: str) -> None:
+        """Keep a document's per-clause hits (clause hash -> hits) as scanned with pattern registry `registry`."""
+        keys = {f"{registry}:{h}": hits for h, hits in clause_hits.items()}
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM nd_doc_clauses WHERE doc_id = ?", (doc_id,))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO nd_clause_hits (clause_key, hits) VALUES (?, ?)",
+                [(k, json.dumps(hits, separators=(",", ":"))) for k, hits in keys.items()],
+            )
+            self._conn.executemany(
+                "INSERT INTO nd_doc_clauses (doc_id, clause_key) VALUES (?, ?)", [(doc_id, k) for k in keys]
+            )
+
+    def clause_hits(self, doc_id: str, registry: str) -> Dict[str, ClauseHits]:
+        """The stored per-clause hits of `doc_id` that were scanned with pattern registry `registry`."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT h.clause_key, h.hits FROM nd_doc_clauses d "
+                "JOIN nd_clause_hits h ON h.clause_key = d.clause_key WHERE d.doc_id = ? AND d.clause_key >= ? AND d.clause_key < ?",
+                (doc_id, f"{registry}:", f"{registry};"),
+            ).fetchall()
+        prefix = len(registry) + 1
+        return {
+            key[prefix:]: {name: [tuple(span) for span in spans] for name, spans in json.loads(hits).items()}
+            for key, hits in rows
+        }
+
+    def _candidates(self, sig: np.ndarray) -> Set[str]:
+        found: Set[str] = set()
+        for b, key in enumerate(self._buckets(sig)):
+            rows = self._conn.execute("SELECT doc_id FROM nd_bands WHERE band = ? AND bucket = ?", (b, key)).fetchall()
+            found.update(r[0] for r in rows)
+        return found
+
+    def query(self, text: str, threshold: float = 0.7, limit: int = 5, exclude: Optional[str] = None) -> List[Match]:
+        """Previously indexed documents with estimated similarity >= `threshold`, best first."""
+        return self.query_signature(self.signature(text), threshold, limit, exclude)
+
+    def query_signature(
+        self, sig: np.ndarray, threshold: float = 0.7, limit: int = 5, exclude: Optional[str] = None
+    ) -> List[Match]:
+        if not has_shingles(sig):
+            return []
+        with self._lock:
+            candidates = self._candidates(sig) - {exclude}
+            matches = []
+            for doc_id in candidates:
+                run_id, blob = self._conn.execute(
+                    "SELECT run_id, signature FROM nd_docs WHERE doc_id = ?", (doc_id,)
+                ).fetchone()
+                sim = similarity(sig, np.frombuffer(blob, dtype=np.uint32))
+                if sim >= threshold:
+                    matches.append(Match(doc_id, run_id, sim))
+        matches.sort(key=lambda m: (-m.similarity, m.doc_id))
+        return matches[:limit]
+
+    def nearest(self, text: str, threshold: float = 0.7) -> Optional[Match]:
+        found = self.query(text, threshold, limit=1)
+        return found[0] if found else None
+
+    def clusters(self, threshold: float = 0.7, min_size: int = 2) -> List[List[Match]]:
+        """
+        Group the portfolio into near-duplicate families (single linkage over
+        verified LSH candidate pairs). Largest families first; each member's
+        `similarity` is to the family's first (earliest added) document.
+        """
+        with self._lock:
+            docs = self._conn.execute("SELECT doc_id, run_id, signature FROM nd_docs ORDER BY added_at, doc_id").fetchall()
+            pairs = self._conn.execute(
+                "SELECT DISTINCT a.doc_id, b.doc_id FROM nd_bands a JOIN nd_bands b "
+                "ON a.band = b.band AND a.bucket = b.bucket AND a.doc_id < b.doc_id"
+            ).fetchall()
+        sigs = {d: np.frombuffer(s, dtype=np.uint32) for d, _, s in docs}
+        runs = {d: r for d, r, _ in docs}
+        order = {d: i for i, (d, _, _) in enumerate(docs)}
+
+        parent = {d: d for d in sigs}
+
+        def find(d: str) -> str:
+            while parent[d] != d:
+                parent[d] = parent[parent[d]]
+                d = parent[d]
+            return d
+
+        for a, b in pairs:
+            if similarity(sigs[a], sigs[b]) >= threshold:
+                ra, rb = find(a), find(b)
+                if ra != rb:
+                    parent[max(ra, rb, key=order.get)] = min(ra, rb, key=order.get)
+
+        groups: Dict[str, List[str]] = {}
+        for d in sorted(sigs, key=order.get):
+            groups.setdefault(find(d), []).append(d)
+        out = [
+            [Match(d, runs[d], similarity(sigs[members[0]], sigs[d])) for d in members]
+            for members in groups.values()
+            if len(members) >= min_size
+        ]
+        out.sort(key=lambda g: (-len(g), g[0].doc_id))
+        return out
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+@dataclass
+class ReuseResult:
+    analysis: IncrementalResult
+    match: Optional[Match]
+
+
+def analyze_with_reuse(
+    contract_text: str,
+    title: str,
+    source_type: str,
+    index: NearDuplicateIndex,
+    load_previous: Callable[[str], Optional[Union[AnalysisResult, Dict[str, Any]]]],
+    clause_cache: Optional[ClauseHitCache] = None,
+    threshold: float = 0.7,
+    scoring_profile: Union[str, ScoringProfile, None] = None,
+) -> ReuseResult:
+    """
+    Ingest a contract: find its closest previously analyzed near-duplicate and
+    analyze incrementally against it. The match's stored clause hits seed the
+    clause cache, so only clauses that differ from it are rescanned (also after
+    a restart, or without a long-lived `clause_cache`); the delta is relative to
+    the matched run. The contract and its clause hits are then added to the
+    index under its new run_id. `load_previous` maps a run_id to its stored
+    result, e.g. `RunStore.get`.
+
+    This is the ingestion entry point: `save_run` only sees the result, not
+    the text, so contracts analyzed any other way are not in the index.
+    """
+    sig = index.signature(contract_text)
+    found = index.query_signature(sig, threshold, limit=1)
+    match = found[0] if found else None
+
+    cache = clause_cache if clause_cache is not None else ClauseHitCache()
+    registry = cache.registry.fingerprint
+    previous: Optional[AnalysisResult] = None
+    if match is not None:
+        for key, hits in index.clause_hits(match.doc_id, registry).items():
+            if cache.get(key) is None:
+                cache.put(key, hits)
+        stored = load_previous(match.run_id) if match.run_id else None
+        if stored is not None:
+            previous = stored if isinstance(stored, AnalysisResult) else AnalysisResult.model_validate(stored)
+
+    analysis = analyze_incremental(
+        contract_text, title, source_type, previous=previous, cache=cache, scoring_profile=scoring_profile
+    )
+    run_id = analysis.result.run_id
+    index.add_signature(run_id, sig, run_id=run_id)
+    index.add_clause_hits(run_id, analysis.clause_hits, registry)
+    return ReuseResult(analysis=analysis, match=match)
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Near-duplicate contract index (MinHash/LSH).")
+    parser.add_argument("--db", default="logs/near_duplicates.db")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    add = sub.add_parser("add", help="Index text files (doc_id = file name).")
+    add.add_argument("paths", nargs="+")
+    q = sub.add_parser("query", help="Closest indexed contracts to a text file.")
+    q.add_argument("path")
+    q.add_argument("--threshold", type=float, default=0.7)
+    rep = sub.add_parser("report", help="Cluster the portfolio into near-duplicate families.")
+    rep.add_argument("--threshold", type=float, default=0.7)
+    args = parser.parse_args()
+
+    index = NearDuplicateIndex(args.db)
+    try:
+        if args.cmd == "add":
+            for p in args.paths:
+                index.add(Path(p).name, Path(p).read_text(encoding="utf-8", errors="ignore"))
+            print(f"Indexed {len(args.paths)} files; {len(index)} documents total.")
+        elif args.cmd == "query":
+            text = Path(args.path).read_text(encoding="utf-8", errors="ignore")
+            for m in index.query(text, args.threshold, exclude=Path(args.path).name):
+                print(f"{m.similarity:.2f}  {m.doc_id}  run={m.run_id}")
+        else:
+            families = index.clusters(args.threshold)
+            print(json.dumps([[m.__dict__ for m in fam] for fam in families], indent=2))
+            print(f"{len(families)} families covering {sum(map(len, families))} of {len(index)} documents.")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .schemas import AnalysisResult, ScoringBreakdown, ScoringBreakdownItem, SeverityWeights
+from .scoring import ScoringProfile, get_profile
+
+
+SEVERITIES: Tuple[str, ...] = ("Low", "Medium", "High", "Critical")
+_SEVERITY_CODE = {s: i for i, s in enumerate(SEVERITIES)}
+LEVELS: Tuple[str, ...] = ("Low", "Medium", "High", "Critical")
+_LEVEL_CODE = {lvl: i for i, lvl in enumerate(LEVELS)}
+
+ProfileArg = Union[str, ScoringProfile, None]
+StoredResult = Union[AnalysisResult, Dict[str, Any]]
+
+
+@dataclass
+class FindingColumns:
+    """
+    Findings of many stored runs as flat columns (one row per finding).
+
+    `run_index[i]` points into `run_ids`; severities are int8 codes in
+    `SEVERITIES` order.
+    """
+
+    run_ids: List[str]
+    run_index: np.ndarray  # int32
+    severity: np.ndarray  # int8
+    confidence: np.ndarray  # float64
+    finding_ids: List[str]
+
+    @property
+    def n_runs(self) -> int:
+        return len(self.run_ids)
+
+    @classmethod
+    def from_results(cls, results: Iterable[StoredResult]) -> "FindingColumns":
+        """Accepts `AnalysisResult`s or their JSON dicts (e.g. saved run logs) without re-validating."""
+        run_ids: List[str] = []
+        run_index: List[int] = []
+        severity: List[int] = []
+        confidence: List[float] = []
+        finding_ids: List[str] = []
+
+        for r, result in enumerate(results):
+            d = result.model_dump(include={"run_id", "findings"}) if isinstance(result, AnalysisResult) else result
+            run_ids.append(d.get("run_id", str(r)))
+            for f in d.get("findings", []):
+                run_index.append(r)
+                severity.append(_SEVERITY_CODE[f["severity"]])
+                confidence.append(float(f["confidence"]))
+                finding_ids.append(f["finding_id"])
+
+        return cls(
+            run_ids=run_ids,
+            run_index=np.asarray(run_index, dtype=np.int32),
+            severity=np.asarray(severity, dtype=np.int8),
+            confidence=np.asarray(confidence, dtype=np.float64),
+            finding_ids=finding_ids,
+        )
+
+    @classmethod
+    def from_log_files(cls, paths: Iterable[str | Path]) -> "FindingColumns":
+        return cls.from_results(json.loads(Path(p).read_text(encoding="utf-8")) for p in paths)
+
+
+@dataclass
+class PortfolioScores:
+    total_points: np.ndarray  # float64, per run
+    scores: np.ndarray  # int64 0-100, per run
+    level_codes: np.ndarray  # int8 index into `levels`
+    levels: Tuple[str, ...]
+
+    def risk_levels(self) -> List[str]:
+        return [self.levels[c] for c in self.level_codes]
+
+
+def weight_vector(weights: SeverityWeights) -> np.ndarray:
+    return np.array([getattr(weights, s) for s in SEVERITIES], dtype=np.float64)
+
+
+def _levels(scores: np.ndarray, profile: ScoringProfile) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    # The profile's score -> level table, as codes into LEVELS.
+    table = np.array([_LEVEL_CODE[lvl] for lvl in profile.level_of], dtype=np.int8)
+    return table[scores], LEVELS
+
+
+def _normalize(total_points: np.ndarray, max_points: float) -> np.ndarray:
+    # np.round is round-half-even, matching Python's round() in compute_score.
+    return np.round(np.clip(total_points / max_points * 100.0, 0.0, 100.0)).astype(np.int64)
+
+
+def score_portfolio(cols: FindingColumns, scoring_profile: ProfileArg = None) -> PortfolioScores:
+    """
+    Score every run in one pass under `scoring_profile` (a name or profile;
+    None means `default`). Per-finding points are summed in input order, so
+    scores and levels match `compute_score` exactly.
+    """
+    profile = get_profile(scoring_profile)
+    points = weight_vector(profile.weights)[cols.severity] * cols.confidence
+    total = np.bincount(cols.run_index, weights=points, minlength=cols.n_runs)
+    scores = _normalize(total, profile.max_points)
+    codes, levels = _levels(scores, profile)
+    return PortfolioScores(total_points=total, scores=scores, level_codes=codes, levels=levels)
+
+
+def score_grid(
+    cols: FindingColumns,
+    weight_grid: Union[Sequence[SeverityWeights], np.ndarray],
+    scoring_profile: ProfileArg = None,
+) -> Tuple[np.ndarray, np.ndarray, Tuple[str, ...]]:
+    """
+    Scores for K candidate weight sets at once: returns (scores[K, runs], level_codes[K, runs], levels).
+    Thresholds and the normalization cap come from `scoring_profile`.
+
+    Confidence is first summed per (severity, run), so each candidate costs one
+    (K x 4) @ (4 x runs) product regardless of the number of findings. Summation
+    order differs from `compute_score`, so totals can differ in the last ulp.
+    """
+    if isinstance(weight_grid, np.ndarray):
+        w = weight_grid.astype(np.float64).reshape(-1, len(SEVERITIES))
+    else:
+        w = np.stack([weight_vector(x) for x in weight_grid]) if len(weight_grid) else np.zeros((0, len(SEVERITIES)))
+
+    flat = cols.severity.astype(np.int64) * cols.n_runs + cols.run_index
+    conf_by_sev = np.bincount(flat, weights=cols.confidence, minlength=len(SEVERITIES) * cols.n_runs)
+    profile = get_profile(scoring_profile)
+    total = w @ conf_by_sev.reshape(len(SEVERITIES), cols.n_runs)
+    scores = _normalize(total, profile.max_points)
+    codes, levels = _levels(scores, profile)
+    return scores, codes, levels
+
+
+def breakdown_for_run(cols: FindingColumns, run: int, scoring_profile: ProfileArg = None) -> ScoringBreakdown:
+    """Bridge back to the per-run `ScoringBreakdown` (same shape as `compute_score` under the same profile)."""
+    profile = get_profile(scoring_profile)
+    rows = np.flatnonzero(cols.run_index == run)
+    items: List[ScoringBreakdownItem] = []
+    total = 0.0
+    for i in rows:
+        w = profile.weight_of[SEVERITIES[cols.severity[i]]]
+        pts = float(w) * float(cols.confidence[i])
+        total += pts
+        items.append(
+            ScoringBreakdownItem(
+                finding_id=cols.finding_ids[i],
+                severity=SEVERITIES[cols.severity[i]],
+                weight=w,
+                confidence=float(cols.confidence[i]),
+                points=round(pts, 2),
+            )
+        )
+
+    score = int(_normalize(np.array([total]), profile.max_points)[0])
+    return ScoringBreakdown(
+        profile=profile.name,
+        weights=profile.weights,
+        total_points=round(total, 2),
+        normalized_score_0_100=score,
+        risk_level=profile.level_of[score],
+        items=items,
+    )
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import operator
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from .clause_index import Clause
+from .schemas import Evidence, FeatureSet, Finding, Severity
+
+DEFAULT_RULES_PATH = Path(__file__).resolve().parent.parent / "rules" / "findings_rules.json"
+
+Resolved = Dict[str, List[Tuple[Clause, str]]]
+
+
+# ---- Rules file format ----
+class Comparison(BaseModel):
+    feature: str
+    op: Literal["==", "!=", ">", ">=", "<", "<="]
+    value: Any
+
+
+class Condition(BaseModel):
+    """All given parts must hold: every `all` feature truthy, at least one `any`, no `none`, every comparison."""
+
+    all: List[str] = Field(default_factory=list)
+    any: List[str] = Field(default_factory=list)
+    none: List[str] = Field(default_factory=list)
+    compare: List[Comparison] = Field(default_factory=list)
+
+
+class FindingTemplate(BaseModel):
+    category: str
+    risk_statement: str
+    severity: Severity
+    confidence: float = Field(ge=0.0, le=1.0)
+    recommendation: str
+    proposed_redline: Optional[str] = None
+
+
+class EvidenceSpec(BaseModel):
+    signals: List[str] = Field(default_factory=list)
+    fallback: Evidence
+
+
+class RuleSpec(BaseModel):
+    id: str
+    when: Condition = Field(default_factory=Condition)
+    finding: FindingTemplate
+    evidence: EvidenceSpec
+
+
+class RulesFile(BaseModel):
+    name: str = "rules"
+    rules: List[RuleSpec]
+    default: Optional[RuleSpec] = None  # emitted when no rule matches
+
+
+# ---- Compiled form ----
+_OPS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+def resolve_evidence(resolved: Optional[Resolved], signals: Tuple[str, ...], fallback: Evidence) -> List[Evidence]:
+    """First located match of each signal (one per clause), else the static fallback."""
+    out: List[Evidence] = []
+    seen = set()
+    for name in signals:
+        for clause, snippet in (resolved or {}).get(name, [])[:1]:
+            if clause.start not in seen:
+                seen.add(clause.start)
+                out.append(Evidence(clause_ref=clause.ref, snippet=snippet))
+    return out or [fallback]
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    rule_id: str
+    all_of: Tuple[str, ...]
+    any_of: Tuple[str, ...]
+    none_of: Tuple[str, ...]
+    compares: Tuple[Tuple[str, Callable[[Any, Any], bool], Any], ...]
+    template: Finding  # validated once at load; copied per match
+    signals: Tuple[str, ...]
+    fallback: Evidence
+
+    @classmethod
+    def from_spec(cls, spec: RuleSpec) -> "CompiledRule":
+        return cls(
+            rule_id=spec.id,
+            all_of=tuple(spec.when.all),
+            any_of=tuple(spec.when.any),
+            none_of=tuple(spec.when.none),
+            compares=tuple((c.feature, _OPS[c.op], c.value) for c in spec.when.compare),
+            template=Finding(finding_id=spec.id, evidence=[spec.evidence.fallback], **spec.finding.model_dump()),
+            signals=tuple(spec.evidence.signals),
+            fallback=spec.evidence.fallback,
+        )
+
+    def matches(self, values: Dict[str, Any]) -> bool:
+        get = values.get
+        if self.all_of and not all(get(n) for n in self.all_of):
+            return False
+        if self.any_of and not any(get(n) for n in self.any_of):
+            return False
+        if self.none_of and any(get(n) for n in self.none_of):
+            return False
+        for name, op, value in self.compares:
+            v = get(name)
+            if v is None or not op(v, value):
+                return False
+        return True
+
+    def build(self, resolved: Optional[Resolved]) -> Finding:
+        return self.template.model_copy(update={"evidence": resolve_evidence(resolved, self.signals, self.fallback)})
+
+
+class RuleSet:
+    """
+    Rules compiled for dispatch: each rule is filed under one feature that must
+    be truthy for it to match (an `all` feature, or every `any` feature), so a
+    contract only evaluates rules reachable from its truthy features plus the
+    few with no positive condition. Feature lookups are dict lookups.
+    """
+
+    def __init__(self, spec: RulesFile, version: str):
+        self.name = spec.name
+        self.version = version
+        self.rules = [CompiledRule.from_spec(r) for r in spec.rules]
+        self.default = CompiledRule.from_spec(spec.default) if spec.default else None
+        self._by_feature: Dict[str, List[int]] = {}
+        self._always: List[int] = []
+        for i, rule in enumerate(self.rules):
+            triggers = rule.all_of[:1] or rule.any_of
+            if not triggers:
+                self._always.append(i)
+            for name in triggers:
+                self._by_feature.setdefault(name, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def evaluate(self, features: FeatureSet, resolved: Optional[Resolved] = None) -> List[Finding]:
+        return list(self.iter_findings(features, resolved))
+
+    def iter_findings(self, features: FeatureSet, resolved: Optional[Resolved] = None) -> Iterator[Finding]:
+        """`evaluate`, one finding at a time in rule order; each is built only when asked for."""
+        values = {f.name: f.value for f in features.features}
+        candidates = set(self._always)
+        for name, value in values.items():
+            if value:
+                candidates.update(self._by_feature.get(name, ()))
+
+        matched = False
+        for i in sorted(candidates):
+            if self.rules[i].matches(values):
+                matched = True
+                yield self.rules[i].build(resolved)
+        if not matched and self.default is not None:
+            yield self.default.build(resolved)
+
+    def default_finding(self) -> Finding:
+        if self.default is None:
+            raise LookupError(f"Ruleset {self.name} defines no default finding.")
+        return self.default.build(None)
+
+
+def _parse(raw: bytes, path: Path) -> Dict[str, Any]:
+    if path.suffix.lower() in (".yml", ".yaml"):
+        try:
+            import yaml
+        except ImportError as exc:  # optional dependency
+            raise ImportError("YAML rule files require `pip install pyyaml`; JSON works without it.") from exc
+        return yaml.safe_load(raw)
+    return json.loads(raw)
+
+
+def load_ruleset(path: str | Path) -> RuleSet:
+    """Parse and compile a JSON (or YAML) rules file; the version is its name plus a content hash."""
+    p = Path(path)
+    raw = p.read_bytes()
+    spec = RulesFile.model_validate(_parse(raw, p))
+    return RuleSet(spec, version=f"{spec.name}@{hashlib.sha256(raw).hexdigest()[:12]}")
+
+
+class RuleEngine:
+    """
+    A rules file that reloads itself when it changes on disk.
+
+    `ruleset()` stats the file at most every `check_interval` seconds and swaps
+    in a freshly compiled `RuleSet` when its mtime or size changed. An edit that
+    fails to parse or validate keeps the previous rules and is reported in
+    `last_error`, so a typo never takes the analyzer down.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_RULES_PATH, check_interval: float = 1.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.reloads = 0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._stamp = self._stat()
+        self._ruleset = load_ruleset(self.path)
+        self._checked = time.monotonic()
+
+    def _stat(self) -> Tuple[int, int]:
+        st = self.path.stat()
+        return st.st_mtime_ns, st.st_size
+
+    def ruleset(self) -> RuleSet:
+        now = time.monotonic()
+        if now - self._checked >= self.check_interval:
+            self.reload_if_changed()
+        return self._ruleset
+
+    def reload_if_changed(self) -> bool:
+        with self._lock:
+            self._checked = time.monotonic()
+            try:
+                stamp = self._stat()
+                if stamp == self._stamp:
+                    return False
+                ruleset = load_ruleset(self.path)
+            except Exception as exc:
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                return False
+            self._stamp = stamp
+            self._ruleset = ruleset
+            self.reloads += 1
+            self.last_error = None
+            return True
+
+
+_engine: Optional[RuleEngine] = None
+_engine_lock = threading.Lock()
+
+
+def default_engine() -> RuleEngine:
+    """Process-wide engine for `FINDINGS_RULES_PATH` (default `rules/findings_rules.json`)."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = RuleEngine(os.getenv("FINDINGS_RULES_PATH") or DEFAULT_RULES_PATH)
+    return _engine
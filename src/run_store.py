@@ -0,0 +1,409 @@
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import zlib
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Set, Tuple
+
+Synchronous = Literal["OFF", "NORMAL", "FULL"]
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS runs ("
+    "seq INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL UNIQUE, created_at TEXT NOT NULL, "
+    "day TEXT NOT NULL, risk_level TEXT, score INTEGER, codec TEXT NOT NULL, payload BLOB NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS run_categories (run_seq INTEGER NOT NULL, category TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS runs_day ON runs (day)",
+    "CREATE INDEX IF NOT EXISTS runs_risk_level ON runs (risk_level, day)",
+    "CREATE INDEX IF NOT EXISTS run_categories_category ON run_categories (category, run_seq)",
+    # Inverted index: one posting per (term, run); clustered on term so a term's runs are one range scan.
+    "CREATE TABLE IF NOT EXISTS run_terms (term TEXT NOT NULL, run_seq INTEGER NOT NULL, "
+    "PRIMARY KEY (term, run_seq)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS term_df (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS run_store_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and any are as at be by for from in is it its of on or shall that the this to with".split()
+)
+TERM_FIELDS = ("category", "severity", "feature", "title", "word")
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+def index_terms(payload: Dict[str, Any]) -> Set[str]:
+    """
+    Search terms for one run, as `field:value`: finding category and severity,
+    boolean features that are set, contract title tokens, and evidence snippet
+    tokens (`word:`). Values are lower-cased.
+    """
+    terms: Set[str] = set()
+    for f in payload.get("findings") or []:
+        if f.get("category"):
+            terms.add(f"category:{f['category'].lower()}")
+        if f.get("severity"):
+            terms.add(f"severity:{f['severity'].lower()}")
+        for e in f.get("evidence") or []:
+            terms.update(f"word:{t}" for t in tokenize(e.get("snippet") or ""))
+    for feat in (payload.get("features") or {}).get("features") or []:
+        if feat.get("dtype") == "bool" and feat.get("value") is True:
+            terms.add(f"feature:{feat['name'].lower()}")
+    title = (payload.get("contract") or {}).get("title") or ""
+    terms.update(f"title:{t}" for t in tokenize(title))
+    return terms
+
+
+def parse_search(query: str) -> List[str]:
+    """
+    `category:Liability feature:has_uncapped_liability title:acme unlimited`
+    -> index terms. Bare words search evidence snippets; every term must match.
+    """
+    terms: List[str] = []
+    for part in query.split():
+        field, sep, value = part.partition(":")
+        if sep and field.lower() in TERM_FIELDS:
+            field = field.lower()
+            if field in ("title", "word"):
+                terms.extend(f"{field}:{t}" for t in tokenize(value))
+            else:
+                terms.append(f"{field}:{value.lower()}")
+        else:
+            terms.extend(f"word:{t}" for t in tokenize(part))
+    return list(dict.fromkeys(terms))
+
+
+def _created_at(payload: Dict[str, Any]) -> str:
+    # The first audit event is the upload time; fall back to "now" for ad-hoc payloads.
+    audit = payload.get("audit") or []
+    if audit and audit[0].get("ts"):
+        return audit[0]["ts"]
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _encode(payload: Dict[str, Any], compress: bool) -> Tuple[str, bytes]:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return ("zlib", zlib.compress(raw, 6)) if compress else ("json", raw)
+
+
+# run_id, payload, created_at, codec, encoded payload
+_PendingRun = Tuple[str, Dict[str, Any], str, str, bytes]
+
+
+def _decode(codec: str, blob: bytes) -> Dict[str, Any]:
+    raw = zlib.decompress(blob) if codec == "zlib" else bytes(blob)
+    return json.loads(raw)
+
+
+class RunStore:
+    """
+    Append-only store of analysis runs in a single SQLite file.
+
+    Payloads are kept whole (optionally zlib-compressed) next to indexed
+    columns for run_id, day, risk level and finding category, so auditors can
+    filter without decoding every run. Appends are buffered and written
+    `batch_size` at a time in one transaction. `synchronous` maps to SQLite's
+    PRAGMA: OFF is fastest, NORMAL (default, with WAL) can lose only the last
+    commits on power loss, FULL fsyncs every commit.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        compress: bool = False,
+        batch_size: int = 64,
+        synchronous: Synchronous = "NORMAL",
+    ):
+        if synchronous not in ("OFF", "NORMAL", "FULL"):
+            raise ValueError(f"Unknown synchronous mode: {synchronous}")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.compress = compress
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._pending: List[_PendingRun] = []
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        for stmt in _SCHEMA:
+            self._conn.execute(stmt)
+        self._conn.commit()
+        self._backfill_terms()
+
+    def _index_runs(self, runs: List[Tuple[int, Dict[str, Any]]]) -> None:
+        # One sorted bulk insert per batch: postings land in term order and each term's df is bumped once.
+        postings = sorted((t, seq) for seq, payload in runs for t in index_terms(payload))
+        self._conn.executemany("INSERT OR IGNORE INTO run_terms (term, run_seq) VALUES (?, ?)", postings)
+        self._conn.executemany(
+            "INSERT INTO term_df (term, df) VALUES (?, ?) ON CONFLICT (term) DO UPDATE SET df = df + excluded.df",
+            sorted(Counter(t for t, _ in postings).items()),
+        )
+
+    def _backfill_terms(self, batch: int = 1000) -> None:
+        # Stores created before the search index get it built once, on first open.
+        if self._conn.execute("SELECT 1 FROM run_store_meta WHERE key = 'terms_indexed'").fetchone():
+            return
+        last = 0
+        while True:
+            rows = self._conn.execute(
+                "SELECT seq, codec, payload FROM runs WHERE seq > ? ORDER BY seq LIMIT ?", (last, batch)
+            ).fetchall()
+            if not rows:
+                break
+            with self._conn:
+                self._index_runs([(seq, _decode(codec, blob)) for seq, codec, blob in rows])
+            last = rows[-1][0]
+        with self._conn:
+            self._conn.execute("INSERT INTO run_store_meta (key, value) VALUES ('terms_indexed', '1')")
+
+    def _prepare(self, run_id: str, payload: Dict[str, Any]) -> _PendingRun:
+        # Encoded up front, so a payload that cannot be stored fails its own append, not a later batch.
+        codec, blob = _encode(payload, self.compress)
+        return run_id, payload, _created_at(payload), codec, blob
+
+    def append(self, run_id: str, payload: Dict[str, Any]) -> None:
+        """
+        Buffer one run; a run_id already in the store is ignored (runs are
+        immutable). A payload that is not JSON-serializable raises TypeError
+        here and is not buffered.
+        """
+        run = self._prepare(run_id, payload)
+        with self._lock:
+            self._pending.append(run)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def append_many(self, runs: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """
+        Buffer several runs; if that reaches `batch_size` they are written in a
+        single transaction. Runs that cannot be encoded are skipped and reported
+        in one ValueError after the others are buffered.
+        """
+        prepared: List[_PendingRun] = []
+        rejected: List[str] = []
+        for run_id, payload in runs:
+            try:
+                prepared.append(self._prepare(run_id, payload))
+            except (TypeError, ValueError) as exc:
+                rejected.append(f"{run_id}: {exc}")
+        with self._lock:
+            self._pending.extend(prepared)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+        if rejected:
+            raise ValueError(f"Skipped {len(rejected)} run(s) that cannot be stored: {'; '.join(rejected)}")
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        # Taken out first: if the transaction fails, this batch is lost but later appends still work.
+        batch, self._pending = self._pending, []
+        with self._conn:  # one transaction per batch
+            added: List[Tuple[int, Dict[str, Any]]] = []
+            for run_id, payload, created_at, codec, blob in batch:
+                summary = payload.get("summary") or {}
+                cur = self._conn.execute(
+                    "INSERT OR IGNORE INTO runs (run_id, created_at, day, risk_level, score, codec, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        run_id,
+                        created_at,
+                        created_at[:10],
+                        summary.get("risk_level"),
+                        summary.get("overall_risk_score"),
+                        codec,
+                        blob,
+                    ),
+                )
+                if cur.rowcount:
+                    categories = {f["category"] for f in payload.get("findings") or [] if f.get("category")}
+                    self._conn.executemany(
+                        "INSERT INTO run_categories (run_seq, category) VALUES (?, ?)",
+                        [(cur.lastrowid, c) for c in sorted(categories)],
+                    )
+                    added.append((cur.lastrowid, payload))
+            self._index_runs(added)
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        self.flush()
+        with self._lock:
+            row = self._conn.execute("SELECT codec, payload FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return _decode(*row) if row else None
+
+    def _where(
+        self,
+        risk_level: Optional[str],
+        category: Optional[str],
+        since: Optional[str],
+        until: Optional[str],
+    ) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if risk_level is not None:
+            clauses.append("risk_level = ?")
+            params.append(risk_level)
+        if since is not None:
+            clauses.append("day >= ?")
+            params.append(since[:10])
+        if until is not None:
+            clauses.append("day <= ?")
+            params.append(until[:10])
+        if category is not None:
+            clauses.append("seq IN (SELECT run_seq FROM run_categories WHERE category = ?)")
+            params.append(category)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(
+        self,
+        risk_level: Optional[str] = None,
+        category: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stored payloads matching every given filter, oldest first.
+
+        `since`/`until` are inclusive dates (YYYY-MM-DD; longer ISO timestamps are truncated).
+        """
+        self.flush()
+        where, params = self._where(risk_level, category, since, until)
+        sql = f"SELECT codec, payload FROM runs{where} ORDER BY seq"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        for codec, blob in rows:
+            yield _decode(codec, blob)
+
+    def count(
+        self,
+        risk_level: Optional[str] = None,
+        category: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> int:
+        self.flush()
+        where, params = self._where(risk_level, category, since, until)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM runs{where}", params).fetchone()[0]
+
+    def search(
+        self,
+        query: str | List[str],
+        risk_level: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """
+        run_ids matching every search term (see `parse_search`) and filter, newest first.
+
+        Postings are intersected starting from the rarest term (by stored
+        document frequency) and probed by primary key for the others, so cost
+        follows the rarest term, not the number of runs.
+
+        Only an empty query means "filters only": a query made up entirely of
+        words the index skips (stopwords, single characters) matches nothing.
+        """
+        terms = parse_search(query) if isinstance(query, str) else list(dict.fromkeys(query))
+        if not terms and (query.strip() if isinstance(query, str) else query):
+            return []
+        self.flush()
+        with self._lock:
+            if terms:
+                marks = ",".join("?" * len(terms))
+                df = dict(self._conn.execute(f"SELECT term, df FROM term_df WHERE term IN ({marks})", terms).fetchall())
+                if len(df) < len(terms):
+                    return []  # some term never occurs
+                terms.sort(key=df.__getitem__)
+                joins = "".join(
+                    f" JOIN run_terms t{i} ON t{i}.term = ? AND t{i}.run_seq = t0.run_seq" for i in range(1, len(terms))
+                )
+                sql = f"SELECT r.run_id FROM run_terms t0{joins} JOIN runs r ON r.seq = t0.run_seq"
+                params: List[Any] = terms[1:]
+                where, extra = self._where(risk_level, None, since, until)
+                sql += " WHERE t0.term = ?" + where.replace(" WHERE ", " AND ", 1) + " ORDER BY t0.run_seq DESC"
+                params += [terms[0]] + extra
+            else:
+                where, params = self._where(risk_level, None, since, until)
+                sql = f"SELECT run_id FROM runs{where} ORDER BY seq DESC"
+            if limit is not None:
+                sql += " LIMIT ?"
+                params.append(limit)
+            return [row[0] for row in self._conn.execute(sql, params).fetchall()]
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self) -> "RunStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def import_json_logs(store: RunStore, paths: Iterable[str | Path]) -> int:
+    """Load legacy one-file-per-run JSON logs into `store`; returns files read."""
+    n = 0
+    for p in sorted(paths):
+        payload = json.loads(Path(p).read_text(encoding="utf-8"))
+        store.append(payload.get("run_id") or Path(p).stem, payload)
+        n += 1
+    store.flush()
+    return n
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query the analysis run store.")
+    parser.add_argument("--db", default="logs/runs.db")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    q = sub.add_parser("query", help="Print matching runs as JSON lines.")
+    q.add_argument("--risk-level")
+    q.add_argument("--category")
+    q.add_argument("--since")
+    q.add_argument("--until")
+    q.add_argument("--limit", type=int)
+    q.add_argument("--count", action="store_true", help="Print only the number of matching runs.")
+
+    s = sub.add_parser("search", help="Print run_ids matching every search term, newest first.")
+    s.add_argument("terms", nargs="+", help="e.g. category:Liability feature:has_uncapped_liability title:acme unlimited")
+    s.add_argument("--risk-level")
+    s.add_argument("--since")
+    s.add_argument("--until")
+    s.add_argument("--limit", type=int)
+
+    imp = sub.add_parser("import", help="Import legacy logs/*.json files.")
+    imp.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    with RunStore(args.db) as store:
+        if args.cmd == "import":
+            print(f"Imported {import_json_logs(store, args.paths)} runs into {args.db}")
+        elif args.cmd == "search":
+            for run_id in store.search(" ".join(args.terms), args.risk_level, args.since, args.until, args.limit):
+                print(run_id)
+        elif args.count:
+            print(store.count(args.risk_level, args.category, args.since, args.until))
+        else:
+            for payload in store.query(args.risk_level, args.category, args.since, args.until, args.limit):
+                print(json.dumps(payload))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,24 @@
 from __future__ import annotations
 
 from typing import Any, Dict, List, Literal, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class _Schema(BaseModel):
+    # Validators are built on first use instead of at import: a cold CLI or
+    # worker start only pays for the models it actually touches.
+    model_config = ConfigDict(defer_build=True)
 
 
 Severity = Literal["Low", "Medium", "High", "Critical"]
 
 
-class Evidence(BaseModel):
+class Evidence(_Schema):
     clause_ref: str
     snippet: str
 
 
-class Finding(BaseModel):
+class Finding(_Schema):
     finding_id: str
     category: str
     risk_statement: str
@@ -23,45 +29,45 @@ class Finding(BaseModel):
     proposed_redline: Optional[str] = None
 
 
-class ContractMeta(BaseModel):
+class ContractMeta(_Schema):
     title: str
     source_type: Literal["paste", "upload"]
     text_length: int
 
 
-class Summary(BaseModel):
+class Summary(_Schema):
     overall_risk_score: int = Field(ge=0, le=100)
     risk_level: Literal["Low", "Medium", "High", "Critical"]
     top_risks: List[Dict[str, str]] = Field(default_factory=list)
 
 
-class AuditEvent(BaseModel):
+class AuditEvent(_Schema):
     ts: str  # ISO8601 Z
     event: str
     details: Optional[Dict[str, Any]] = None
 
 
 # ---- NEW: Features extracted (DS handshake) ----
-class Feature(BaseModel):
+class Feature(_Schema):
     name: str
     value: Any
     dtype: Literal["bool", "int", "float", "str", "list", "dict"]
 
 
-class FeatureSet(BaseModel):
+class FeatureSet(_Schema):
     version: str = "1.0"
     features: List[Feature] = Field(default_factory=list)
 
 
 # ---- NEW: Scoring transparency ----
-class SeverityWeights(BaseModel):
-    Low: int
-    Medium: int
-    High: int
-    Critical: int
+class SeverityWeights(_Schema):
+    Low: int = Field(ge=0)
+    Medium: int = Field(ge=0)
+    High: int = Field(ge=0)
+    Critical: int = Field(ge=0)
 
 
-class ScoringBreakdownItem(BaseModel):
+class ScoringBreakdownItem(_Schema):
     finding_id: str
     severity: Severity
     weight: int
@@ -69,8 +75,9 @@ class ScoringBreakdownItem(BaseModel):
     points: float
 
 
-class ScoringBreakdown(BaseModel):
+class ScoringBreakdown(_Schema):
     method: str = "weighted_severity_sum_v1"
+    profile: str = "default"
     weights: SeverityWeights
     total_points: float
     normalized_score_0_100: int
@@ -78,7 +85,7 @@ class ScoringBreakdown(BaseModel):
     items: List[ScoringBreakdownItem] = Field(default_factory=list)
 
 
-class AnalysisResult(BaseModel):
+class AnalysisResult(_Schema):
     run_id: str
     contract: ContractMeta
     summary: Summary
@@ -87,4 +94,15 @@ class AnalysisResult(BaseModel):
 
     # NEW fields (safe additions)
     features: Optional[FeatureSet] = None
-    scoring: Optional[ScoringBreakdown] = None
\ No newline at end of file
+    scoring: Optional[ScoringBreakdown] = None
+
+# ---- Service API (src/service.py) ----
+class AnalyzeRequest(_Schema):
+    contract_text: str
+    title: str = "Untitled contract"
+    source_type: Literal["paste", "upload"] = "upload"
+    scoring_profile: Optional[str] = None  # see rules/scoring_profiles.json
+
+
+class BatchAnalyzeRequest(_Schema):
+    items: List[AnalyzeRequest]
@@ -1,6 +1,15 @@
 from __future__ import annotations
 
-from typing import List, Literal, Tuple
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Annotated, Dict, List, Literal, Mapping, Optional, Sequence, Tuple, Union
+
+from pydantic import BaseModel, Field
 
 from .schemas import Finding, ScoringBreakdown, ScoringBreakdownItem, SeverityWeights
 
@@ -10,63 +19,196 @@ RiskLevel = Literal["Low", "Medium", "High", "Critical"]
 
 DEFAULT_WEIGHTS = SeverityWeights(Low=10, Medium=20, High=35, Critical=50)
 
+# Simple, explainable thresholds for a demo: (minimum score, level), highest first.
+RISK_THRESHOLDS: Tuple[Tuple[int, RiskLevel], ...] = ((80, "Critical"), (60, "High"), (35, "Medium"))
+
+# Conservative normalization:
+# Assume "critical portfolio" corresponds to ~3 critical findings at confidence 1.0
+# => max_points ~ 3 * 50 = 150
+MAX_POINTS = 150.0
+
+DEFAULT_PROFILES_PATH = Path(__file__).resolve().parent.parent / "rules" / "scoring_profiles.json"
 
-def _risk_level(score: int) -> RiskLevel:
-    # Simple, explainable thresholds for a demo.
-    if score >= 80:
-        return "Critical"
-    if score >= 60:
-        return "High"
-    if score >= 35:
-        return "Medium"
+_LEVEL_RANK: Dict[str, int] = {"Low": 0, "Medium": 1, "High": 2, "Critical": 3}
+
+
+def _risk_level(score: int, thresholds: Tuple[Tuple[int, RiskLevel], ...] = RISK_THRESHOLDS) -> RiskLevel:
+    for cutoff, level in thresholds:
+        if score >= cutoff:
+            return level
     return "Low"
 
 
-def compute_score(findings: List[Finding], weights: SeverityWeights = DEFAULT_WEIGHTS) -> Tuple[int, ScoringBreakdown]:
+@dataclass(frozen=True)
+class ScoringProfile:
     """
-    Weighted severity sum with confidence.
-    points_i = weight(severity_i) * confidence_i
-    score = normalize(total_points to 0-100 with a conservative cap)
-
-    This is intentionally transparent and easy to review with DS/Model Risk.
+    One risk appetite: severity weights, level thresholds and normalization cap,
+    compiled at construction into read-only lookup tables (severity -> weight,
+    score 0-100 -> level), so scoring is two lookups per finding.
     """
-    items: List[ScoringBreakdownItem] = []
-    total_points = 0.0
 
-    weight_map = {
-        "Low": weights.Low,
-        "Medium": weights.Medium,
-        "High": weights.High,
-        "Critical": weights.Critical,
-    }
+    name: str
+    weights: SeverityWeights
+    thresholds: Tuple[Tuple[int, RiskLevel], ...] = RISK_THRESHOLDS
+    max_points: float = MAX_POINTS
+    weight_of: Mapping[str, int] = field(init=False, repr=False, compare=False)
+    level_of: Tuple[RiskLevel, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.max_points <= 0:
+            raise ValueError(f"Scoring profile {self.name}: max_points must be positive.")
+        if min(self.weights.model_dump().values()) < 0:
+            raise ValueError(f"Scoring profile {self.name}: weights must not be negative.")
+        cutoffs = [c for c, _ in self.thresholds]
+        if any(not 0 <= c <= 100 for c in cutoffs):
+            raise ValueError(f"Scoring profile {self.name}: thresholds must be scores between 0 and 100.")
+        ranks = [_LEVEL_RANK[lvl] for _, lvl in self.thresholds]
+        if cutoffs != sorted(set(cutoffs), reverse=True) or ranks != sorted(set(ranks), reverse=True):
+            raise ValueError(
+                f"Scoring profile {self.name}: thresholds must rise with severity (Medium < High < Critical), "
+                "listed highest first."
+            )
+        object.__setattr__(self, "weights", self.weights.model_copy())
+        object.__setattr__(self, "thresholds", tuple((int(c), lvl) for c, lvl in self.thresholds))
+        object.__setattr__(self, "weight_of", MappingProxyType(self.weights.model_dump()))
+        object.__setattr__(self, "level_of", tuple(_risk_level(s, self.thresholds) for s in range(101)))
+
+    def fingerprint(self) -> Dict[str, object]:
+        """Everything that determines this profile's scores (for cache keys)."""
+        return {
+            "name": self.name,
+            "weights": dict(self.weight_of),
+            "thresholds": [list(t) for t in self.thresholds],
+            "max_points": self.max_points,
+        }
+
+    def score(self, findings: Sequence[Finding]) -> Tuple[int, ScoringBreakdown]:
+        return _score_rows([(f.finding_id, f.severity, f.confidence) for f in findings], self)
+
+
+DEFAULT_PROFILE = ScoringProfile("default", DEFAULT_WEIGHTS)
+
 
-    for f in findings:
-        w = weight_map[f.severity]
-        pts = float(w) * float(f.confidence)
+@lru_cache(maxsize=64)
+def _weights_profile(low: int, medium: int, high: int, critical: int) -> ScoringProfile:
+    return ScoringProfile("custom", SeverityWeights(Low=low, Medium=medium, High=high, Critical=critical))
+
+
+def _score_rows(rows: Sequence[Tuple[str, str, float]], profile: ScoringProfile) -> Tuple[int, ScoringBreakdown]:
+    weight_of = profile.weight_of
+    items: List[ScoringBreakdownItem] = []
+    total_points = 0.0
+    for finding_id, severity, confidence in rows:
+        w = weight_of[severity]
+        pts = float(w) * float(confidence)
         total_points += pts
         items.append(
             ScoringBreakdownItem(
-                finding_id=f.finding_id,
-                severity=f.severity,
+                finding_id=finding_id,
+                severity=severity,
                 weight=w,
-                confidence=f.confidence,
+                confidence=confidence,
                 points=round(pts, 2),
             )
         )
 
-    # Conservative normalization:
-    # Assume "critical portfolio" corresponds to ~3 critical findings at confidence 1.0
-    # => max_points ~ 3 * 50 = 150
-    max_points = 150.0
-    normalized = int(round(min(100.0, (total_points / max_points) * 100.0)))
-
-    level = _risk_level(normalized)
+    normalized = int(round(max(0.0, min(100.0, (total_points / profile.max_points) * 100.0))))
 
     breakdown = ScoringBreakdown(
-        weights=weights,
+        profile=profile.name,
+        weights=profile.weights,
         total_points=round(total_points, 2),
         normalized_score_0_100=normalized,
-        risk_level=level,
+        risk_level=profile.level_of[normalized],
         items=items,
     )
-    return normalized, breakdown
\ No newline at end of file
+    return normalized, breakdown
+
+
+def compute_score(
+    findings: List[Finding],
+    weights: SeverityWeights = DEFAULT_WEIGHTS,
+    profile: Optional[ScoringProfile] = None,
+) -> Tuple[int, ScoringBreakdown]:
+    """
+    Weighted severity sum with confidence.
+    points_i = weight(severity_i) * confidence_i
+    score = normalize(total_points to 0-100 with a conservative cap)
+
+    This is intentionally transparent and easy to review with DS/Model Risk.
+
+    `profile` selects weights, thresholds and cap together; bare `weights`
+    keep the default thresholds and cap.
+    """
+    if profile is None:
+        profile = DEFAULT_PROFILE if weights is DEFAULT_WEIGHTS else _weights_profile(
+            weights.Low, weights.Medium, weights.High, weights.Critical
+        )
+    return profile.score(findings)
+
+
+def compute_scores(
+    findings: Sequence[Finding], profiles: Sequence[ScoringProfile]
+) -> Dict[str, Tuple[int, ScoringBreakdown]]:
+    """The same findings scored under several profiles, keyed by profile name."""
+    rows = [(f.finding_id, f.severity, f.confidence) for f in findings]
+    return {p.name: _score_rows(rows, p) for p in profiles}
+
+
+# ---- Profiles file (rules/scoring_profiles.json) ----
+class ProfileSpec(BaseModel):
+    name: str
+    weights: SeverityWeights
+    thresholds: Dict[Literal["Medium", "High", "Critical"], Annotated[int, Field(ge=0, le=100)]] = Field(
+        default_factory=lambda: {level: cutoff for cutoff, level in RISK_THRESHOLDS}
+    )
+    max_points: float = Field(default=MAX_POINTS, gt=0)
+
+    def compile(self) -> ScoringProfile:
+        thresholds = tuple(sorted(((c, lvl) for lvl, c in self.thresholds.items()), reverse=True))
+        return ScoringProfile(self.name, self.weights, thresholds, self.max_points)
+
+
+class ProfilesFile(BaseModel):
+    profiles: List[ProfileSpec]
+
+
+def load_profiles(path: Union[str, Path]) -> Mapping[str, ScoringProfile]:
+    """
+    Compile every profile in a JSON profiles file. `default` is built in
+    (`DEFAULT_PROFILE`) so evaluation re-scoring and the pipeline never disagree;
+    the file adds named alternatives.
+    """
+    spec = ProfilesFile.model_validate(json.loads(Path(path).read_bytes()))
+    profiles: Dict[str, ScoringProfile] = {"default": DEFAULT_PROFILE}
+    for p in spec.profiles:
+        if p.name in profiles:
+            raise ValueError(f"{path}: scoring profile {p.name!r} is defined twice or shadows the built-in default.")
+        profiles[p.name] = p.compile()
+    return MappingProxyType(profiles)
+
+
+_profiles: Optional[Mapping[str, ScoringProfile]] = None
+_profiles_lock = threading.Lock()
+
+
+def scoring_profiles() -> Mapping[str, ScoringProfile]:
+    """Process-wide profiles from `SCORING_PROFILES_PATH` (default `rules/scoring_profiles.json`), loaded once."""
+    global _profiles
+    if _profiles is None:
+        with _profiles_lock:
+            if _profiles is None:
+                _profiles = load_profiles(os.getenv("SCORING_PROFILES_PATH") or DEFAULT_PROFILES_PATH)
+    return _profiles
+
+
+def get_profile(profile: Union[str, ScoringProfile, None] = None) -> ScoringProfile:
+    """Resolve a profile name (None means `default`)."""
+    if isinstance(profile, ScoringProfile):
+        return profile
+    if profile is None or profile == "default":
+        return DEFAULT_PROFILE
+    try:
+        return scoring_profiles()[profile]
+    except KeyError:
+        raise LookupError(f"Unknown scoring profile {profile!r}; known: {', '.join(sorted(scoring_profiles()))}.") from None
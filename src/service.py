@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from concurrent.futures import BrokenExecutor, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import ValidationError
+
+from .metrics import REGISTRY, record_stages
+from .model_adapter import analyze_contract
+from .schemas import AnalyzeRequest, BatchAnalyzeRequest
+from .scoring import get_profile
+
+PoolKind = Literal["thread", "process"]
+
+REQUESTS_TOTAL = REGISTRY.counter(
+    "analysis_service_requests_total", "HTTP requests by endpoint and status.", ("endpoint", "status")
+)
+REQUEST_SECONDS = REGISTRY.histogram("analysis_service_request_seconds", "HTTP request latency.", ("endpoint",))
+DOCUMENTS_PENDING = REGISTRY.gauge("analysis_service_documents_pending", "Documents queued or being analyzed.")
+REJECTED_TOTAL = REGISTRY.counter("analysis_service_rejected_total", "Documents refused with 429 (queue full).")
+
+
+@dataclass
+class _Outcome:
+    result_json: Optional[bytes]
+    error: Optional[str]
+    stage_seconds: Dict[str, float]
+    total_seconds: float
+
+
+def _warm() -> None:
+    # Pool initializer: imports, compiled signal patterns and pydantic schemas are ready before the first request.
+    analyze_contract("1. LIABILITY\nLiability is unlimited liability.", title="warm-up", source_type="paste")
+
+
+def _analyze(contract_text: str, title: str, source_type: str, scoring_profile: Optional[str] = None) -> _Outcome:
+    # Module-level so it can be pickled into process workers.
+    try:
+        result = analyze_contract(contract_text, title=title, source_type=source_type, scoring_profile=scoring_profile)
+    except Exception as exc:
+        return _Outcome(None, f"{type(exc).__name__}: {exc}", {}, 0.0)
+    # Timings travel back with the payload: metrics recorded inside a worker process never reach /metrics.
+    timing = result.audit[-1].details or {}
+    stages = {k: v / 1000.0 for k, v in timing.get("stages_ms", {}).items()}
+    return _Outcome(result.model_dump_json().encode("utf-8"), None, stages, timing.get("total_ms", 0.0) / 1000.0)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "AnalysisService"
+
+    def log_message(self, format: str, *args: Any) -> None:  # quiet
+        pass
+
+    def _send(self, endpoint: str, status: int, body: bytes, content_type: str = "application/json", **headers: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name.replace("_", "-"), value)
+        self.end_headers()
+        self.wfile.write(body)
+        REQUESTS_TOTAL.inc(endpoint=endpoint, status=str(status))
+
+    def _error(self, endpoint: str, status: int, message: str, **headers: str) -> None:
+        self._send(endpoint, status, json.dumps({"error": message}).encode("utf-8"), **headers)
+
+    def do_GET(self) -> None:
+        srv = self.server
+        if self.path == "/healthz":
+            body = {
+                "status": "ok",
+                "executor": srv.executor_kind,
+                "workers": srv.workers,
+                "documents_pending": srv.pending,
+                "max_pending": srv.max_pending,
+                "uptime_s": round(time.monotonic() - srv.started, 1),
+            }
+            self._send("healthz", 200, json.dumps(body).encode("utf-8"))
+        elif self.path == "/metrics":
+            self._send("metrics", 200, REGISTRY.render().encode("utf-8"), "text/plain; version=0.0.4")
+        else:
+            self._error("other", 404, "not found")
+
+    def do_POST(self) -> None:
+        endpoint = {"/v1/analyze": "analyze", "/v1/batch": "batch"}.get(self.path)
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True  # the body's extent is unknown
+            self._error(endpoint or "other", 400, "Invalid Content-Length.")
+            return
+        if length > self.server.max_body_bytes:
+            self.close_connection = True  # body left unread
+            self._error(endpoint or "other", 413, f"Body exceeds {self.server.max_body_bytes} bytes.")
+            return
+        raw = self.rfile.read(length)
+        if endpoint is None:
+            self._error("other", 404, "not found")
+            return
+
+        t0 = time.perf_counter()
+        try:
+            if endpoint == "analyze":
+                req = AnalyzeRequest.model_validate_json(raw)
+                get_profile(req.scoring_profile)
+                self._analyze(req)
+            else:
+                batch = BatchAnalyzeRequest.model_validate_json(raw)
+                for item in batch.items:
+                    get_profile(item.scoring_profile)
+                self._batch(batch)
+        except ValidationError as exc:
+            body = {"error": "invalid request", "details": json.loads(exc.json(include_url=False, include_input=False))}
+            self._send(endpoint, 400, json.dumps(body).encode("utf-8"))
+        except LookupError as exc:
+            self._error(endpoint, 400, str(exc))
+        except Exception as exc:  # e.g. a crashed worker pool: answer rather than drop the connection
+            self.close_connection = True
+            self._error(endpoint, 500, f"{type(exc).__name__}: {exc}")
+        finally:
+            REQUEST_SECONDS.observe(time.perf_counter() - t0, endpoint=endpoint)
+
+    def _analyze(self, req: AnalyzeRequest) -> None:
+        srv = self.server
+        if not srv.reserve(1):
+            self._error("analyze", 429, "Analysis queue is full; retry later.", Retry_After="1")
+            return
+        fut = srv.submit(req)
+        try:
+            outcome = fut.result(timeout=srv.request_timeout)
+        except FutureTimeout:
+            fut.cancel()
+            self._error("analyze", 504, f"Analysis exceeded {srv.request_timeout}s.")
+            return
+        if outcome.result_json is None:
+            self._error("analyze", 500, outcome.error or "analysis failed")
+        else:
+            self._send("analyze", 200, outcome.result_json)
+
+    def _batch(self, req: BatchAnalyzeRequest) -> None:
+        srv = self.server
+        n = len(req.items)
+        if n > srv.max_pending:
+            self._error("batch", 413, f"Batch of {n} exceeds the queue capacity of {srv.max_pending}; split it.")
+            return
+        if not srv.reserve(n):
+            self._error("batch", 429, "Analysis queue is full; retry later.", Retry_After="1")
+            return
+        futures: List["Future[_Outcome]"] = []
+        try:
+            for item in req.items:
+                futures.append(srv.submit(item))
+        except BaseException:
+            srv.release(n - len(futures))  # slots reserved for items that never reached the pool
+            raise
+        _, not_done = wait(futures, timeout=srv.request_timeout)
+
+        # Results are already JSON bytes; splice them instead of decoding and re-encoding.
+        parts: List[bytes] = []
+        for i, fut in enumerate(futures):
+            if fut in not_done:
+                fut.cancel()
+                entry = {"index": i, "error": f"Analysis exceeded {srv.request_timeout}s."}
+            elif fut.cancelled():
+                entry = {"index": i, "error": "Analysis was cancelled."}
+            elif fut.exception() is not None:
+                exc = fut.exception()
+                entry = {"index": i, "error": f"{type(exc).__name__}: {exc}"}
+            else:
+                outcome = fut.result()
+                if outcome.result_json is not None:
+                    parts.append(b'{"index":%d,"result":%s}' % (i, outcome.result_json))
+                    continue
+                entry = {"index": i, "error": outcome.error}
+            parts.append(json.dumps(entry).encode("utf-8"))
+        self._send("batch", 200, b'{"results":[' + b",".join(parts) + b"]}")
+
+
+class AnalysisService(ThreadingHTTPServer):
+    """
+    Long-lived local analysis service (HTTP/JSON, keep-alive).
+
+    POST /v1/analyze    {"contract_text", "title", "source_type", "scoring_profile"} -> AnalysisResult
+    POST /v1/batch      {"items": [...]} -> {"results": [{"index", "result" | "error"}]}
+    GET  /healthz, /metrics (Prometheus text)
+
+    Documents run on a warm worker pool (processes by default). At most
+    `max_pending` documents are queued or running; beyond that requests get 429
+    with Retry-After instead of piling up. If a worker process dies, the
+    requests it broke get 500 and the pool is rebuilt before the next submit.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        workers: int = 4,
+        executor: PoolKind = "process",
+        max_pending: Optional[int] = None,
+        request_timeout: float = 120.0,
+        max_body_bytes: int = 64 * 1024 * 1024,
+    ):
+        super().__init__((host, port), _Handler)
+        self.executor_kind = executor
+        self.workers = workers
+        self.max_pending = max_pending or workers * 8
+        self.request_timeout = request_timeout
+        self.max_body_bytes = max_body_bytes
+        self.started = time.monotonic()
+        self.pending = 0
+        self._lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        self._pool = self._make_pool(executor, workers)
+        self._broken_pool: Optional[Executor] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _make_pool(kind: PoolKind, workers: int) -> Executor:
+        if kind == "process":
+            pool: Executor = ProcessPoolExecutor(max_workers=workers, initializer=_warm)
+            # Spawn every worker now so the first requests don't pay startup.
+            wait([pool.submit(time.sleep, 0) for _ in range(workers)])
+            return pool
+        if kind == "thread":
+            _warm()
+            return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis")
+        raise ValueError(f"Unknown executor kind: {kind!r}")
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reserve(self, n: int) -> bool:
+        with self._lock:
+            if self.pending + n > self.max_pending:
+                REJECTED_TOTAL.inc(n)
+                return False
+            self.pending += n
+            DOCUMENTS_PENDING.set(self.pending)
+            return True
+
+    def release(self, n: int) -> None:
+        with self._lock:
+            self.pending -= n
+            DOCUMENTS_PENDING.set(self.pending)
+
+    def submit(self, req: AnalyzeRequest) -> "Future[_Outcome]":
+        """
+        Run one reserved document; its slot is released when it finishes (or is
+        cancelled). Never raises: a pool that cannot take work (broken, or shut
+        down) yields a failed future, so the slot is still released.
+        """
+        for attempt in range(2):
+            self.replace_broken_pool()
+            pool = self._pool
+            try:
+                fut = pool.submit(_analyze, req.contract_text, req.title, req.source_type, req.scoring_profile)
+                break
+            except BrokenExecutor as exc:
+                self._broken_pool = pool
+                if attempt:
+                    fut = Future()
+                    fut.set_exception(exc)
+            except Exception as exc:  # e.g. RuntimeError after shutdown; a fresh pool would not help
+                fut = Future()
+                fut.set_exception(exc)
+                break
+        fut.add_done_callback(lambda f: self._done(pool, f))
+        return fut
+
+    def replace_broken_pool(self) -> None:
+        """Swap in a fresh worker pool if the current one lost a worker."""
+        with self._pool_lock:
+            broken = self._broken_pool
+            if broken is None or broken is not self._pool:
+                return
+            self._pool = self._make_pool(self.executor_kind, self.workers)
+            self._broken_pool = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _done(self, pool: Executor, fut: "Future[_Outcome]") -> None:
+        self.release(1)
+        if not fut.cancelled() and isinstance(fut.exception(), BrokenExecutor):
+            self._broken_pool = pool
+        if self.executor_kind != "process" or fut.cancelled() or fut.exception() is not None:
+            return  # thread workers already recorded their stages in this process
+        outcome = fut.result()
+        if outcome.result_json is not None:
+            record_stages(outcome.stage_seconds, outcome.total_seconds, "service")
+
+    def start(self) -> "AnalysisService":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> "AnalysisService":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Contract analysis HTTP service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--executor", choices=["process", "thread"], default="process")
+    parser.add_argument("--max-pending", type=int, default=None, help="Queued+running documents before 429 (default workers*8)")
+    args = parser.parse_args()
+
+    server = AnalysisService(args.host, args.port, args.workers, args.executor, args.max_pending)
+    print(f"Analysis service listening on {server.url} ({args.workers} {args.executor} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
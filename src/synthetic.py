@@ -0,0 +1,57 @@
+"""
+Deterministic synthetic contracts for benchmarks and tests, modelled on
+`sample_data/sample_contract_1.txt`: numbered sections whose bodies are either
+risk clauses (liability, termination, renewal, indemnity, cure) or boilerplate.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Iterator, List, Tuple
+
+# (heading, body) pairs that trigger the demo signals.
+RISK_CLAUSES: List[Tuple[str, str]] = [
+    ("LIMITATION OF LIABILITY", "Supplier shall be liable for all damages including consequential, incidental, and special damages."),
+    ("LIABILITY", "Liability under this Agreement is unlimited liability for each party."),
+    ("EXCLUSIONS", "Nothing in this Agreement excludes liability for indirect or consequential damages."),
+    ("LIABILITY CAP", "The liability of the Supplier is uncapped in respect of data protection claims."),
+    ("TERMINATION", "Either party may terminate for convenience at any time upon written notice."),
+    ("TERMINATION FOR BREACH", "A party may terminate for material breach subject to a cure period of thirty (30) days."),
+    ("RENEWAL", "Automatic renewal applies for successive twelve month terms unless either party cancels."),
+    ("INDEMNIFICATION", "Supplier shall indemnify and hold harmless the Customer against all third-party claims."),
+]
+
+BOILERPLATE: List[Tuple[str, str]] = [
+    ("SERVICES", "The Supplier shall provide the Services in accordance with the Statement of Work and the Service Levels."),
+    ("FEES", "The Customer shall pay the Fees within thirty days of receipt of a valid invoice."),
+    ("CONFIDENTIALITY", "Each party shall keep the other party's Confidential Information secret and use it only for this Agreement."),
+    ("GOVERNING LAW", "This Agreement shall be governed by the laws of England and Wales."),
+    ("NOTICES", "Notices shall be in writing and delivered by hand, courier or email to the addresses set out above."),
+    ("ASSIGNMENT", "Neither party may assign this Agreement without the prior written consent of the other party."),
+    ("FORCE MAJEURE", "Neither party is liable for delay caused by events beyond its reasonable control."),
+    ("ENTIRE AGREEMENT", "This Agreement constitutes the entire agreement between the parties."),
+]
+
+
+def iter_contract_chunks(size_bytes: int, density: float = 0.2, seed: int = 0) -> Iterator[str]:
+    """
+    Yield section-sized pieces until at least `size_bytes` of ASCII text.
+    `density` is the fraction of sections that are risk clauses.
+    """
+    rng = random.Random(seed)
+    header = "MASTER SERVICES AGREEMENT\n\n"
+    yield header
+    written = len(header)
+    section = 0
+    while written < size_bytes:
+        section += 1
+        heading, body = rng.choice(RISK_CLAUSES if rng.random() < density else BOILERPLATE)
+        # Repeat the body so sections are a realistic few hundred bytes.
+        piece = f"{section // 10 + 1}.{section % 10 + 1} {heading}\n" + " ".join([body] * rng.randint(1, 4)) + "\n\n"
+        yield piece
+        written += len(piece)
+
+
+def generate_contract(size_bytes: int, density: float = 0.2, seed: int = 0) -> str:
+    """A deterministic contract of exactly `size_bytes` characters (see `iter_contract_chunks`)."""
+    return "".join(iter_contract_chunks(size_bytes, density, seed))[: max(size_bytes, 1)]
@@ -1,11 +1,89 @@
 import json
 import streamlit as st
 
-from src.model_adapter import analyze_contract
-from src.logger import save_run
+from src.cache import AnalysisCache
+from src.extract import DocumentExtractor, ExtractionCache, ExtractionError
+from src.incremental import ClauseHitCache
+from src.ingest import iter_text_chunks
+from src.model_adapter import iter_analysis
+from src.logger import get_run_store, get_run_writer, save_run_async
+from src.near_duplicates import NearDuplicateIndex, analyze_with_reuse
+from src.scoring import scoring_profiles
 
 st.set_page_config(page_title="GenAI Contract Risk Analyzer", layout="wide")
 
+
+@st.cache_resource
+def _analysis_cache() -> AnalysisCache:
+    # One memory-only cache per server process: re-uploads reuse the computed payload.
+    return AnalysisCache()
+
+
+@st.cache_resource
+def _extractor() -> DocumentExtractor:
+    # Warm extraction workers shared by all sessions; extracted text is cached by file hash.
+    return DocumentExtractor(workers=2, timeout=60.0, cache=ExtractionCache(path="logs/extraction_cache.db"))
+
+
+@st.cache_resource
+def _clause_cache() -> ClauseHitCache:
+    # Content-addressed per clause, so it is safe to share between sessions.
+    return ClauseHitCache()
+
+
+@st.cache_resource
+def _near_duplicates() -> NearDuplicateIndex:
+    # Redline rounds are ingested here, so later near-copies only rescan the clauses that differ.
+    return NearDuplicateIndex("logs/near_duplicates.db")
+
+
+def _load_run(run_id: str):
+    # The last round may still be queued for the background writer.
+    last = st.session_state.get("last_result")
+    if last is not None and last.run_id == run_id:
+        return last
+    return get_run_store().get(run_id)
+
+
+def _render_finding(f: dict) -> None:
+    with st.expander(f'{f["finding_id"]} | {f["category"]} | {f["severity"]}', expanded=False):
+        st.write("**Risk statement:**", f["risk_statement"])
+        st.write("**Recommendation:**", f["recommendation"])
+        if f.get("proposed_redline"):
+            st.write("**Proposed redline:**", f["proposed_redline"])
+        st.write("**Confidence:**", f["confidence"])
+
+
+def _render_progress(updates, live):
+    """
+    Show features and findings in the output column as the analysis produces
+    them; the placeholder is cleared once the full result is ready.
+    """
+    result_obj = None
+    with live.container():
+        status = st.empty()
+        status.info("Extracting features...")
+        register_tab, features_tab = st.tabs(["Risk Register", "Features Extracted"])
+        features_slot = features_tab.empty()
+        with register_tab:
+            st.subheader("Risk Register")
+        for update in updates:
+            if update.stage == "features":
+                feats = update.features.model_dump()["features"]
+                features_slot.dataframe(feats, use_container_width=True)
+                status.info("Features extracted. Generating findings...")
+            elif update.stage == "finding":
+                with register_tab:
+                    _render_finding(update.finding.model_dump())
+            elif update.stage == "scoring":
+                summary = update.summary
+                status.info(f"Risk score {summary.overall_risk_score} ({summary.risk_level}). Finishing...")
+            else:
+                result_obj = update.result
+    live.empty()
+    return result_obj
+
+
 st.title("GenAI Contract Risk Analyzer (Portfolio Demo)")
 st.caption("Enterprise-style outputs: schema contract, evidence, audit log, features, scoring breakdown, and exportable JSON.")
 
@@ -18,41 +96,104 @@ left, right = st.columns([1.05, 0.95])
 with left:
     st.subheader("1) Provide contract text")
 
-    input_type = st.radio("Input type", ["Paste text", "Upload .txt"], horizontal=True)
+    input_type = st.radio("Input type", ["Paste text", "Upload file"], horizontal=True)
     contract_title = st.text_input("Contract title", value="Sample MSA")
+    scoring_profile = st.selectbox("Scoring profile", list(scoring_profiles()))
 
     contract_text = ""
     source_type = "paste"
+    uploaded = None
+    incremental = False
 
     if input_type == "Paste text":
         contract_text = st.text_area("Paste contract here", height=320)
         source_type = "paste"
+        incremental = st.checkbox(
+            "Redline round: only re-analyze changed clauses and show what changed",
+            value="last_result" in st.session_state,
+        )
     else:
-        uploaded = st.file_uploader("Upload .txt contract", type=["txt"])
+        uploaded = st.file_uploader("Upload contract (.txt, .pdf, .docx)", type=["txt", "pdf", "docx"])
         if uploaded is not None:
-            contract_text = uploaded.read().decode("utf-8", errors="ignore")
+            # Text is streamed through the analyzer in chunks; PDF/DOCX go through the extraction pool first.
             source_type = "upload"
             st.success("File loaded successfully.")
 
-    run_btn = st.button("Analyze contract", type="primary", disabled=(len(contract_text.strip()) == 0))
+    has_input = uploaded.size > 0 if uploaded is not None else len(contract_text.strip()) > 0
+    run_btn = st.button("Analyze contract", type="primary", disabled=not has_input)
+
+with right:
+    st.subheader("2) Output")
+    # Partial results stream in here while an analysis runs.
+    live = st.empty()
 
 # --------------------
 # RUN ANALYSIS
 # --------------------
 if run_btn:
-    result_obj = analyze_contract(contract_text, title=contract_title, source_type=source_type)
+    if uploaded is not None and not uploaded.name.lower().endswith(".txt"):
+        try:
+            document = _extractor().extract(uploaded.name, uploaded.getvalue())
+        except (ExtractionError, ImportError) as exc:
+            st.error(f"Could not extract text from {uploaded.name}: {exc}")
+            st.stop()
+        updates = iter_analysis(
+            iter(document.pages),
+            title=contract_title,
+            source_type=source_type,
+            scoring_profile=scoring_profile,
+            page_starts=document.page_starts,
+        )
+        result_obj = _render_progress(updates, live)
+    elif uploaded is not None:
+        uploaded.seek(0)
+        updates = iter_analysis(
+            iter_text_chunks(uploaded), title=contract_title, source_type=source_type, scoring_profile=scoring_profile
+        )
+        result_obj = _render_progress(updates, live)
+    elif incremental:
+        reuse = analyze_with_reuse(
+            contract_text,
+            contract_title,
+            source_type,
+            _near_duplicates(),
+            _load_run,
+            clause_cache=_clause_cache(),
+            scoring_profile=scoring_profile,
+        )
+        inc = reuse.analysis
+        result_obj = inc.result
+        st.session_state["delta"] = {
+            **inc.delta.summary(),
+            "clauses_rescanned": inc.clauses_rescanned,
+            "clauses_total": inc.clauses_total,
+            "added_ids": [f.finding_id for f in inc.delta.added],
+            "removed_ids": [f.finding_id for f in inc.delta.removed],
+        }
+    else:
+        updates = iter_analysis(
+            contract_text,
+            title=contract_title,
+            source_type=source_type,
+            cache=_analysis_cache(),
+            scoring_profile=scoring_profile,
+        )
+        result_obj = _render_progress(updates, live)
+    if not incremental:
+        st.session_state.pop("delta", None)
+    st.session_state["last_result"] = result_obj
     result = result_obj.model_dump()
     st.session_state["result"] = result
+    # Serialized once here (pydantic's native JSON encoder) instead of json.dumps on every rerun.
+    st.session_state["result_json"] = result_obj.model_dump_json(indent=2)
 
-    # Save audit log to /logs
-    save_run(result["run_id"], result)
+    # Queue the audit log for logs/runs.db; the background writer keeps disk I/O off the render path.
+    save_run_async(result["run_id"], result)
 
 # --------------------
 # RIGHT: OUTPUT (Render INSIDE right column)
 # --------------------
 with right:
-    st.subheader("2) Output")
-
     if "result" not in st.session_state:
         st.info("Run analysis to see results here.")
     else:
@@ -64,6 +205,14 @@ with right:
         m2.metric("Risk Level", data["summary"]["risk_level"])
         m3.metric("Findings", len(data["findings"]))
 
+        delta = st.session_state.get("delta")
+        if delta:
+            st.caption(
+                f'Re-analyzed {delta["clauses_rescanned"]} of {delta["clauses_total"]} clauses. '
+                f'Findings vs closest earlier run: +{delta["added"]} {delta["added_ids"]} / -{delta["removed"]} '
+                f'{delta["removed_ids"]}, {delta["changed"]} changed, {delta["unchanged"]} unchanged.'
+            )
+
         st.divider()
 
         # Tabs
@@ -76,13 +225,7 @@ with right:
                 st.warning("No findings returned.")
             else:
                 for f in data["findings"]:
-                    title = f'{f["finding_id"]} | {f["category"]} | {f["severity"]}'
-                    with st.expander(title, expanded=False):
-                        st.write("**Risk statement:**", f["risk_statement"])
-                        st.write("**Recommendation:**", f["recommendation"])
-                        if f.get("proposed_redline"):
-                            st.write("**Proposed redline:**", f["proposed_redline"])
-                        st.write("**Confidence:**", f["confidence"])
+                    _render_finding(f)
 
         with tab2:
             st.subheader("Evidence (No claim without clause snippet)")
@@ -123,10 +266,21 @@ with right:
             st.subheader("Audit Log")
             st.json(data.get("audit", []))
 
+            log_stats = get_run_writer().stats()
+            st.caption(
+                f'Run log queue: {log_stats["queue_depth"]}/{log_stats["queue_capacity"]} '
+                f'(peak {log_stats["max_queue_depth"]}), written {log_stats["written"]}'
+            )
+            if log_stats["blocked"] or log_stats["dropped"] or log_stats["errors"]:
+                st.warning(
+                    f'Run logging is falling behind: {log_stats["blocked"]} blocked, '
+                    f'{log_stats["dropped"]} dropped, {log_stats["errors"]} write errors.'
+                )
+
             st.subheader("Download JSON")
             st.download_button(
                 label="Download analysis.json",
-                data=json.dumps(data, indent=2),
+                data=st.session_state.get("result_json") or json.dumps(data, indent=2),
                 file_name="analysis.json",
                 mime="application/json",
             )
@@ -0,0 +1,60 @@
+from src.batch import analyze_contracts_batch
+
+
+def _items():
+    return [
+        ("Liability is uncapped.", "A", "paste"),
+        ("Either party may terminate for convenience.", "B", "upload"),
+        ("Neutral services agreement.", "C", "fax"),  # invalid source_type
+        ("Plain text.", "D", "paste"),
+    ]
+
+
+def test_batch_preserves_order_and_captures_errors():
+    out = list(analyze_contracts_batch(_items(), executor="thread", max_workers=2, max_in_flight=2))
+    assert [r.index for r in out] == [0, 1, 2, 3]
+    assert [r.ok for r in out] == [True, True, False, True]
+    assert "ValidationError" in out[2].error
+    assert out[1].result.contract.title == "B"
+
+
+def test_batch_reports_malformed_items_and_keeps_going():
+    items = [_items()[0], ("only text",), None, _items()[1]]
+    for ordered in (True, False):
+        out = analyze_contracts_batch(items, executor="thread", max_workers=2, ordered=ordered)
+        out = sorted(out, key=lambda r: r.index)
+        assert [r.ok for r in out] == [True, False, False, True]
+        assert out[1].error.startswith("Malformed item")
+        assert out[3].result.contract.title == "B"
+
+
+def test_batch_process_pool_unordered_streams_everything():
+    out = list(analyze_contracts_batch(iter(_items()), executor="process", max_workers=2, ordered=False))
+    assert sorted(r.index for r in out) == [0, 1, 2, 3]
+    assert sum(r.ok for r in out) == 3
+
+
+def test_batch_as_json_returns_serialized_results():
+    import json
+
+    out = list(analyze_contracts_batch(_items(), executor="thread", max_workers=2, as_json=True))
+    assert [r.ok for r in out] == [True, True, False, True]
+    payload = json.loads(out[0].result_json)
+    assert payload["contract"]["title"] == "A" and out[0].result is None
+
+
+def test_caller_executor_window_follows_max_workers():
+    from concurrent.futures import ThreadPoolExecutor
+
+    pulled = []
+
+    def items():
+        for i in range(20):
+            pulled.append(i)
+            yield ("Plain text.", str(i), "paste")
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        out = analyze_contracts_batch(items(), executor=pool, max_workers=1)
+        next(out)
+        assert len(pulled) <= 4
+        assert len(list(out)) == 19
@@ -0,0 +1,27 @@
+import json
+
+from benchmarks.bench_pipeline import BenchResult, compare
+from benchmarks.synthetic import generate_contract, parse_size
+from src.feature_extractor import extract_features
+
+
+def test_synthetic_contract_size_and_density():
+    assert parse_size("1KB") == 1024 and parse_size("100MB") == 100 * 1024 * 1024
+    text = generate_contract(parse_size("64KB"), density=0.5, seed=1)
+    assert len(text) == 64 * 1024
+    assert text == generate_contract(64 * 1024, density=0.5, seed=1)
+
+    values = {f.name: f.value for f in extract_features(text).features}
+    assert values["has_uncapped_liability"] and values["has_termination_for_convenience"]
+    clean = {f.name: f.value for f in extract_features(generate_contract(8192, density=0.0)).features}
+    assert not any(v for k, v in clean.items() if k.startswith("has_"))
+
+
+def test_compare_flags_only_real_regressions(tmp_path):
+    def r(case, p50):
+        return BenchResult(case, 1024, 10, p50, p50, p50, None, None)
+
+    baseline = tmp_path / "base.json"
+    baseline.write_text(json.dumps({"results": [r("a", 10.0).__dict__, r("b", 0.01).__dict__]}))
+    out = compare([r("a", 20.0), r("b", 0.03)], baseline, tolerance=0.25)
+    assert len(out) == 1 and out[0].startswith("a @")
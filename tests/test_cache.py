@@ -0,0 +1,69 @@
+from src.cache import AnalysisCache, LRUBytesCache
+from src.model_adapter import analyze_contract
+
+
+TEXT = "Vendor is liable for all damages including consequential damages.\nLiability is unlimited liability."
+
+
+def test_cache_hit_reuses_payload_with_fresh_run():
+    cache = AnalysisCache()
+    first = analyze_contract(TEXT, title="A", source_type="paste", cache=cache)
+    second = analyze_contract(TEXT.replace("\n", "\r\n"), title="B", source_type="upload", cache=cache)
+
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert second.findings == first.findings
+    assert second.scoring == first.scoring
+    assert second.contract.title == "B"
+    assert any(e.event == "CACHE_HIT" for e in second.audit)
+
+
+def test_cache_disk_tier_survives_new_instance(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    analyze_contract(TEXT, title="A", source_type="paste", cache=AnalysisCache(path=path))
+
+    cache = AnalysisCache(path=path)
+    analyze_contract(TEXT, title="A", source_type="paste", cache=cache)
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_disk_tier_upgrades_key_value_table(tmp_path):
+    import sqlite3
+
+    from src.cache import SQLiteBytesStore
+
+    path = tmp_path / "old.sqlite3"
+    conn = sqlite3.connect(str(path))
+    conn.execute("CREATE TABLE analysis_cache (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+    conn.execute("INSERT INTO analysis_cache VALUES ('k', x'0102')")
+    conn.commit()
+    conn.close()
+
+    store = SQLiteBytesStore(path, table="analysis_cache", max_bytes=3)
+    assert store.get("k") == b"\x01\x02" and store.size_bytes == 2
+    store.put("n", b"12")
+    assert store.get("k") is None and store.evictions == 1
+    store.close()
+
+
+def test_lru_evicts_by_size():
+    lru = LRUBytesCache(max_bytes=10)
+    lru.put("a", b"12345")
+    lru.put("b", b"12345")
+    lru.get("a")
+    lru.put("c", b"123")
+    assert lru.get("b") is None and lru.get("a") is not None
+    assert lru.evictions == 1
+
+
+def test_chunk_response_cache_ttl_and_clause_normalization(tmp_path):
+    from src.cache import ChunkResponseCache
+
+    key_a = ChunkResponseCache.key_for("p1", "m", "9.2 CONFIDENTIALITY\nKeep  it secret.")
+    key_b = ChunkResponseCache.key_for("p1", "m", "8.1 CONFIDENTIALITY\nKeep it secret.")
+    assert key_a == key_b
+    assert ChunkResponseCache.key_for("p2", "m", "Keep it secret.") != key_a
+
+    cache = ChunkResponseCache(path=tmp_path / "r.sqlite3", ttl_seconds=-1)
+    cache.put(key_a, '{"findings": []}')
+    assert cache.get(key_a) is None
+    assert cache.stats()["expirations"] == 2  # memory and disk tiers
@@ -0,0 +1,29 @@
+from src.clause_index import ClauseIndex, ClauseIndexBuilder
+from src.model_adapter import analyze_contract
+
+
+TEXT = open("sample_data/sample_contract_1.txt", encoding="utf-8").read()
+
+
+def test_segments_numbered_and_caps_headings():
+    idx = ClauseIndex.build(TEXT)
+    refs = [c.ref for c in idx.clauses]
+    assert refs == ["MASTER SERVICES AGREEMENT", "Section 9.2", "Section 12.1", "GOVERNING LAW"]
+    assert idx.locate(TEXT.index("Supplier shall be liable")).section_id == "9.2"
+    assert idx.locate(TEXT.index("Either party may")).heading == "TERMINATION"
+
+
+def test_streaming_builder_matches_build():
+    chunks = [TEXT[i:i + 11] for i in range(0, len(TEXT), 11)]
+    builder = ClauseIndexBuilder()
+    for c in chunks:
+        builder.feed(c)
+    assert builder.finish().clauses == ClauseIndex.build(TEXT).clauses
+
+
+def test_finding_evidence_points_into_document():
+    text = TEXT + "\n\n14.3 INDEMNITY CAP\nLiability under this Section is unlimited liability.\n"
+    result = analyze_contract(text, title="T", source_type="paste")
+    liability = next(f for f in result.findings if f.category == "Liability")
+    assert liability.evidence[0].clause_ref == "Section 14.3"
+    assert "unlimited liability" in liability.evidence[0].snippet
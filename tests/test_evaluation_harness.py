@@ -4,4 +4,43 @@ def test_eval_harness_loads_and_runs():
     cases = load_cases("sample_data/eval_cases.json")
     metrics = run_evaluation(cases)
     assert "risk_level_accuracy" in metrics
-    assert metrics["n"] > 0
\ No newline at end of file
+    assert metrics["n"] > 0
+
+def test_eval_store_only_reanalyzes_changed_cases(tmp_path):
+    from src.evaluation_stub import PredictionStore
+
+    cases = load_cases("sample_data/eval_cases.json")
+    store = PredictionStore(tmp_path / "preds.sqlite3")
+
+    first = run_evaluation(cases, store=store, workers=2)
+    assert first["recomputed"] == len(cases)
+
+    cases[0].text += " Indemnification applies."
+    second = run_evaluation(cases, store=store)
+    assert (second["recomputed"], second["reused"]) == (1, len(cases) - 1)
+    assert second["risk_level_accuracy"] == first["risk_level_accuracy"]
+    assert second["category_f1"] == first["category_f1"]
+
+def test_eval_cache_is_used_with_workers():
+    from src.cache import AnalysisCache
+
+    cases = load_cases("sample_data/eval_cases.json")
+    cache = AnalysisCache()
+
+    first = run_evaluation(cases, cache=cache, workers=2)
+    assert cache.stats()["memory_entries"] == len({c.text for c in cases})
+
+    second = run_evaluation(cases, cache=cache, workers=2)
+    assert cache.stats()["hits"] == len(cases)
+    assert second["risk_level_accuracy"] == first["risk_level_accuracy"]
+    assert second["category_f1"] == first["category_f1"]
+
+def test_eval_scores_with_the_pipeline_profile():
+    from src.evaluation_stub import EvalCase
+    from src.model_adapter import analyze_contract
+
+    text = "Liability under this Agreement is unlimited liability. Either party may terminate for convenience."
+    expected = analyze_contract(text, "T", "paste", scoring_profile="conservative").summary.risk_level
+    cases = [EvalCase(id="c1", title="T", text=text, expected_risk_level=expected, expected_categories=[])]
+    assert run_evaluation(cases)["risk_level_accuracy"] == 0.0
+    assert run_evaluation(cases, scoring_profile="conservative")["risk_level_accuracy"] == 1.0
@@ -0,0 +1,111 @@
+import io
+import threading
+import time
+import zipfile
+
+import pytest
+
+from src.extract import (
+    DocumentExtractor,
+    ExtractionCache,
+    ExtractionError,
+    ExtractionTimeout,
+    analyze_document,
+    extract_bytes,
+)
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def _docx(paragraphs):
+    body = "".join(
+        '<w:p><w:r><w:br w:type="page"/></w:r></w:p>' if p is None else f"<w:p><w:r><w:t>{p}</w:t></w:r></w:p>"
+        for p in paragraphs
+    )
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("word/document.xml", f"<w:document {W}><w:body>{body}</w:body></w:document>")
+    return buf.getvalue()
+
+
+def _hanging_extract(name, data):
+    # Runs in a pool worker: stands in for a parser stuck on a pathological file.
+    if name.startswith("stuck"):
+        time.sleep(600)
+    if name.startswith("slow"):
+        time.sleep(2)
+    return extract_bytes(name, data)
+
+
+CONTRACT = _docx(
+    [
+        "1. SERVICES",
+        "The Supplier shall provide the Services.",
+        None,
+        "9.2 LIMITATION OF LIABILITY",
+        "Supplier accepts unlimited liability for data loss.",
+    ]
+)
+
+
+def test_docx_pages_and_paragraphs():
+    doc = extract_bytes("msa.docx", CONTRACT)
+    assert doc.kind == "docx"
+    assert doc.text.splitlines()[2] == "9.2 LIMITATION OF LIABILITY"
+    assert len(doc.pages) == 2 and len(doc.paragraph_starts) == 4
+    assert doc.page_at(doc.text.index("unlimited")) == 2
+    assert doc.page_at(0) == 1
+
+
+def test_page_numbers_reach_evidence():
+    result = analyze_document(extract_bytes("msa.docx", CONTRACT), title="MSA")
+    refs = [e.clause_ref for f in result.findings if f.category == "Liability" for e in f.evidence]
+    assert refs == ["Section 9.2 (p. 2)"]
+
+
+def test_plain_text_and_bad_files():
+    doc = extract_bytes("a.txt", b"page one\fpage two")
+    assert doc.kind == "txt" and doc.page_at(doc.text.index("two")) == 2
+    assert extract_bytes("b.txt", b"no pages").page_starts is None
+    with pytest.raises(ExtractionError):
+        extract_bytes("fake.pdf", b"not a pdf")
+
+
+def test_pool_caches_by_hash_and_times_out(tmp_path):
+    cache = ExtractionCache(path=tmp_path / "extract.db")
+    with DocumentExtractor(workers=1, timeout=60, cache=cache) as ex:
+        results = list(ex.extract_many([("a.docx", CONTRACT), ("bad.docx", b"PK\x03\x04junk"), ("b.docx", CONTRACT)]))
+        assert [r.ok for r in results] == [True, False, True]
+        assert [r.cached for r in results] == [False, False, True]
+        assert results[2].document == results[0].document
+
+
+def test_stuck_extraction_times_out_without_losing_other_documents():
+    other = _docx(["7. TERM", "Either party may terminate for convenience."])
+    with DocumentExtractor(workers=2, timeout=5, extract_fn=_hanging_extract) as ex:
+        results = list(ex.extract_many([("a.docx", CONTRACT), ("stuck.docx", b"PK"), ("b.docx", other)]))
+        assert [r.ok for r in results] == [True, False, True]
+        assert results[1].timed_out and ex.timeouts == 1
+        assert results[2].document.text.startswith("7. TERM")
+
+        with pytest.raises(ExtractionTimeout):
+            ex.extract("stuck2.docx", b"PK")
+        assert ex.extract("a.docx", CONTRACT).kind == "docx"  # cached; the restarted pool is not needed
+
+
+def test_shared_extractor_timeout_does_not_fail_other_callers():
+    with DocumentExtractor(workers=2, timeout=4, extract_fn=_hanging_extract) as ex:
+        outcome = {}
+
+        def stuck():
+            outcome["stuck"] = next(ex.extract_many([("stuck.docx", b"PK")]))
+
+        thread = threading.Thread(target=stuck)
+        thread.start()
+        time.sleep(2.5)  # the slow job is still running when the stuck one's pool is terminated
+        slow = next(ex.extract_many([("slow.docx", CONTRACT)]))
+        thread.join()
+
+        assert outcome["stuck"].timed_out
+        assert slow.ok and not slow.timed_out
+        assert ex.timeouts == 1
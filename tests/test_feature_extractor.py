@@ -13,4 +13,42 @@ def test_extract_features_detects_flags():
     fs = extract_features(text)
     d = {f.name: f.value for f in fs.features}
     assert d["has_consequential_damages"] is True
-    assert d["has_uncapped_liability"] is True
\ No newline at end of file
+    assert d["has_uncapped_liability"] is True
+
+def test_single_pass_scan_matches_per_pattern_search():
+    import re
+
+    from src.feature_extractor import SIGNALS, scan_signals
+
+    text = open("sample_data/sample_contract_1.txt", encoding="utf-8").read() + (
+        "\nUnlimited liability applies. Indemnification survives. "
+        "Either party may terminate for convenience; 30 days to cure. Auto-renewal: automatic renewal."
+    )
+    hits = scan_signals(text)
+    for s in SIGNALS:
+        expected = [(m.start(), m.end()) for m in re.finditer(s.pattern, text, re.IGNORECASE | re.MULTILINE)]
+        assert [(h.start, h.end) for h in hits[s.name]] == expected
+
+
+def test_registry_reports_signals_sharing_a_start_offset():
+    from src.feature_extractor import PatternRegistry, Signal
+
+    reg = PatternRegistry(
+        [Signal("a", r"limit", ("limit",)), Signal("b", r"limitation of liability", ("liability",))]
+    )
+    hits = reg.scan("9.2 LIMITATION OF LIABILITY")
+    assert [(h.start, h.end) for h in hits["a"]] == [(4, 9)]
+    assert [(h.start, h.end) for h in hits["b"]] == [(4, 27)]
+
+
+def test_streaming_extraction_matches_whole_text_across_chunk_boundaries():
+    from src.feature_extractor import extract_features_stream, scan_signals, scan_signals_stream
+
+    text = ("Filler clause text. " * 200 + "Liability is unlimited\nliability; 30 days to cure. ") * 20
+    size = 37  # forces matches to straddle chunk boundaries
+    chunks = [text[i:i + size] for i in range(0, len(text), size)]
+
+    hits, n = scan_signals_stream(chunks)
+    assert n == len(text)
+    assert hits == scan_signals(text)
+    assert extract_features_stream(chunks) == extract_features(text)
@@ -0,0 +1,35 @@
+import numpy as np
+
+from src.feature_extractor import extract_features
+from src.feature_matrix import FeatureMatrixWriter, export_feature_matrix, read_feature_matrix
+
+
+DOCS = [
+    ("a", "Liability is unlimited liability."),
+    ("b", "Either party may terminate for convenience."),
+    ("c", "Plain services text."),
+]
+
+
+def test_matrix_matches_featureset_and_appends(tmp_path):
+    out = tmp_path / "matrix"
+    assert export_feature_matrix(DOCS[:2], out, shard_rows=1) == 2
+    export_feature_matrix(DOCS[2:], out)  # reopen and append
+
+    m = read_feature_matrix(out)
+    assert list(m["doc_id"]) == ["a", "b", "c"]
+    assert m["has_uncapped_liability"].dtype == np.bool_
+    assert m["text_length"].dtype == np.int64
+
+    for i, (_, text) in enumerate(DOCS):
+        for f in extract_features(text).features:
+            assert m[f.name][i] == f.value
+
+
+def test_writer_rejects_schema_mismatch(tmp_path):
+    import pytest
+
+    with FeatureMatrixWriter(tmp_path, schema=[("x", "int")]) as w:
+        w.add("d", [1])
+    with pytest.raises(ValueError):
+        FeatureMatrixWriter(tmp_path)
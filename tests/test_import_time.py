@@ -0,0 +1,31 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Import-time budgets are wall-clock and live in benchmarks/bench_import.py; only deterministic checks run here.
+LAZY_DEPENDENCIES = ("numpy", "pyarrow", "openai", "httpx", "yaml")
+
+
+def _run(code: str, cwd: Path) -> str:
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=cwd,
+        env={"PYTHONPATH": str(ROOT)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return proc.stdout
+
+
+def test_heavy_dependencies_stay_lazy():
+    for module in ("src.model_adapter", "src.batch", "src.logger", "app.contract_analyzer"):
+        out = _run(f"import sys, {module}; print(' '.join(m.split('.')[0] for m in sys.modules))", ROOT)
+        assert not set(out.split()) & set(LAZY_DEPENDENCIES), module
+
+
+def test_importing_logger_creates_no_directories(tmp_path):
+    _run("import src.logger, src.model_adapter", tmp_path)
+    assert list(tmp_path.iterdir()) == []
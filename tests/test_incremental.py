@@ -0,0 +1,42 @@
+from src.incremental import ClauseHitCache, analyze_incremental
+from src.model_adapter import analyze_contract
+
+V1 = (
+    "MASTER SERVICES AGREEMENT\n\n"
+    "1. SERVICES\nThe Supplier shall provide the Services.\n\n"
+    "9.2 LIMITATION OF LIABILITY\nSupplier accepts unlimited liability for data loss.\n\n"
+    "12.1 TERMINATION\nEither party may terminate for convenience on notice.\n"
+)
+V2 = V1.replace("unlimited liability", "liability capped at fees paid")
+
+
+def _comparable(result):
+    return [(f.finding_id, f.evidence) for f in result.findings], result.features, result.summary
+
+
+def test_matches_full_analysis_and_rescans_only_edits():
+    cache = ClauseHitCache()
+    first = analyze_incremental(V1, "MSA", "paste", cache=cache)
+    assert first.clauses_rescanned == first.clauses_total == 4
+    assert _comparable(first.result) == _comparable(analyze_contract(V1, "MSA", "paste"))
+
+    second = analyze_incremental(V2, "MSA", "paste", previous=first.result, cache=cache)
+    assert second.clauses_rescanned == 1
+    assert _comparable(second.result) == _comparable(analyze_contract(V2, "MSA", "paste"))
+
+    assert [f.category for f in second.delta.removed] == ["Liability"]
+    assert second.delta.added == [] and second.delta.unchanged == 1
+    details = next(e.details for e in second.result.audit if e.event == "FINDINGS_GENERATED")
+    assert details["previous_run_id"] == first.result.run_id
+    assert details["delta"]["removed"] == 1
+
+
+def test_moved_clause_is_not_rescanned():
+    cache = ClauseHitCache()
+    analyze_incremental(V1, "MSA", "paste", cache=cache)
+    head, rest = V1.split("1. SERVICES", 1)
+    services, tail = rest.split("9.2", 1)
+    reordered = head + "9.2" + tail + "\n1. SERVICES" + services
+    out = analyze_incremental(reordered, "MSA", "paste", cache=cache)
+    # Only clauses whose exact text changed (trailing newline moves) are rescanned.
+    assert out.clauses_rescanned < out.clauses_total
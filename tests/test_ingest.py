@@ -0,0 +1,22 @@
+import io
+
+from src.ingest import iter_text_chunks
+from src.model_adapter import analyze_contract, analyze_contract_stream
+
+
+def test_chunked_decode_keeps_multibyte_chars_intact():
+    text = "Café — liability is unlimited liability. " * 50
+    chunks = list(iter_text_chunks(io.BytesIO(text.encode("utf-8")), chunk_bytes=7))
+    assert "".join(chunks) == text
+
+
+def test_stream_analysis_matches_in_memory_analysis(tmp_path):
+    text = open("sample_data/sample_contract_1.txt", encoding="utf-8").read() + "\nLiability is uncapped liability.\n"
+    path = tmp_path / "contract.txt"
+    path.write_text(text, encoding="utf-8")
+
+    streamed = analyze_contract_stream(iter_text_chunks(path, chunk_bytes=16), title="T", source_type="upload")
+    direct = analyze_contract(text, title="T", source_type="upload")
+    assert streamed.contract.text_length == len(text)
+    assert streamed.features == direct.features
+    assert streamed.findings == direct.findings
@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from src.cache import AnalysisCache
+from src.model_adapter import analyze_contract, analyze_contract_stream, iter_analysis
+from src.rule_engine import default_engine
+
+TEXT = (
+    "1. Liability. Supplier's liability is unlimited, including consequential damages.\n"
+    "2. Term. This agreement renews automatically unless terminated for convenience.\n"
+    "3. Confidentiality. Each party keeps the other's information confidential.\n"
+)
+
+
+def _comparable(result):
+    d = result.model_dump()
+    d.pop("run_id")
+    d.pop("audit")
+    return d
+
+
+def test_updates_arrive_in_stage_order_and_end_with_full_result():
+    updates = list(iter_analysis(TEXT, title="T", source_type="paste"))
+    stages = [u.stage for u in updates]
+
+    assert stages[0] == "features"
+    assert stages[-2:] == ["scoring", "result"]
+    assert set(stages[1:-2]) == {"finding"}
+
+    result = updates[-1].result
+    assert [u.finding for u in updates if u.stage == "finding"] == result.findings
+    assert updates[0].features == result.features
+    assert updates[-2].scoring == result.scoring and updates[-2].summary == result.summary
+    assert _comparable(result) == _comparable(analyze_contract(TEXT, title="T", source_type="paste"))
+
+
+def test_chunked_input_matches_stream_analysis():
+    chunks = [TEXT[:50], TEXT[50:140], TEXT[140:]]
+    result = list(iter_analysis(iter(chunks), title="T", source_type="upload", page_starts=[0, 140]))[-1].result
+    expected = analyze_contract_stream(iter(chunks), title="T", source_type="upload", page_starts=[0, 140])
+
+    assert _comparable(result) == _comparable(expected)
+    assert any("(p. " in e.clause_ref for f in result.findings for e in f.evidence)
+
+
+def test_consumer_time_is_not_counted_as_analysis_time():
+    t0 = time.perf_counter()
+    for update in iter_analysis(TEXT, title="T", source_type="paste"):
+        time.sleep(0.05)
+    elapsed_ms = (time.perf_counter() - t0) * 1000.0
+    total_ms = update.result.audit[-1].details["total_ms"]
+
+    assert elapsed_ms >= 200
+    assert total_ms < elapsed_ms - 150
+
+
+def test_cache_hit_replays_updates():
+    cache = AnalysisCache()
+    first = list(iter_analysis(TEXT, title="T", source_type="paste", cache=cache))
+    second = list(iter_analysis(TEXT, title="T", source_type="paste", cache=cache))
+
+    assert [u.stage for u in second] == [u.stage for u in first]
+    assert second[-1].result.audit[1].event == "CACHE_HIT"
+    assert _comparable(second[-1].result) == _comparable(first[-1].result)
+
+
+def test_bad_arguments_fail_before_iteration():
+    with pytest.raises(LookupError):
+        iter_analysis(TEXT, title="T", source_type="paste", scoring_profile="no-such-profile")
+    with pytest.raises(ValueError):
+        iter_analysis(iter([TEXT]), title="T", source_type="upload", cache=AnalysisCache())
+
+
+def test_rule_findings_are_produced_lazily_in_order():
+    features = list(iter_analysis(TEXT, title="T", source_type="paste"))[0].features
+    ruleset = default_engine().ruleset()
+
+    lazy = ruleset.iter_findings(features)
+    first = next(lazy)
+    assert [first, *lazy] == ruleset.evaluate(features)
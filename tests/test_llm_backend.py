@@ -0,0 +1,123 @@
+from src.llm_backend import LLMRiskModel
+from src.llm_stub_server import StubLLMServer
+
+
+TEXT = (
+    open("sample_data/sample_contract_1.txt", encoding="utf-8").read()
+    + "\n\n13.1 CAP\nLiability under this Agreement is unlimited liability.\n"
+    + "\n14.1 CONVENIENCE\nEither party may terminate for convenience on notice.\n"
+)
+
+
+def test_llm_backend_round_trip_against_stub():
+    with StubLLMServer() as server:
+        model = LLMRiskModel(base_url=server.url, api_key="", max_chunk_chars=80, max_concurrency=2)
+        result = model.analyze_contract(TEXT, title="T", source_type="paste")
+
+    assert {f.category for f in result.findings} == {"Liability", "Termination"}
+    refs = {f.category: f.evidence[0].clause_ref for f in result.findings}
+    assert refs == {"Liability": "Section 13.1", "Termination": "Section 14.1"}
+    details = next(e.details for e in result.audit if e.event == "FINDINGS_GENERATED")
+    assert details["chunks"] > 2
+    assert server.max_in_flight <= 2
+
+
+def test_llm_backend_retries_transient_failures():
+    with StubLLMServer(fail_first=2) as server:
+        model = LLMRiskModel(base_url=server.url, api_key="", backoff_base=0.01, max_chunk_chars=100_000)
+        result = model.analyze_contract(TEXT, title="T", source_type="paste")
+
+    details = next(e.details for e in result.audit if e.event == "FINDINGS_GENERATED")
+    assert details["retries"] == 2 and details["requests"] == 3
+    assert result.findings
+
+
+def test_response_cache_dedupes_shared_boilerplate_clauses(tmp_path):
+    from src.cache import ChunkResponseCache
+
+    boilerplate = "CONFIDENTIALITY\nEach party shall keep the other party's information confidential.\n"
+    vendor_a = "1.1 LIABILITY\nLiability is unlimited liability.\n\n" + boilerplate
+    vendor_b = "7.4 TERM\nEither party may terminate for convenience.\n\n" + boilerplate.replace(" shall", "  shall")
+
+    cache = ChunkResponseCache(path=tmp_path / "responses.sqlite3")
+    with StubLLMServer() as server:
+        model = LLMRiskModel(base_url=server.url, api_key="", pack_clauses=False, response_cache=cache)
+        model.analyze_contract(vendor_a, title="A", source_type="paste")
+        result = model.analyze_contract(vendor_b, title="B", source_type="paste")
+
+    assert server.requests == 3  # the whitespace-variant boilerplate clause was not resent
+    assert cache.stats()["hits"] == 1
+    assert next(e.details for e in result.audit if e.event == "FINDINGS_GENERATED")["cache_hits"] == 1
+    assert [f.evidence[0].clause_ref for f in result.findings] == ["Section 7.4"]
+
+
+def test_response_cache_skips_unparseable_replies(tmp_path):
+    from src.cache import ChunkResponseCache
+    from src.llm_stub_server import MockChatModel
+
+    async def refuse(request):
+        return {"choices": [{"message": {"content": "I can't help with that."}}]}
+
+    cache = ChunkResponseCache(path=tmp_path / "responses.sqlite3")
+    refused = LLMRiskModel(api_key="", pack_clauses=False, response_cache=cache, transport=refuse)
+    audit = refused.analyze_contract(TEXT, "T", "paste").audit
+    details = next(e.details for e in audit if e.event == "FINDINGS_GENERATED")
+    assert details["rejected_items"] == details["chunks"]
+
+    mock = MockChatModel()
+    model = LLMRiskModel(api_key="", pack_clauses=False, response_cache=cache, transport=mock)
+    result = model.analyze_contract(TEXT, "T", "paste")
+    assert mock.requests == details["chunks"] and cache.stats()["hits"] == 0
+    assert {f.category for f in result.findings} == {"Liability", "Termination"}
+
+
+def test_map_reduce_long_document_offline():
+    from src.synthetic import generate_contract
+    from src.clause_index import ClauseIndex
+    from src.llm_backend import chunk_by_tokens, estimate_tokens
+    from src.llm_stub_server import MockChatModel
+
+    text = generate_contract(300_000, density=0.2, seed=3)
+    mock = MockChatModel(latency_ms=5)
+    model = LLMRiskModel(api_key="", context_tokens=3000, max_output_tokens=500, transport=mock, max_concurrency=4)
+    result = model.analyze_contract(text, title="Long MSA", source_type="upload")
+
+    budget = model.max_chunk_tokens
+    chunks = chunk_by_tokens(text, ClauseIndex.build(text), budget)
+    assert all(estimate_tokens(c.text) <= budget for c in chunks)
+    assert "".join(c.text for c in chunks).split() == text.split()
+
+    details = next(e.details for e in result.audit if e.event == "FINDINGS_GENERATED")
+    assert details["chunks"] == len(chunks) == mock.requests > 10
+    assert 1 < mock.max_in_flight <= 4
+    # Each issue is reported by many chunks but appears once, with all its quotes.
+    assert details["findings_reported"] > len(result.findings)
+    keys = [(f.category, f.risk_statement) for f in result.findings]
+    assert len(keys) == len(set(keys))
+    assert max(len(f.evidence) for f in result.findings) > 1
+    assert result.scoring.items and len(result.scoring.items) == len(result.findings)
+
+
+def test_merge_findings_reconciles_reports():
+    from src.llm_backend import merge_findings
+    from src.schemas import Evidence, Finding
+
+    def report(severity, confidence, ref, statement="Liability is uncapped."):
+        return Finding(
+            finding_id="L-000",
+            category="Liability",
+            risk_statement=statement,
+            severity=severity,
+            confidence=confidence,
+            evidence=[Evidence(clause_ref=ref, snippet="unlimited liability")],
+            recommendation=f"from {ref}",
+        )
+
+    merged = merge_findings(
+        [report("Medium", 0.9, "Section 1"), report("High", 0.6, "Section 9"), report("High", 0.6, "Section 9"),
+         report("Low", 0.5, "Section 2", statement="liability is UNCAPPED"), report("Low", 0.5, "Section 3", "Other")]
+    )
+    assert len(merged) == 2
+    first = merged[0]
+    assert (first.severity, first.confidence, first.recommendation) == ("High", 0.9, "from Section 1")
+    assert [e.clause_ref for e in first.evidence] == ["Section 1", "Section 9", "Section 2"]
@@ -0,0 +1,55 @@
+import threading
+
+from src.logger import BackgroundRunWriter
+from src.run_store import RunStore
+
+
+def test_background_writer_batches_and_drains_on_close(tmp_path):
+    store = RunStore(tmp_path / "runs.db", batch_size=1)
+    writer = BackgroundRunWriter(store, batch_size=16)
+    for i in range(50):
+        assert writer.submit(f"r{i}", {"run_id": f"r{i}", "summary": {"risk_level": "Low"}})
+    writer.close()
+
+    stats = writer.stats()
+    assert stats["written"] == 50 and stats["dropped"] == 0
+    assert store.count(risk_level="Low") == 50
+    store.close()
+
+
+class _SlowStore:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def append_many(self, batch):
+        self.release.wait(5)
+
+    def flush(self):
+        pass
+
+
+def test_full_queue_reports_backpressure():
+    store = _SlowStore()
+    writer = BackgroundRunWriter(store, max_queue=2, batch_size=1, put_timeout=0.01)
+    results = [writer.submit(f"r{i}", {}) for i in range(6)]
+    store.release.set()
+    writer.close()
+
+    stats = writer.stats()
+    assert results.count(False) == stats["dropped"] > 0
+    assert stats["blocked"] >= stats["dropped"]
+    assert stats["written"] == stats["submitted"]
+
+
+def test_unstorable_run_does_not_lose_its_batch(tmp_path):
+    store = RunStore(tmp_path / "runs.db", batch_size=100)
+    writer = BackgroundRunWriter(store)
+    runs = [(f"r{i}", {"run_id": f"r{i}", "summary": {"risk_level": "Low"}}) for i in range(5)]
+    runs[2] = ("bad", {"run_id": "bad", "blob": object()})
+    writer._write(runs)  # one batch, as the writer thread would drain it
+    writer.close()
+
+    stats = writer.stats()
+    assert (stats["written"], stats["errors"]) == (4, 1)
+    assert store.count(risk_level="Low") == 4
+    store.close()
@@ -0,0 +1,59 @@
+from src.metrics import REGISTRY, STAGE_SECONDS, Histogram, disable_profiling, enable_profiling
+from src.model_adapter import analyze_contract
+
+TEXT = "9.2 LIMITATION OF LIABILITY\nLiability is unlimited liability.\n"
+
+
+def test_audit_events_carry_stage_durations():
+    before = STAGE_SECONDS.count(stage="scoring")
+    result = analyze_contract(TEXT, title="t", source_type="paste")
+    events = {e.event: e for e in result.audit}
+
+    for name in ("FEATURES_EXTRACTED", "FINDINGS_GENERATED", "SCORING_COMPLETED"):
+        assert events[name].details["duration_ms"] >= 0
+    stages = events["ANALYSIS_COMPLETED"].details["stages_ms"]
+    assert {"feature_extraction", "evidence_resolution", "finding_generation", "scoring", "schema_construction"} <= set(stages)
+    assert events["FINDINGS_GENERATED"].details["ruleset"]
+    assert STAGE_SECONDS.count(stage="scoring") == before + 1
+    assert 'contract_analyses_total{path="rules"}' in REGISTRY.render()
+
+
+def test_histogram_exposition_is_cumulative():
+    h = Histogram("x_seconds", "x", ("stage",), buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 5.0):
+        h.observe(v, stage="a")
+    lines = h.render()
+    assert 'x_seconds_bucket{stage="a",le="0.1"} 1' in lines
+    assert 'x_seconds_bucket{stage="a",le="1.0"} 2' in lines
+    assert 'x_seconds_bucket{stage="a",le="+Inf"} 3' in lines
+    assert 'x_seconds_count{stage="a"} 3' in lines
+
+
+def test_slow_runs_dump_a_profile(tmp_path):
+    enable_profiling(threshold_ms=0, out_dir=tmp_path, memory=True)
+    try:
+        result = analyze_contract(TEXT, title="t", source_type="paste")
+    finally:
+        disable_profiling()
+    dumps = list(tmp_path.glob(f"{result.run_id}_*ms.prof"))
+    assert len(dumps) == 1
+    assert list(tmp_path.glob("*.mem.txt"))
+
+
+def test_concurrent_analyses_are_profiled_one_at_a_time(tmp_path):
+    import threading
+
+    from src.metrics import profiled
+
+    enable_profiling(threshold_ms=0, out_dir=tmp_path)
+    results = []
+    try:
+        with profiled() as outer:
+            outer.label = "outer"
+            worker = threading.Thread(target=lambda: results.append(analyze_contract(TEXT, "t", "paste")))
+            worker.start()
+            worker.join()
+    finally:
+        disable_profiling()
+    assert len(results) == 1
+    assert [p.name.split("_")[0] for p in tmp_path.glob("*.prof")] == ["outer"]
@@ -0,0 +1,78 @@
+from src.synthetic import generate_contract
+from src.incremental import ClauseHitCache
+from src.near_duplicates import NearDuplicateIndex, analyze_with_reuse
+from src.run_store import RunStore
+
+BASE = generate_contract(20_000, density=0.3, seed=7)
+
+
+def _edit(text: str, n: int) -> str:
+    paras = text.split("\n\n")
+    for i in range(1, n + 1):
+        paras[i * 7 % len(paras)] += " Amended by the parties."
+    return "\n\n".join(paras)
+
+
+def test_query_finds_near_copy_not_unrelated(tmp_path):
+    index = NearDuplicateIndex(tmp_path / "nd.db")
+    index.add("vendor_paper", BASE, run_id="r1")
+    index.add("other", generate_contract(20_000, density=0.3, seed=99), run_id="r2")
+
+    match = index.nearest(_edit(BASE, 3))
+    assert match is not None and match.doc_id == "vendor_paper" and match.run_id == "r1"
+    assert match.similarity > 0.8
+    assert index.nearest("An entirely different short letter about lunch plans.") is None
+
+
+def test_persists_and_clusters(tmp_path):
+    path = tmp_path / "nd.db"
+    index = NearDuplicateIndex(path)
+    index.add("a", BASE)
+    index.add("b", _edit(BASE, 2))
+    index.close()
+
+    index = NearDuplicateIndex(path)
+    index.add("c", _edit(BASE, 4))
+    index.add("lone", generate_contract(20_000, density=0.3, seed=5))
+    families = index.clusters()
+    assert [[m.doc_id for m in fam] for fam in families] == [["a", "b", "c"]]
+    assert len(index) == 4
+
+
+def test_analyze_with_reuse_diffs_against_closest_run(tmp_path):
+    index = NearDuplicateIndex(tmp_path / "nd.db")
+    cache = ClauseHitCache()
+    with RunStore(tmp_path / "runs.db") as runs:
+        first = analyze_with_reuse(BASE, "Vendor MSA", "paste", index, runs.get, cache)
+        assert first.match is None
+        runs.append(first.analysis.result.run_id, first.analysis.result.model_dump(mode="json"))
+
+        second = analyze_with_reuse(_edit(BASE, 1), "Vendor MSA v2", "paste", index, runs.get, cache)
+    assert second.match.run_id == first.analysis.result.run_id
+    assert second.analysis.clauses_rescanned == 1
+    assert second.analysis.delta.added == [] and second.analysis.delta.removed == []
+    assert len(index) == 2
+
+
+def test_reuse_survives_restart_without_clause_cache(tmp_path):
+    path = tmp_path / "nd.db"
+    index = NearDuplicateIndex(path)
+    first = analyze_with_reuse(BASE, "Vendor MSA", "paste", index, lambda run_id: None)
+    index.close()
+
+    index = NearDuplicateIndex(path)
+    second = analyze_with_reuse(_edit(BASE, 1), "Vendor MSA v2", "paste", index, lambda run_id: None)
+    assert second.match.run_id == first.analysis.result.run_id
+    assert second.analysis.clauses_rescanned == 1
+    assert second.analysis.result.summary == analyze_with_reuse(
+        _edit(BASE, 1), "Vendor MSA v2", "paste", NearDuplicateIndex(tmp_path / "fresh.db"), lambda run_id: None
+    ).analysis.result.summary
+
+
+def test_texts_without_words_match_nothing(tmp_path):
+    index = NearDuplicateIndex(tmp_path / "nd.db")
+    index.add("blank", "")
+    index.add("dashes", "--- ... ---")
+    index.add("contract", BASE)
+    assert index.query("") == [] and index.nearest("  ---  ") is None
+    assert index.clusters() == []
@@ -0,0 +1,61 @@
+import random
+
+from src.portfolio_scoring import FindingColumns, breakdown_for_run, score_grid, score_portfolio
+from src.schemas import Evidence, Finding, SeverityWeights
+from src.scoring import DEFAULT_WEIGHTS, ScoringProfile, compute_score, get_profile
+
+
+def _runs(n=200, seed=7):
+    rng = random.Random(seed)
+    runs = []
+    for r in range(n):
+        findings = [
+            Finding(
+                finding_id=f"R-{r}-{i}",
+                category="Test",
+                risk_statement="x",
+                severity=rng.choice(["Low", "Medium", "High", "Critical"]),
+                confidence=round(rng.random(), 2),
+                evidence=[Evidence(clause_ref="X", snippet="Y")],
+                recommendation="Z",
+            )
+            for i in range(rng.randint(0, 6))
+        ]
+        runs.append({"run_id": f"run-{r}", "findings": [f.model_dump() for f in findings]})
+    return runs
+
+
+def test_vectorized_scores_match_compute_score():
+    runs = _runs()
+    cols = FindingColumns.from_results(runs)
+    scored = score_portfolio(cols)
+
+    for r, run in enumerate(runs):
+        score, breakdown = compute_score([Finding.model_validate(f) for f in run["findings"]])
+        assert scored.scores[r] == score
+        assert scored.risk_levels()[r] == breakdown.risk_level
+        assert breakdown_for_run(cols, r) == breakdown
+
+
+def test_weight_grid_scores_every_candidate():
+    cols = FindingColumns.from_results(_runs(50))
+    grid = [DEFAULT_WEIGHTS, SeverityWeights(Low=0, Medium=10, High=40, Critical=80)]
+    scores, codes, levels = score_grid(cols, grid)
+
+    assert scores.shape == (2, 50) and codes.shape == (2, 50)
+    for k, w in enumerate(grid):
+        single = score_portfolio(cols, ScoringProfile("candidate", w))
+        assert abs(scores[k] - single.scores).max() <= 1
+
+
+def test_portfolio_scores_follow_the_scoring_profile():
+    runs = _runs(50)
+    cols = FindingColumns.from_results(runs)
+    profile = get_profile("conservative")
+    scored = score_portfolio(cols, "conservative")
+
+    for r, run in enumerate(runs):
+        score, breakdown = compute_score([Finding.model_validate(f) for f in run["findings"]], profile=profile)
+        assert (scored.scores[r], scored.risk_levels()[r]) == (score, breakdown.risk_level)
+        assert breakdown_for_run(cols, r, profile) == breakdown
+        assert breakdown.profile == "conservative"
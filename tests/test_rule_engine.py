@@ -0,0 +1,46 @@
+import json
+import os
+
+from src.rule_engine import DEFAULT_RULES_PATH, RuleEngine
+from src.schemas import Feature, FeatureSet
+
+
+def _features(**values):
+    return FeatureSet(features=[Feature(name=k, value=v, dtype="bool") for k, v in values.items()])
+
+
+def _rule(rule_id, when, severity="High"):
+    return {
+        "id": rule_id,
+        "when": when,
+        "finding": {"category": "C", "risk_statement": rule_id, "severity": severity, "confidence": 0.5, "recommendation": "r"},
+        "evidence": {"fallback": {"clause_ref": "N/A", "snippet": "-"}},
+    }
+
+
+def test_default_rules_reproduce_demo_findings():
+    rules = RuleEngine(DEFAULT_RULES_PATH).ruleset()
+    ids = lambda **v: [f.finding_id for f in rules.evaluate(_features(**v))]  # noqa: E731
+    assert ids(has_consequential_damages=True) == ["R-001"]
+    assert ids(has_uncapped_liability=True, has_termination_for_convenience=True) == ["R-001", "R-002"]
+    assert ids(has_termination_for_convenience=True, has_cure_period=True) == ["R-000"]
+    assert rules.version.startswith("demo_rules_v2@")
+
+
+def test_comparisons_and_hot_reload(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"rules": [_rule("X-1", {"compare": [{"feature": "n", "op": ">=", "value": 3}]})]}))
+    engine = RuleEngine(path, check_interval=0)
+    fs = FeatureSet(features=[Feature(name="n", value=5, dtype="int")])
+    assert [f.finding_id for f in engine.ruleset().evaluate(fs)] == ["X-1"]
+    v1 = engine.ruleset().version
+
+    path.write_text(json.dumps({"rules": [_rule("X-2", {"all": ["flag"]})]}))
+    os.utime(path, ns=(1, 1))  # distinct mtime even on coarse filesystems
+    assert [f.finding_id for f in engine.ruleset().evaluate(_features(flag=True))] == ["X-2"]
+    assert engine.reloads == 1 and engine.ruleset().version != v1
+
+    path.write_text("{not json")
+    os.utime(path, ns=(2, 2))
+    assert engine.ruleset().rules[0].rule_id == "X-2"  # previous rules kept
+    assert engine.last_error
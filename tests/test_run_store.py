@@ -0,0 +1,93 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from src.model_adapter import analyze_contract
+from src.run_store import RunStore, import_json_logs
+
+
+def _run(text):
+    return analyze_contract(text, title="t", source_type="paste").model_dump()
+
+
+def test_query_by_index_and_roundtrip(tmp_path):
+    risky = _run("Liability is unlimited liability. Either party may terminate for convenience.")
+    clean = _run("Plain services text.")
+
+    with RunStore(tmp_path / "runs.db", compress=True, batch_size=10) as store:
+        store.append(risky["run_id"], risky)
+        store.append(clean["run_id"], clean)
+        store.append(clean["run_id"], clean)  # append-only: duplicates ignored
+
+        assert store.get(risky["run_id"]) == risky
+        assert store.count() == 2
+        assert [r["run_id"] for r in store.query(category="Liability")] == [risky["run_id"]]
+        level = clean["summary"]["risk_level"]
+        assert clean["run_id"] in {r["run_id"] for r in store.query(risk_level=level)}
+        day = risky["audit"][0]["ts"][:10]
+        assert store.count(since=day, until=day) == 2
+        assert store.count(until="1999-12-31") == 0
+
+
+def test_reopen_and_import_legacy_logs(tmp_path):
+    run = _run("Plain services text.")
+    legacy = tmp_path / f"20240101_{run['run_id']}.json"
+    legacy.write_text(json.dumps(run, indent=2), encoding="utf-8")
+
+    with RunStore(tmp_path / "runs.db") as store:
+        assert import_json_logs(store, [legacy]) == 1
+    with RunStore(tmp_path / "runs.db") as store:
+        assert store.get(run["run_id"]) == run
+
+
+def test_bad_payload_does_not_block_later_runs(tmp_path):
+    good = _run("Plain services text.")
+    other = _run("Liability is unlimited liability.")
+    bad = {**good, "run_id": "bad", "uploaded": datetime(2026, 1, 1)}
+
+    with RunStore(tmp_path / "runs.db", batch_size=10) as store:
+        with pytest.raises(TypeError):
+            store.append("bad", bad)
+        store.append(good["run_id"], good)
+        with pytest.raises(ValueError, match="bad"):
+            store.append_many([("bad", bad), (other["run_id"], other)])
+        store.flush()
+
+        assert store.get(good["run_id"]) == good
+        assert store.get(other["run_id"]) == other
+        assert store.get("bad") is None
+        assert store.count() == 2
+
+
+def test_search_inverted_index(tmp_path):
+    acme = analyze_contract("Supplier accepts unlimited liability for data loss.", title="Acme MSA", source_type="paste")
+    other = analyze_contract("Either party may terminate for convenience.", title="Globex MSA", source_type="paste")
+    acme, other = acme.model_dump(), other.model_dump()
+    day = acme["audit"][0]["ts"][:10]
+
+    with RunStore(tmp_path / "runs.db", batch_size=1) as store:
+        store.append(acme["run_id"], acme)
+        store.append(other["run_id"], other)
+        assert store.search("category:Liability feature:has_uncapped_liability title:acme") == [acme["run_id"]]
+        assert store.search("unlimited", since=day, until=day) == [acme["run_id"]]
+        assert store.search("title:msa") == [other["run_id"], acme["run_id"]]
+        assert store.search("title:msa", limit=1) == [other["run_id"]]
+        assert store.search("category:Liability title:globex") == []
+        assert store.search("never-seen-term") == []
+        assert store.search("the") == store.search("x") == store.search("title:of") == []
+        assert store.search("", since=day, until=day) == [other["run_id"], acme["run_id"]]
+        assert store.search(["title:msa", "title:msa"]) == [other["run_id"], acme["run_id"]]
+
+
+def test_search_index_backfills_older_stores(tmp_path):
+    run = _run("Liability is unlimited liability.")
+    with RunStore(tmp_path / "runs.db") as store:
+        store.append(run["run_id"], run)
+    with RunStore(tmp_path / "runs.db") as store:
+        store._conn.execute("DELETE FROM run_terms")
+        store._conn.execute("DELETE FROM term_df")
+        store._conn.execute("DELETE FROM run_store_meta")
+        store._conn.commit()
+    with RunStore(tmp_path / "runs.db") as store:
+        assert store.search("category:liability") == [run["run_id"]]
@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from src.cache import AnalysisCache
+from src.model_adapter import analyze_contract
+from src.schemas import Finding
+from src.scoring import DEFAULT_PROFILE, compute_score, compute_scores, get_profile, load_profiles
+
+TEXT = (
+    "9.2 LIMITATION OF LIABILITY\nSupplier accepts unlimited liability for data loss.\n\n"
+    "12.1 TERMINATION\nEither party may terminate for convenience on notice.\n"
+)
+
+
+def _finding(severity, confidence=1.0):
+    return Finding(
+        finding_id=f"R-{severity}",
+        category="Test",
+        risk_statement=severity,
+        severity=severity,
+        confidence=confidence,
+        recommendation="-",
+    )
+
+
+def test_default_profile_matches_compute_score():
+    findings = [_finding("High", 0.78), _finding("Medium", 0.7)]
+    assert DEFAULT_PROFILE.score(findings) == compute_score(findings)
+    assert compute_score(findings)[1].profile == "default"
+
+
+def test_profiles_are_immutable_lookup_tables():
+    profile = get_profile("conservative")
+    assert len(profile.level_of) == 101 and profile.level_of[0] == "Low"
+    with pytest.raises(TypeError):
+        profile.weight_of["High"] = 0  # type: ignore[index]
+    with pytest.raises(AttributeError):
+        profile.max_points = 1.0  # type: ignore[misc]
+
+
+def test_many_profiles_in_one_call():
+    findings = [_finding("High"), _finding("Critical", 0.5)]
+    profiles = [get_profile(n) for n in ("default", "conservative", "growth")]
+    scored = compute_scores(findings, profiles)
+    assert list(scored) == ["default", "conservative", "growth"]
+    for p in profiles:
+        assert scored[p.name] == p.score(findings)
+    assert scored["conservative"][0] > scored["default"][0] > scored["growth"][0]
+
+
+def test_analyze_contract_selects_profile_and_caches_per_profile():
+    cache = AnalysisCache()
+    default = analyze_contract(TEXT, "MSA", "paste", cache=cache)
+    strict = analyze_contract(TEXT, "MSA", "paste", cache=cache, scoring_profile="conservative")
+    assert strict.scoring.profile == "conservative"
+    assert strict.summary.overall_risk_score > default.summary.overall_risk_score
+    assert cache.misses == 2
+    scoring = next(e.details for e in strict.audit if e.event == "SCORING_COMPLETED")
+    assert scoring["profile"] == "conservative"
+    with pytest.raises(LookupError):
+        analyze_contract(TEXT, "MSA", "paste", scoring_profile="nope")
+
+
+def test_profiles_file_cannot_shadow_default(tmp_path):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({"profiles": [{"name": "default", "weights": {"Low": 1, "Medium": 1, "High": 1, "Critical": 1}}]}))
+    with pytest.raises(ValueError):
+        load_profiles(path)
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {"weights": {"Low": -10, "Medium": 20, "High": 35, "Critical": 50}},
+        {"thresholds": {"Medium": 90, "High": 40}},
+        {"thresholds": {"Medium": 20, "High": 20}},
+        {"thresholds": {"Critical": 120}},
+        {"thresholds": {"Medium": -5}},
+    ],
+)
+def test_profiles_file_rejects_inconsistent_profiles(tmp_path, spec):
+    path = tmp_path / "profiles.json"
+    profile = {"name": "bad", "weights": {"Low": 10, "Medium": 20, "High": 35, "Critical": 50}, **spec}
+    path.write_text(json.dumps({"profiles": [profile]}))
+    with pytest.raises(ValueError):  # pydantic's ValidationError is a ValueError
+        load_profiles(path)
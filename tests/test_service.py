@@ -0,0 +1,112 @@
+import json
+import urllib.error
+import urllib.request
+
+from src.service import AnalysisService
+
+
+def _post(url, payload):
+    req = urllib.request.Request(url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_analyze_batch_health_and_metrics():
+    with AnalysisService(port=0, workers=2, executor="thread") as svc:
+        status, body = _post(f"{svc.url}/v1/analyze", {"contract_text": "Liability is unlimited liability.", "title": "A"})
+        assert status == 200 and body["contract"]["title"] == "A"
+        assert body["findings"][0]["finding_id"] == "R-001"
+
+        status, body = _post(f"{svc.url}/v1/batch", {"items": [{"contract_text": "x"}, {"contract_text": "y", "source_type": "paste"}]})
+        assert status == 200 and [r["index"] for r in body["results"]] == [0, 1]
+        assert all("result" in r for r in body["results"])
+
+        status, body = _post(f"{svc.url}/v1/analyze", {"contract_text": "x", "source_type": "fax"})
+        assert status == 400 and body["details"][0]["loc"] == ["source_type"]
+
+        with urllib.request.urlopen(f"{svc.url}/healthz") as resp:
+            assert json.loads(resp.read())["documents_pending"] == 0
+        with urllib.request.urlopen(f"{svc.url}/metrics") as resp:
+            text = resp.read().decode()
+        assert 'analysis_service_requests_total{endpoint="analyze",status="200"}' in text
+
+
+def test_full_queue_returns_429():
+    with AnalysisService(port=0, workers=1, executor="thread", max_pending=2) as svc:
+        status, _ = _post(f"{svc.url}/v1/batch", {"items": [{"contract_text": "x"}] * 3})
+        assert status == 413
+        assert svc.reserve(2)  # simulate two documents in flight
+        status, body = _post(f"{svc.url}/v1/analyze", {"contract_text": "x"})
+        assert status == 429 and "queue" in body["error"]
+        svc.release(2)
+        status, _ = _post(f"{svc.url}/v1/analyze", {"contract_text": "x"})
+        assert status == 200
+
+
+def test_bad_content_length_gets_400():
+    import http.client
+
+    with AnalysisService(port=0, workers=1, executor="thread") as svc:
+        for value in ("abc", "-1"):
+            conn = http.client.HTTPConnection(*svc.server_address[:2], timeout=5)
+            conn.putrequest("POST", "/v1/analyze")
+            conn.putheader("Content-Length", value)
+            conn.endheaders()
+            resp = conn.getresponse()
+            assert resp.status == 400 and json.loads(resp.read())["error"] == "Invalid Content-Length."
+            conn.close()
+
+
+def test_dead_worker_pool_is_rebuilt():
+    import os
+    import signal
+    import time
+
+    with AnalysisService(port=0, workers=1, executor="process") as svc:
+        broken = svc._pool
+        for pid in list(broken._processes):
+            os.kill(pid, signal.SIGKILL)
+        while not broken._broken:
+            time.sleep(0.01)
+
+        status, body = _post(f"{svc.url}/v1/batch", {"items": [{"contract_text": "x"}]})
+        assert status == 200 and "result" in body["results"][0]
+        assert svc._pool is not broken and svc.pending == 0
+
+
+def test_failed_future_gets_json_500():
+    from concurrent.futures import Future
+    from concurrent.futures.process import BrokenProcessPool
+
+    def crashed(req):
+        svc.release(1)
+        fut = Future()
+        fut.set_exception(BrokenProcessPool("worker died"))
+        return fut
+
+    with AnalysisService(port=0, workers=1, executor="thread") as svc:
+        svc.submit = crashed
+        status, body = _post(f"{svc.url}/v1/analyze", {"contract_text": "x"})
+        assert status == 500 and body["error"] == "BrokenProcessPool: worker died"
+        status, body = _post(f"{svc.url}/v1/batch", {"items": [{"contract_text": "x"}]})
+        assert status == 200 and body["results"][0]["error"] == "BrokenProcessPool: worker died"
+
+
+def test_shut_down_pool_releases_reserved_slots():
+    with AnalysisService(port=0, workers=1, executor="thread") as svc:
+        svc._pool.shutdown(wait=True)
+        status, body = _post(f"{svc.url}/v1/analyze", {"contract_text": "x"})
+        assert status == 500 and body["error"].startswith("RuntimeError")
+        status, body = _post(f"{svc.url}/v1/batch", {"items": [{"contract_text": "x"}, {"contract_text": "y"}]})
+        assert status == 200 and all(r["error"].startswith("RuntimeError") for r in body["results"])
+        assert svc.pending == 0
+
+        def raising(req):
+            raise RuntimeError("submit failed")
+
+        svc.submit = raising
+        status, _ = _post(f"{svc.url}/v1/batch", {"items": [{"contract_text": "x"}, {"contract_text": "y"}]})
+        assert status == 500 and svc.pending == 0